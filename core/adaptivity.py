@@ -0,0 +1,165 @@
+import numpy as np
+from .solver import FemSolver
+from .preprocessor import create_mesh, refine_mesh
+from .recovery import average_nodal_values
+
+
+def zz_error_estimate(geometry, elements, point_stress, D):
+    """
+    Zienkiewicz-Zhu 误差估计: 以恢复应力 σ* (节点面积加权平均) 与有限元应力 σ
+    之差的能量范数作为单元误差, ||e||² = ∫ (σ* - σ)ᵀ D⁻¹ (σ* - σ) dA。
+
+    Args:
+        geometry (ElementGeometryCache): 单元几何缓存.
+        elements (np.ndarray): 单元节点编号.
+        point_stress (np.ndarray): 形状 (积分点数, 3) 的积分点应力 [σx, σy, τxy].
+        D (np.ndarray): 形状 (积分点数, 3, 3) 的弹性矩阵.
+
+    Returns:
+        tuple: (element_error_sq, energy_sq)
+            element_error_sq (np.ndarray): 形状 (单元数,) 的单元误差能量范数平方.
+            energy_sq (float): 有限元解的能量范数平方 ∫ σᵀ D⁻¹ σ dA.
+    """
+    elements = np.asarray(elements)
+    nodal = average_nodal_values(geometry, point_stress)
+    # 恢复应力用单元形函数插值到积分点
+    recovered = np.einsum('pk,pkc->pc', geometry.shape_values, nodal[elements[geometry.point_element]])
+
+    C = np.linalg.inv(D)
+    diff = recovered - point_stress
+    point_error = np.einsum('pi,pij,pj->p', diff, C, diff) * geometry.area
+    point_energy = np.einsum('pi,pij,pj->p', point_stress, C, point_stress) * geometry.area
+    element_error_sq = np.bincount(geometry.point_element, weights=point_error,
+                                   minlength=geometry.num_elements)
+    return element_error_sq, float(point_energy.sum())
+
+
+def refinement_areas(element_area, element_error_sq, energy_sq, target_error, order=1,
+                     max_reduction=16.0):
+    """
+    按 Zienkiewicz-Zhu 准则计算每个单元的目标面积。
+
+    误差在单元间均匀分布时, 每个单元的允许误差为
+    ē = η_target · sqrt((||u||² + ||e||²) / 单元数)。误差比 ξ = e_i / ē 大于1的单元
+    加密, 新单元尺寸 h_new = h · ξ^(-1/p), 即面积 A_new = A · ξ^(-2/p)。
+
+    Args:
+        element_area (np.ndarray): 单元面积.
+        element_error_sq (np.ndarray): 单元误差能量范数平方.
+        energy_sq (float): 有限元解的能量范数平方.
+        target_error (float): 目标相对误差 η_target.
+        order (int): 单元插值阶次 p (CST为1, T6为2).
+        max_reduction (float): 一次加密中单元面积的最大缩小倍数, 避免在应力奇异点
+                               (如坡脚角点) 一次生成过多单元.
+
+    Returns:
+        np.ndarray: 形状 (单元数,) 的最大面积约束, 不需要加密的单元为 -1.
+    """
+    error_sq = element_error_sq.sum()
+    permissible = target_error * np.sqrt((energy_sq + error_sq) / len(element_area))
+    ratio = np.sqrt(element_error_sq) / max(permissible, 1e-300)
+    refine = ratio > 1.0
+    areas = np.full(len(element_area), -1.0)
+    areas[refine] = element_area[refine] * np.maximum(ratio[refine] ** (-2.0 / order), 1.0 / max_reduction)
+    return areas
+
+
+class AdaptiveMeshRefinement:
+    """
+    基于 Zienkiewicz-Zhu 误差估计的自适应网格加密。
+
+    从 mesh_opts 生成的初始网格出发, 循环执行: 线弹性求解 -> 由恢复应力估计
+    单元误差 -> 标记误差超过允许值的单元 -> 用 triangle 的 'r' 选项按单元面积
+    约束局部加密, 直到相对误差达到目标、自由度数超过上限或达到最大加密次数。
+    误差集中的区域 (如坡脚、加载的坡顶) 得到更密的网格, 其余区域保持粗网格。
+
+    Args:
+        problem (ProblemDefinition): 问题定义.
+        mesh_opts (str): 初始网格的剖分选项.
+        target_error (float): 目标相对误差 η = ||e|| / sqrt(||u||² + ||e||²).
+        max_dofs (int): 自由度数上限, 预计超过时放宽本次加密.
+        max_cycles (int): 最大加密次数.
+        solver_options (dict): 传给 FemSolver 的关键字参数.
+    """
+    def __init__(self, problem, mesh_opts='pq30a10A', target_error=0.05, max_dofs=20000,
+                 max_cycles=6, solver_options=None):
+        self.problem = problem
+        self.mesh_opts = mesh_opts
+        self.target_error = target_error
+        self.max_dofs = max_dofs
+        self.max_cycles = max_cycles
+        self.solver_options = solver_options or {}
+
+        # 结果
+        self.mesh = None
+        self.solver = None
+        self.displacements = None    # (总自由度数, 1)
+        self.element_errors = None   # (单元数,) 最终网格的单元误差能量范数
+        self.relative_error = None
+        # 每次求解的记录 {'cycle', 'elements', 'dofs', 'relative_error', 'refined_elements'}
+        self.history = []
+
+    def run(self):
+        """
+        执行自适应加密循环。
+
+        Returns:
+            np.ndarray: 最终网格上的节点位移向量, 形状 (总自由度数, 1); 失败时为None。
+        """
+        self.history = []
+        mesh = create_mesh(self.problem, self.mesh_opts)
+        if mesh is None:
+            return None
+        order = 2 if 'o2' in self.mesh_opts else 1
+
+        for cycle in range(self.max_cycles + 1):
+            solver = FemSolver(self.problem, mesh, **self.solver_options)
+            self.mesh, self.solver = mesh, solver
+            displacements = solver.solve()
+            if displacements is None:
+                return None
+            self.displacements = displacements
+
+            geometry = solver.geometry
+            D = solver._get_element_d_matrices()[geometry.point_element]
+            strain = np.einsum('pij,pj->pi', geometry.B, displacements[geometry.dof_indices, 0])
+            point_stress = np.einsum('pij,pj->pi', D, strain)
+            error_sq, energy_sq = zz_error_estimate(geometry, mesh['triangles'], point_stress, D)
+            self.element_errors = np.sqrt(error_sq)
+            self.relative_error = float(np.sqrt(error_sq.sum() / max(energy_sq + error_sq.sum(), 1e-300)))
+
+            record = {'cycle': cycle, 'elements': geometry.num_elements, 'dofs': solver.total_dof,
+                      'relative_error': self.relative_error, 'refined_elements': 0}
+            self.history.append(record)
+            print(f"自适应加密 第{cycle}次: 单元数 {geometry.num_elements}, 自由度 {solver.total_dof}, "
+                  f"相对误差 {self.relative_error:.2%}")
+
+            if self.relative_error <= self.target_error:
+                print("自适应加密: 已达到目标误差。")
+                break
+            if cycle == self.max_cycles:
+                print("自适应加密: 已达到最大加密次数。")
+                break
+            if solver.total_dof >= self.max_dofs:
+                print("自适应加密: 自由度数已达到上限。")
+                break
+
+            areas = refinement_areas(geometry.element_area, error_sq, energy_sq, self.target_error, order)
+            refine = areas > 0
+            # 按面积比估计加密后的自由度数 (质量约束产生的过渡单元约使单元数加倍),
+            # 超过上限时按比例放宽面积约束
+            element_area = geometry.element_area
+            predicted = np.sum(np.where(refine, 2.0 * element_area / np.where(refine, areas, 1.0), 1.0))
+            predicted_dofs = solver.total_dof * predicted / geometry.num_elements
+            if predicted_dofs > self.max_dofs:
+                scale = predicted_dofs / self.max_dofs
+                areas[refine] = np.minimum(areas[refine] * scale, element_area[refine])
+            record['refined_elements'] = int(np.count_nonzero(refine))
+
+            refined = refine_mesh(mesh, areas, self.mesh_opts)
+            if refined is None or len(refined['triangles']) == geometry.num_elements:
+                print("自适应加密: 网格没有变化, 停止加密。")
+                break
+            mesh = refined
+
+        return self.displacements
@@ -0,0 +1,149 @@
+import hashlib
+import numpy as np
+from scipy.sparse import coo_matrix, csr_matrix
+
+
+def element_dof_indices(elements, dofs_per_node=2):
+    """
+    生成每个单元的全局自由度编号表。
+
+    Args:
+        elements (np.ndarray): 单元节点编号, 形状 (单元数, 每单元节点数).
+        dofs_per_node (int): 每个节点的自由度数.
+
+    Returns:
+        np.ndarray: 形状 (单元数, 每单元节点数 * dofs_per_node) 的自由度编号,
+                    顺序为 [u1, v1, u2, v2, ...].
+    """
+    elements = np.asarray(elements, dtype=np.int64)
+    offsets = np.arange(dofs_per_node)
+    return (elements[:, :, None] * dofs_per_node + offsets).reshape(len(elements), -1)
+
+
+def element_stiffness_matrices(B, D, area):
+    """
+    批量计算单元刚度矩阵 ke = B^T * D * B * area (厚度 t=1)。
+
+    Args:
+        B (np.ndarray): 形状 (单元数, 3, n) 的B矩阵.
+        D (np.ndarray): 形状 (单元数, 3, 3) 的D矩阵.
+        area (np.ndarray): 形状 (单元数,) 的单元面积.
+
+    Returns:
+        np.ndarray: 形状 (单元数, n, n) 的单元刚度矩阵.
+    """
+    DB = np.matmul(D, B)
+    return np.matmul(B.transpose(0, 2, 1), DB) * area[:, None, None]
+
+
+def assemble_sparse(ke, dof_indices, total_dof):
+    """
+    将单元矩阵一次性展开为 (行, 列, 值) 三元组，并通过重复项求和生成CSR矩阵。
+
+    Args:
+        ke (np.ndarray): 形状 (单元数, n, n) 的单元矩阵.
+        dof_indices (np.ndarray): 形状 (单元数, n) 的全局自由度编号.
+        total_dof (int): 全局自由度总数.
+
+    Returns:
+        scipy.sparse.csr_matrix: 组装后的全局矩阵.
+    """
+    n = dof_indices.shape[1]
+    rows = np.repeat(dof_indices, n, axis=1).ravel()
+    cols = np.tile(dof_indices, (1, n)).ravel()
+    K = coo_matrix((ke.ravel(), (rows, cols)), shape=(total_dof, total_dof))
+    # 转换为CSR时会对重复的 (行, 列) 项求和
+    return K.tocsr()
+
+
+class SparsityPattern:
+    """
+    网格刚度矩阵的符号结构 (CSR的 indptr/indices) 及单元矩阵元素到非零元的散射映射。
+
+    结构只取决于单元连接关系, 与材料参数无关。构建一次后, 重新组装只需
+    对新的单元矩阵做一次 np.bincount 散射, 不再需要排序和合并重复项。
+
+    Args:
+        dof_indices (np.ndarray): 形状 (单元数, n) 的全局自由度编号.
+        total_dof (int): 全局自由度总数.
+    """
+    def __init__(self, dof_indices, total_dof):
+        self.dof_indices = np.array(dof_indices, dtype=np.int64)
+        self.total_dof = total_dof
+        n = self.dof_indices.shape[1]
+        rows = np.repeat(self.dof_indices, n, axis=1).ravel()
+        cols = np.tile(self.dof_indices, (1, n)).ravel()
+
+        # 按 (行, 列) 排序去重即得到CSR结构, inverse 即每个单元矩阵元素在 data 中的位置
+        keys, self.scatter = np.unique(rows * total_dof + cols, return_inverse=True)
+        self.scatter = self.scatter.ravel()
+        self.indices = (keys % total_dof).astype(np.int32)
+        self.indptr = np.zeros(total_dof + 1, dtype=np.int32)
+        np.cumsum(np.bincount(keys // total_dof, minlength=total_dof), out=self.indptr[1:])
+        self.nnz = len(keys)
+
+        # 子矩阵 (例如删去约束自由度后的 K_ff) 的结构及其在 data 中的取值位置, 按保留的自由度缓存
+        self._submatrices = {}
+        # 子矩阵的填充缩减排序, 供后续分解复用: {(子矩阵key, 排序方法): 排列}
+        self.orderings = {}
+
+    def matches(self, dof_indices, total_dof):
+        """判断该结构是否对应给定的自由度编号表。"""
+        return (self.total_dof == total_dof and self.dof_indices.shape == dof_indices.shape
+                and np.array_equal(self.dof_indices, dof_indices))
+
+    def assemble(self, ke):
+        """
+        将单元矩阵散射到预先确定的CSR结构中。
+
+        Args:
+            ke (np.ndarray): 形状 (单元数, n, n) 的单元矩阵, 单元顺序与 dof_indices 一致.
+
+        Returns:
+            scipy.sparse.csr_matrix: 组装后的全局矩阵.
+        """
+        data = np.bincount(self.scatter, weights=ke.ravel(), minlength=self.nnz)
+        return csr_matrix((data, self.indices, self.indptr), shape=(self.total_dof, self.total_dof))
+
+    def submatrix_key(self, keep):
+        """
+        子矩阵缓存使用的key: 保留自由度的个数及其编号的SHA-1摘要。
+
+        不使用内置 hash(), 其碰撞会使不同的自由度集合共用同一个子矩阵结构。
+        """
+        keep = np.ascontiguousarray(keep, dtype=np.int64)
+        return len(keep), hashlib.sha1(keep.tobytes()).digest()
+
+    def submatrix(self, K, keep):
+        """
+        提取 K[keep][:, keep], K 必须由本结构组装。
+
+        第一次调用时确定子矩阵的结构, 之后对相同的 keep 只需按下标取值。
+        """
+        key = self.submatrix_key(keep)
+        if key not in self._submatrices:
+            keep = np.asarray(keep, dtype=np.int64)
+            index_map = np.full(self.total_dof, -1, dtype=np.int64)
+            index_map[keep] = np.arange(len(keep))
+            rows = np.repeat(np.arange(self.total_dof), np.diff(self.indptr))
+            selected = (index_map[rows] >= 0) & (index_map[self.indices] >= 0)
+            data_index = np.flatnonzero(selected)
+            sub_indptr = np.zeros(len(keep) + 1, dtype=np.int32)
+            np.cumsum(np.bincount(index_map[rows[selected]], minlength=len(keep)), out=sub_indptr[1:])
+            sub_indices = index_map[self.indices[selected]].astype(np.int32)
+            self._submatrices[key] = (data_index, sub_indices, sub_indptr, len(keep))
+        data_index, sub_indices, sub_indptr, n = self._submatrices[key]
+        return csr_matrix((K.data[data_index], sub_indices, sub_indptr), shape=(n, n))
+
+
+def cached_sparsity_pattern(mesh, dof_indices, total_dof):
+    """
+    返回网格的刚度矩阵符号结构, 缓存在网格字典的 '_sparsity_pattern' 中。
+
+    同一网格上的多次分析 (例如只修改材料参数) 共用同一个结构。
+    """
+    pattern = mesh.get('_sparsity_pattern')
+    if pattern is None or not pattern.matches(dof_indices, total_dof):
+        pattern = SparsityPattern(dof_indices, total_dof)
+        mesh['_sparsity_pattern'] = pattern
+    return pattern
@@ -0,0 +1,130 @@
+import numpy as np
+
+# 传给triangle的线段标记 = 问题定义中的线段ID + 偏移量。
+# triangle中标记0表示内部、1表示未指定标记的边界, 因此从2开始编号。
+SEGMENT_MARKER_OFFSET = 2
+
+# 单元各边的角点及T6单元的边中点 (局部编号), 与triangle 'o2' 的节点顺序一致;
+# 第 j 条边与角点 j 相对
+T6_EDGE_NODES = np.array([[1, 2, 3], [2, 0, 4], [0, 1, 5]])
+
+
+def segment_markers(num_segments):
+    """生成问题定义中各线段的triangle线段标记。"""
+    return np.arange(num_segments, dtype=np.int64) + SEGMENT_MARKER_OFFSET
+
+
+class BoundaryIndex:
+    """
+    由triangle线段标记建立的边界索引: 问题定义中的每条线段 (PSLG线段) 对应的
+    网格节点和单元边。
+
+    triangle剖分时线段会被分成若干子线段, 子线段继承原线段的标记, 因此只需
+    按标记对网格的 'segments' 分组, 不需要对所有节点做几何判断。二次单元的
+    边中点由单元的边查得。通过 boundary_index(mesh) 获取, 缓存在网格字典的
+    '_boundary_index' 中。网格中没有线段标记 (例如不是由 create_mesh 生成) 时
+    available 为False, 调用方应退回到几何判断。
+
+    Attributes:
+        available (bool): 网格是否带有可用的线段标记.
+        segment_edges (dict): {线段ID: 形状 (边数, 2) 或 (边数, 3) 的网格边},
+                              每行为 [起点, 终点] 或 [起点, 边中点, 终点].
+        segment_nodes (dict): {线段ID: 线段上的网格节点编号 (升序)}.
+    """
+    def __init__(self, mesh):
+        self._triangles = mesh['triangles']
+        self._segments = mesh.get('segments')
+        self.segment_edges = {}
+        self.segment_nodes = {}
+
+        offset = mesh.get('segment_marker_offset')
+        segments = np.asarray(mesh.get('segments', []), dtype=np.int64).reshape(-1, 2)
+        markers = np.asarray(mesh.get('segment_markers', []), dtype=np.int64).ravel()
+        self.available = offset is not None and len(segments) > 0 and len(markers) == len(segments)
+        if not self.available:
+            return
+
+        seg_ids = markers - offset
+        keep = seg_ids >= 0
+        segments, seg_ids = segments[keep], seg_ids[keep]
+
+        elements = np.asarray(mesh['triangles'], dtype=np.int64)
+        if elements.shape[1] == 6:
+            segments = np.column_stack([segments[:, 0], _midside_nodes(elements, segments), segments[:, 1]])
+
+        order = np.argsort(seg_ids, kind='stable')
+        unique_ids, starts = np.unique(seg_ids[order], return_index=True)
+        for seg_id, edges in zip(unique_ids, np.split(segments[order], starts[1:])):
+            self.segment_edges[int(seg_id)] = edges
+            self.segment_nodes[int(seg_id)] = np.unique(edges)
+
+    def matches(self, mesh):
+        """判断索引是否仍对应该网格 (单元或线段数组被替换后需要重建)。"""
+        return self._triangles is mesh['triangles'] and self._segments is mesh.get('segments')
+
+    def edges_on_segment(self, seg_id):
+        """返回线段上的网格边; 索引不可用或网格中没有该线段时返回None。"""
+        return self.segment_edges.get(seg_id)
+
+    def nodes_on_segment(self, seg_id):
+        """返回线段上的网格节点编号; 索引不可用或网格中没有该线段时返回None。"""
+        return self.segment_nodes.get(seg_id)
+
+
+def boundary_index(mesh):
+    """返回网格的边界索引, 第一次调用时构建。"""
+    index = mesh.get('_boundary_index')
+    if index is None or not index.matches(mesh):
+        index = BoundaryIndex(mesh)
+        mesh['_boundary_index'] = index
+    return index
+
+
+def edge_inward_normals(nodes, elements, edges):
+    """
+    计算边界边指向单元内部的单位法向量。
+
+    每条边的内侧由包含该边的单元确定 (两侧都有单元的内部线段取其中一个单元)。
+
+    Args:
+        nodes (np.ndarray): 节点坐标, 形状 (节点数, 2).
+        elements (np.ndarray): 单元节点编号.
+        edges (np.ndarray): 形状 (边数, 2) 或 (边数, 3) 的网格边, 首末列为角点.
+
+    Returns:
+        np.ndarray: 形状 (边数, 2) 的单位内法向量.
+    """
+    nodes = np.asarray(nodes, dtype=float)
+    elements = np.asarray(elements, dtype=np.int64)
+    edges = np.asarray(edges, dtype=np.int64)
+    element, local = _adjacent_elements(elements, edges[:, [0, -1]])
+    # 局部边 j 的对角为角点 j
+    opposite = nodes[elements[element, local]]
+    start, end = nodes[edges[:, 0]], nodes[edges[:, -1]]
+    d = end - start
+    normals = np.column_stack([-d[:, 1], d[:, 0]]) / np.linalg.norm(d, axis=1)[:, None]
+    outward = np.einsum('ij,ij->i', opposite - start, normals) < 0
+    normals[outward] *= -1
+    return normals
+
+
+def _adjacent_elements(elements, edges):
+    """查找包含各条边 (角点对) 的单元编号及该边在单元中的局部编号。"""
+    corner_pairs = elements[:, T6_EDGE_NODES[:, :2]].reshape(-1, 2)
+    num_nodes = int(elements.max()) + 1
+
+    def edge_keys(pairs):
+        return np.minimum(pairs[:, 0], pairs[:, 1]) * num_nodes + np.maximum(pairs[:, 0], pairs[:, 1])
+
+    keys, first = np.unique(edge_keys(corner_pairs), return_index=True)
+    position = np.minimum(np.searchsorted(keys, edge_keys(edges)), len(keys) - 1)
+    if np.any(keys[position] != edge_keys(edges)):
+        raise ValueError("线段上的边不是网格单元的边。")
+    found = first[position]
+    return found // 3, found % 3
+
+
+def _midside_nodes(elements, edges):
+    """查找二次单元网格中各条边 (角点对) 的边中点编号。"""
+    element, local = _adjacent_elements(elements, edges)
+    return elements[element, T6_EDGE_NODES[local, 2]]
@@ -0,0 +1,101 @@
+import numpy as np
+
+# 三角形单元的3点高斯积分 (2阶精度, 对T6单元的刚度矩阵精确)
+# 参考单元: 角点 (0,0), (1,0), (0,1), 面积 1/2
+T6_GAUSS_POINTS = np.array([[1 / 6, 1 / 6], [2 / 3, 1 / 6], [1 / 6, 2 / 3]])
+T6_GAUSS_WEIGHTS = np.array([1 / 6, 1 / 6, 1 / 6])
+
+# T6单元划分为4个线性子三角形 (用于绘图), 节点顺序同triangle库:
+# 0, 1, 2 为角点, 3, 4, 5 分别为边 (1,2), (2,0), (0,1) 的中点
+T6_SUBTRIANGLES = np.array([[0, 5, 4], [5, 1, 3], [4, 3, 2], [5, 3, 4]])
+
+
+def t6_shape_functions(points):
+    """
+    计算T6单元在参考坐标 (ξ, η) 处的形函数及其对参考坐标的导数。
+
+    Args:
+        points (np.ndarray): 形状 (q, 2) 的参考坐标.
+
+    Returns:
+        tuple: (N, dN)
+            N (np.ndarray): 形状 (q, 6) 的形函数值.
+            dN (np.ndarray): 形状 (q, 6, 2) 的导数 [∂N/∂ξ, ∂N/∂η].
+    """
+    xi, eta = points[:, 0], points[:, 1]
+    L1, L2, L3 = 1 - xi - eta, xi, eta
+    N = np.stack([L1 * (2 * L1 - 1), L2 * (2 * L2 - 1), L3 * (2 * L3 - 1),
+                  4 * L2 * L3, 4 * L3 * L1, 4 * L1 * L2], axis=1)
+
+    # 面积坐标对 (ξ, η) 的导数
+    dL1, dL2, dL3 = np.array([-1.0, -1.0]), np.array([1.0, 0.0]), np.array([0.0, 1.0])
+
+    def col(v):
+        return v[:, None]
+
+    dN = np.stack([
+        col(4 * L1 - 1) * dL1,
+        col(4 * L2 - 1) * dL2,
+        col(4 * L3 - 1) * dL3,
+        4 * (col(L3) * dL2 + col(L2) * dL3),
+        4 * (col(L1) * dL3 + col(L3) * dL1),
+        4 * (col(L2) * dL1 + col(L1) * dL2),
+    ], axis=1)
+    return N, dN
+
+
+def t6_b_matrices(nodes, elements, points=T6_GAUSS_POINTS, weights=T6_GAUSS_WEIGHTS):
+    """
+    批量计算所有T6单元在各积分点处的B矩阵和积分权重。
+
+    Args:
+        nodes (np.ndarray): 节点坐标, 形状 (节点数, 2).
+        elements (np.ndarray): 单元节点编号, 形状 (单元数, 6).
+        points (np.ndarray): 积分点的参考坐标, 形状 (q, 2).
+        weights (np.ndarray): 参考单元上的积分权重, 形状 (q,).
+
+    Returns:
+        tuple: (B, w, N)
+            B (np.ndarray): 形状 (单元数, q, 3, 12) 的B矩阵, 退化单元为0.
+            w (np.ndarray): 形状 (单元数, q) 的积分权重 weight·det(J).
+            N (np.ndarray): 形状 (q, 6) 的积分点形函数值.
+    """
+    nodes = np.asarray(nodes, dtype=float)
+    X = nodes[np.asarray(elements)]  # (单元数, 6, 2)
+    N, dN = t6_shape_functions(points)
+
+    # 雅可比矩阵 J[e, q, a, b] = Σ_k ∂N_k/∂ξ_a · x_k,b
+    J = np.einsum('qka,ekb->eqab', dN, X)
+    det_J = J[..., 0, 0] * J[..., 1, 1] - J[..., 0, 1] * J[..., 1, 0]
+    degenerate = np.abs(det_J) < 1e-12
+    inv_det = np.zeros_like(det_J)
+    inv_det[~degenerate] = 1 / det_J[~degenerate]
+    inv_J = np.stack([np.stack([J[..., 1, 1], -J[..., 0, 1]], axis=-1),
+                      np.stack([-J[..., 1, 0], J[..., 0, 0]], axis=-1)], axis=-2) * inv_det[..., None, None]
+
+    # 形函数对整体坐标的导数 dNdx[e, q, k, b] = Σ_a invJ[b, a] · ∂N_k/∂ξ_a
+    dNdx = np.einsum('eqba,qka->eqkb', inv_J, dN)
+
+    B = np.zeros(det_J.shape + (3, 12))
+    B[..., 0, 0::2] = dNdx[..., 0]
+    B[..., 1, 1::2] = dNdx[..., 1]
+    B[..., 2, 0::2] = dNdx[..., 1]
+    B[..., 2, 1::2] = dNdx[..., 0]
+    return B, weights * det_J, N
+
+
+def display_triangles(elements):
+    """
+    将单元转换为绘图用的线性三角形。
+
+    Returns:
+        tuple: (triangles, parent)
+            triangles (np.ndarray): 形状 (m, 3) 的线性三角形.
+            parent (np.ndarray): 每个三角形所属的单元编号, 用于映射单元数据.
+    """
+    elements = np.asarray(elements)
+    if elements.shape[1] == 3:
+        return elements, np.arange(len(elements))
+    triangles = elements[:, T6_SUBTRIANGLES].reshape(-1, 3)
+    parent = np.repeat(np.arange(len(elements)), len(T6_SUBTRIANGLES))
+    return triangles, parent
@@ -1,7 +1,10 @@
 from dataclasses import dataclass, field
-from typing import List, Dict, Tuple, Any
+from typing import List, Dict, Tuple, Any, Optional
 import numpy as np
 
+# 基本荷载工况的名称, 对应 ProblemDefinition.loads
+BASE_LOAD_CASE = "基本工况"
+
 @dataclass
 class Material:
     """
@@ -12,6 +15,42 @@ class Material:
     elastic_modulus: float = 2.0e7  # 弹性模量 E, 单位: 帕斯卡 (Pa)
     poisson_ratio: float = 0.3      # 泊松比 ν, 无量纲
     unit_weight: float = 18000.0    # 重度, 单位: 牛顿/立方米 (N/m³)
+    cohesion: float = 20000.0       # 粘聚力 c, 单位: 帕斯卡 (Pa)
+    friction_angle: float = 30.0    # 内摩擦角 φ, 单位: 度
+    dilation_angle: float = 0.0     # 剪胀角 ψ, 单位: 度
+
+@dataclass
+class LineLoad:
+    """
+    作用在线段上的分布荷载, 集度单位: 牛顿/米 (N/m)。
+
+    荷载集度沿线段从起点 (segments 中的第一个顶点) 处的 start_value 线性变化到
+    终点处的 end_value (梯形荷载); end_value 为None时为均布荷载。
+    direction:
+        'vertical': 竖直荷载, 正值向下 (与直接以数值给出的荷载相同)
+        'normal': 垂直于线段的压力, 正值指向单元内部
+    """
+    start_value: float = 0.0
+    end_value: Optional[float] = None
+    direction: str = 'vertical'
+
+    @classmethod
+    def from_value(cls, value):
+        """由数值 (竖直均布荷载) 或项目文件中的字典生成荷载。"""
+        if isinstance(value, cls):
+            return value
+        if isinstance(value, dict):
+            end_value = value.get('end_value')
+            return cls(start_value=float(value.get('start_value', 0.0)),
+                       end_value=None if end_value is None else float(end_value),
+                       direction=value.get('direction', 'vertical'))
+        return cls(start_value=float(value))
+
+    def to_value(self):
+        """转换为可写入项目文件的形式, 竖直均布荷载直接保存为数值。"""
+        if self.direction == 'vertical' and self.end_value in (None, self.start_value):
+            return self.start_value
+        return {'start_value': self.start_value, 'end_value': self.end_value, 'direction': self.direction}
 
 @dataclass
 class ProblemDefinition:
@@ -34,10 +73,23 @@ class ProblemDefinition:
     # 3. 边界条件 (Boundary Conditions)
     # 约束字典: 将线段ID映射到约束类型 (例如: "Fixed", "Roller_X")
     constraints: Dict[int, str] = field(default_factory=dict)
-    # 荷载字典: 将线段ID映射到荷载值 (例如: 均布荷载 N/m)
-    loads: Dict[int, float] = field(default_factory=dict)
+    # 荷载字典: 将线段ID映射到荷载值 (数值为竖直向下的均布荷载 N/m,
+    # 梯形荷载或法向压力用 LineLoad 表示)
+    loads: Dict[int, Any] = field(default_factory=dict)
+    # 附加荷载工况: 工况名称 -> {线段ID: 荷载值}; loads 本身即为基本工况
+    load_cases: Dict[str, Dict[int, Any]] = field(default_factory=dict)
+    # 荷载组合: 组合名称 -> {工况名称: 分项系数}
+    load_combinations: Dict[str, Dict[str, float]] = field(default_factory=dict)
+    # 是否考虑自重荷载 (由各材料的重度计算, 计入基本工况)
+    include_self_weight: bool = False
+    # 施工步 (分步填筑/开挖), 按顺序执行, 每项为
+    # {'name': 名称, 'activate': [区域ID], 'deactivate': [区域ID], 'loads': {线段ID: 荷载值}}
+    # 区域ID即单元的区域属性 (regions 中的 material_id); 各步的荷载在后续施工步中保持
+    construction_stages: List[Dict[str, Any]] = field(default_factory=list)
     # 目标点位移: 需要输出位移的目标点
     target_points: Dict[str, Tuple[float, float]] = field(default_factory=dict)
+    # 剖面线 (测斜孔、坡面等): 剖面名称 -> {'points': [(x, y), ...] 折线顶点, 'spacing': 采样间距 (m)}
+    profile_lines: Dict[str, Dict[str, Any]] = field(default_factory=dict)
 
 @dataclass
 class FemResult:
@@ -47,16 +99,244 @@ class FemResult:
     # 从 'triangle' 库得到的原始网格数据
     mesh: Dict[str, Any] = field(default_factory=dict)
 
+    # 计算所用的问题定义 (材料等), 用于按需计算派生字段
+    problem: Optional[ProblemDefinition] = None
+
     # 节点位移向量, 形状: (节点数 * 2, 1)
     displacements: np.ndarray = field(default_factory=lambda: np.array([]))
 
     # 单元应力 (例如: 冯·米塞斯应力), 形状: (单元数,)
     stresses: np.ndarray = field(default_factory=lambda: np.array([]))
     
+    # 由积分点应力恢复的节点应力 (超收敛分片恢复), 用于光滑云图和节点应力导出
+    # 节点应力分量 [σx, σy, τxy, σz], 形状: (节点数, 4)
+    nodal_stress_components: np.ndarray = field(default_factory=lambda: np.array([]))
+    # 节点冯·米塞斯应力, 形状: (节点数,)
+    nodal_stresses: np.ndarray = field(default_factory=lambda: np.array([]))
+    
     # 节点位移 (水平)
     displacements_x: np.ndarray = field(default_factory=lambda: np.array([]))
 
+    # 节点支座反力, 形状: (节点数, 2), 非约束自由度处为0
+    reactions: np.ndarray = field(default_factory=lambda: np.array([]))
+
     # 目标点的位移结果
     target_displacements: Dict[str, Tuple[float, float]] = field(default_factory=dict)
 
+    # 求解器统计信息 (求解方式、分解耗时、填充量等)
+    solver_info: Dict[str, Any] = field(default_factory=dict)
+
+    # 自适应网格加密的记录, 每项为一次求解 {'cycle', 'elements', 'dofs', 'relative_error', 'refined_elements'}
+    refinement_history: List[Dict[str, Any]] = field(default_factory=list)
+    # 最终网格的单元误差 (ZZ误差估计的能量范数), 形状: (单元数,)
+    element_errors: np.ndarray = field(default_factory=lambda: np.array([]))
+
+    # 强度折减法求得的安全系数 (未进行强度折减分析时为None)
+    factor_of_safety: Optional[float] = None
+    # 强度折减试算记录, 每项包含 srf, converged, iterations, max_displacement
+    srf_trials: List[Dict[str, Any]] = field(default_factory=list)
+
+    # 弹塑性分析的收敛历史, 每项为一个荷载步的记录
+    # {'load_factor', 'load_increment', 'converged', 'iterations', 'residual_norms', 'plastic_elements'}
+    convergence_history: List[Dict[str, Any]] = field(default_factory=list)
+    # 每个收敛荷载步结束时的塑性区 (屈服单元) 掩码, 形状: (单元数,)
+    plastic_zone_masks: List[np.ndarray] = field(default_factory=list)
+    # 最终状态的塑性区掩码, 形状: (单元数,)
+    plastic_zone: np.ndarray = field(default_factory=lambda: np.array([], dtype=bool))
+
+    # 分步施工分析各施工步的结果, key为施工步名称
+    # 累计节点位移, 形状: (节点数, 2)
+    stage_displacements: Dict[str, np.ndarray] = field(default_factory=dict)
+    # 单元应力分量 [σx, σy, τxy, σz], 形状: (单元数, 4), 未激活单元为0
+    stage_stress_components: Dict[str, np.ndarray] = field(default_factory=dict)
+    # 该施工步中存在的单元掩码, 形状: (单元数,)
+    stage_active_elements: Dict[str, np.ndarray] = field(default_factory=dict)
+
+    # 各荷载工况及荷载组合的结果, key为工况/组合名称
+    # 节点位移, 形状: (节点数, 2)
+    load_case_displacements: Dict[str, np.ndarray] = field(default_factory=dict)
+    # 单元应力分量 [σx, σy, τxy, σz], 形状: (单元数, 4)
+    load_case_stress_components: Dict[str, np.ndarray] = field(default_factory=dict)
+    # 单元冯·米塞斯应力, 形状: (单元数,)
+    load_case_stresses: Dict[str, np.ndarray] = field(default_factory=dict)
+    # 目标点位移
+    load_case_target_displacements: Dict[str, Dict[str, Tuple[float, float]]] = field(default_factory=dict)
+
+    # 派生字段 (主应力、体积应变等, 见 core/fields.py) 的缓存, 通过 get_field 访问
+    _derived: Dict[str, np.ndarray] = field(default_factory=dict, init=False, repr=False, compare=False)
+
+    def __setattr__(self, name, value):
+        super().__setattr__(name, value)
+        # 派生字段由这些结果计算, 替换后缓存失效
+        if name in ('mesh', 'displacements', 'problem') and '_derived' in self.__dict__:
+            self._derived.clear()
+
+    def compact(self, float32=False, rtol=1e-6):
+        """
+        压缩结果的存储, 用于在内存中保留大量结果 (例如多次计算的结果历史)。
+
+        网格只保留结果需要的数组 (见 core.storage.MESH_KEYS), 丢弃triangle的
+        其余数组和各类缓存; 编号数组转为int32; float32 为True时结果数组在精度
+        满足 rtol 时转为单精度。所有数组变为只读视图。已缓存的派生字段保留。
+
+        Args:
+            float32 (bool): 结果数组是否以单精度保存.
+            rtol (float): 单精度转换允许的相对误差 (相对于数组的最大绝对值).
+
+        Returns:
+            FemResult: self.
+        """
+        from .storage import compact_array, compact_mesh, RESULT_ARRAY_FIELDS, RESULT_ARRAY_COLLECTIONS
+
+        def compact(values, name):
+            if isinstance(values, dict):
+                return {key: compact(value, f"{name}[{key}]") for key, value in values.items()}
+            if isinstance(values, list):
+                return [compact(value, name) for value in values]
+            if isinstance(values, np.ndarray):
+                return compact_array(values, float32, rtol, name)
+            return values
+
+        derived = compact(dict(self._derived), '派生字段')
+        if self.mesh:
+            self.mesh = compact_mesh(self.mesh)
+        for name in RESULT_ARRAY_FIELDS + RESULT_ARRAY_COLLECTIONS:
+            setattr(self, name, compact(getattr(self, name), name))
+        # 替换位移和网格会清空派生字段的缓存, 压缩前已有的值仍然有效
+        self._derived.update(derived)
+        return self
+
+    def get_field(self, name):
+        """
+        返回派生字段的值, 第一次访问时计算并缓存。
+
+        Args:
+            name (str): 字段名称, 见 core.fields.DERIVED_FIELDS.
+
+        Returns:
+            np.ndarray: 单元字段形状为 (单元数, ...), 节点字段形状为 (节点数, ...).
+        """
+        from .fields import DERIVED_FIELDS
+
+        if name not in DERIVED_FIELDS:
+            raise KeyError(f"未知的结果字段: {name}")
+        if name not in self._derived:
+            self._derived[name] = DERIVED_FIELDS[name].compute(self)
+        return self._derived[name]
+
+    def set_field(self, name, values):
+        """
+        直接给定派生字段的值 (例如弹塑性分析的应力分量不能由位移按线弹性计算)。
+        其他已缓存的派生字段失效; 应在设置位移之后调用, 位移被替换时该值同样失效。
+        """
+        from .fields import DERIVED_FIELDS
+
+        if name not in DERIVED_FIELDS:
+            raise KeyError(f"未知的结果字段: {name}")
+        self._derived.clear()
+        self._derived[name] = np.asarray(values)
+
+    def combine_load_cases(self, factors: Dict[str, float]):
+        """
+        按线性叠加原理计算荷载组合的结果, 无需重新求解。
+
+        Args:
+            factors (dict): {工况名称: 分项系数}.
+
+        Returns:
+            tuple: (节点位移 (节点数, 2), 应力分量 (单元数, 4), 冯·米塞斯应力 (单元数,),
+                    目标点位移字典)
+        """
+        from .utils import von_mises_stress
+
+        if not factors:
+            raise ValueError("荷载组合中没有任何工况。")
+        for case_name in factors:
+            if case_name not in self.load_case_displacements:
+                raise ValueError(f"荷载组合中的工况 '{case_name}' 不存在。")
+        displacements = sum(factor * self.load_case_displacements[name]
+                            for name, factor in factors.items())
+        components = sum(factor * self.load_case_stress_components[name]
+                         for name, factor in factors.items())
+        target_displacements = {}
+        for name, factor in factors.items():
+            for point_name, (dx, dy) in self.load_case_target_displacements.get(name, {}).items():
+                x0, y0 = target_displacements.get(point_name, (0.0, 0.0))
+                target_displacements[point_name] = (x0 + factor * dx, y0 + factor * dy)
+        return displacements, components, von_mises_stress(components), target_displacements
+
+    def probe_points(self, points):
+        """
+        在任意点处提取结果: 由网格的空间索引批量定位各点所在的单元, 用单元形函数
+        插值节点位移和节点应力 (nodal_stress_components)。没有节点应力时应力分量为
+        NaN, 冯·米塞斯应力取所在单元的值。网格外的点取最近单元边界上的值。
+
+        Args:
+            points (array_like): 形状 (点数, 2) 的点坐标.
+
+        Returns:
+            dict: 各项均为长度为点数的数组, 键为
+                'x', 'y', 'ux', 'uy', 'sigma_x', 'sigma_y', 'tau_xy', 'sigma_z',
+                'von_mises', 'element' (所在单元), 'inside' (是否在网格内).
+        """
+        from .spatial import spatial_index
+        from .utils import von_mises_stress
+
+        if not self.mesh or len(self.displacements) == 0:
+            raise ValueError("没有可提取的计算结果。")
+        points = np.asarray(points, dtype=float).reshape(-1, 2)
+        index = spatial_index(self.mesh)
+        element, N, inside = index.shape_values(points)
+        element_nodes = index.elements[element]
+
+        displacements = np.einsum('pk,pkc->pc', N, self.displacements.reshape(-1, 2)[element_nodes])
+        if len(self.nodal_stress_components) > 0:
+            components = np.einsum('pk,pkc->pc', N, self.nodal_stress_components[element_nodes])
+            von_mises = von_mises_stress(components)
+        else:
+            components = np.full((len(points), 4), np.nan)
+            von_mises = (self.stresses[element] if len(self.stresses) > 0
+                         else np.full(len(points), np.nan))
+
+        return {
+            'x': points[:, 0], 'y': points[:, 1],
+            'ux': displacements[:, 0], 'uy': displacements[:, 1],
+            'sigma_x': components[:, 0], 'sigma_y': components[:, 1],
+            'tau_xy': components[:, 2], 'sigma_z': components[:, 3],
+            'von_mises': von_mises,
+            'element': element, 'inside': inside,
+        }
+
+    def probe_polyline(self, vertices, spacing=None, num_points=None):
+        """
+        沿折线 (如测斜孔、坡面) 提取结果剖面。
+
+        Args:
+            vertices (array_like): 折线顶点坐标, 形状 (顶点数, 2).
+            spacing (float): 最大采样间距, 折线各顶点都是采样点.
+            num_points (int): 沿折线全长等间距的采样点数 (spacing 为None时使用).
+
+        Returns:
+            dict: 同 probe_points, 另有 'distance' (采样点沿折线到起点的距离).
+        """
+        from .spatial import sample_polyline
+
+        points, distance = sample_polyline(vertices, spacing, num_points)
+        probe = self.probe_points(points)
+        probe['distance'] = distance
+        return probe
+
+    def probe_profiles(self, profile_lines):
+        """
+        提取问题定义中全部剖面线的结果。
+
+        Args:
+            profile_lines (dict): ProblemDefinition.profile_lines.
+
+        Returns:
+            dict: {剖面名称: probe_polyline 的结果}.
+        """
+        return {name: self.probe_polyline(line['points'], line.get('spacing'))
+                for name, line in profile_lines.items()}
+
     # 可以在此处添加其他需要输出的结果
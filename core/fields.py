@@ -0,0 +1,110 @@
+from dataclasses import dataclass
+from typing import Callable
+import numpy as np
+from .geometry import element_geometry
+
+
+@dataclass(frozen=True)
+class DerivedField:
+    """
+    由 FemResult 的基本结果 (网格、位移、问题定义) 派生的结果字段。
+
+    字段在第一次通过 FemResult.get_field 访问时计算并缓存, 位移、网格或问题定义
+    被替换时缓存失效。
+    """
+    name: str
+    label: str                 # 显示名称 (绘图选项、导出列标题)
+    unit: str
+    location: str              # 'element' (单元值) 或 'node' (节点值)
+    compute: Callable          # compute(result) -> np.ndarray
+    scalar: bool = True        # 是否为可直接绘制云图的标量场
+
+
+# 全部派生字段, 按注册顺序 (即绘图选项和导出列的顺序)
+DERIVED_FIELDS = {}
+
+
+def derived_field(name, label, unit, location, scalar=True):
+    """注册派生字段的装饰器。"""
+    def register(compute):
+        DERIVED_FIELDS[name] = DerivedField(name, label, unit, location, compute, scalar)
+        return compute
+    return register
+
+
+@derived_field('stress_components', '应力分量', 'Pa', 'element', scalar=False)
+def _stress_components(result):
+    """单元应力分量 [σx, σy, τxy, σz], 形状 (单元数, 4), 由位移和材料按线弹性计算。"""
+    from .postprocessor import PostProcessor
+
+    if result.problem is None:
+        raise ValueError("结果中没有问题定义, 无法由位移计算应力分量。")
+    post_proc = PostProcessor(result.problem, result.mesh, np.asarray(result.displacements))
+    return post_proc._calculate_element_stress_components(post_proc.displacements.reshape(-1, 1))[:, :, 0]
+
+
+@derived_field('sigma_x', '水平正应力 σx', 'Pa', 'element')
+def _sigma_x(result):
+    return result.get_field('stress_components')[:, 0]
+
+
+@derived_field('sigma_y', '竖直正应力 σy', 'Pa', 'element')
+def _sigma_y(result):
+    return result.get_field('stress_components')[:, 1]
+
+
+@derived_field('tau_xy', '剪应力 τxy', 'Pa', 'element')
+def _tau_xy(result):
+    return result.get_field('stress_components')[:, 2]
+
+
+def _principal_stresses(result):
+    """平面内主应力的圆心和半径 (莫尔圆): σ1,3 = c ± R。"""
+    sigma = result.get_field('stress_components')
+    center = 0.5 * (sigma[:, 0] + sigma[:, 1])
+    radius = np.hypot(0.5 * (sigma[:, 0] - sigma[:, 1]), sigma[:, 2])
+    return center, radius
+
+
+@derived_field('sigma_1', '最大主应力 σ1', 'Pa', 'element')
+def _sigma_1(result):
+    center, radius = _principal_stresses(result)
+    return center + radius
+
+
+@derived_field('sigma_3', '最小主应力 σ3', 'Pa', 'element')
+def _sigma_3(result):
+    center, radius = _principal_stresses(result)
+    return center - radius
+
+
+@derived_field('principal_angle', '最大主应力方向', '°', 'element')
+def _principal_angle(result):
+    """σ1 方向与x轴的夹角 θ = ½·atan2(2τxy, σx - σy), 单位: 度。"""
+    sigma = result.get_field('stress_components')
+    return 0.5 * np.degrees(np.arctan2(2 * sigma[:, 2], sigma[:, 0] - sigma[:, 1]))
+
+
+@derived_field('max_shear', '最大剪应力 τmax', 'Pa', 'element')
+def _max_shear(result):
+    return _principal_stresses(result)[1]
+
+
+@derived_field('mean_stress', '平均应力 p', 'Pa', 'element')
+def _mean_stress(result):
+    sigma = result.get_field('stress_components')
+    return (sigma[:, 0] + sigma[:, 1] + sigma[:, 3]) / 3.0
+
+
+@derived_field('volumetric_strain', '体积应变 εv', '-', 'element')
+def _volumetric_strain(result):
+    """单元体积应变 εv = εx + εy (平面应变 εz = 0), 积分点值按面积平均。"""
+    geometry = element_geometry(result.mesh)
+    u = np.asarray(result.displacements).reshape(-1)
+    strain = np.einsum('pij,pj->pi', geometry.B[:, :2], u[geometry.dof_indices])
+    return geometry.element_average(strain[:, 0] + strain[:, 1])
+
+
+@derived_field('displacement_magnitude', '总位移', 'm', 'node')
+def _displacement_magnitude(result):
+    return np.linalg.norm(np.asarray(result.displacements).reshape(-1, 2), axis=1)
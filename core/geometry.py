@@ -0,0 +1,183 @@
+import numpy as np
+from scipy.sparse import csr_matrix
+from .utils import get_b_matrices
+from .assembly import element_dof_indices
+from .elements import t6_b_matrices
+
+
+class ElementGeometryCache:
+    """
+    网格的单元几何量缓存, 以连续数组保存, 由一次向量化计算得到。
+
+    这些量只取决于网格, 与材料参数和荷载无关, 因此由求解器、后处理器以及
+    同一网格上的其他分析共用。通过 element_geometry(mesh) 获取, 缓存在网格
+    字典的 '_geometry_cache' 中。
+
+    B、area、dof_indices 按积分点给出: CST单元每个单元1个积分点 (形心),
+    与单元一一对应; T6单元每个单元3个高斯点, 单元 e 的积分点编号为
+    e*3 ... e*3+2。逐积分点的量可以像逐单元的量一样直接用于组装和应力计算。
+
+    Attributes:
+        nodes_per_element (int): 每单元节点数, 3 (CST) 或 6 (T6).
+        points_per_element (int): 每单元积分点数.
+        B (np.ndarray): 形状 (积分点数, 3, 2*每单元节点数) 的B矩阵, 退化单元为0.
+        area (np.ndarray): 形状 (积分点数,) 的积分权重; CST单元即为单元面积.
+        dof_indices (np.ndarray): 形状 (积分点数, 2*每单元节点数) 的全局自由度编号.
+        shape_values (np.ndarray): 形状 (积分点数, 每单元节点数) 的积分点形函数值.
+        point_element (np.ndarray): 每个积分点所属的单元编号.
+        element_area (np.ndarray): 形状 (单元数,) 的单元面积.
+        element_dof_indices (np.ndarray): 形状 (单元数, 2*每单元节点数) 的全局自由度编号.
+        region_ids (np.ndarray): 每个单元的区域属性 (材料ID), 没有属性的单元为 -1.
+        unique_region_ids (np.ndarray): 网格中出现的区域属性 (升序).
+        region_index (np.ndarray): 每个单元的区域属性在 unique_region_ids 中的下标.
+    """
+    def __init__(self, mesh):
+        self._vertices = mesh['vertices']
+        self._triangles = mesh['triangles']
+        self._attributes = mesh.get('element_attributes')
+        elements = np.asarray(mesh['triangles'])
+        self.num_nodes = len(mesh['vertices'])
+        self.num_elements = len(elements)
+        self.nodes_per_element = elements.shape[1]
+
+        if self.nodes_per_element == 6:
+            B, w, N = t6_b_matrices(mesh['vertices'], elements)
+            q = B.shape[1]
+            self.B = B.reshape((-1,) + B.shape[2:])
+            self.area = w.ravel()
+            self.shape_values = np.tile(N, (self.num_elements, 1))
+            self.element_area = w.sum(axis=1)
+        else:
+            q = 1
+            self.B, self.area = get_b_matrices(mesh['vertices'], elements)
+            self.shape_values = np.full((self.num_elements, 3), 1 / 3)
+            self.element_area = self.area
+        self.points_per_element = q
+        self.point_element = np.repeat(np.arange(self.num_elements), q)
+        self.element_dof_indices = element_dof_indices(elements)
+        self.dof_indices = np.repeat(self.element_dof_indices, q, axis=0) if q > 1 else self.element_dof_indices
+
+        self.region_ids = _element_region_ids(mesh.get('element_attributes', []), self.num_elements)
+        self.unique_region_ids, self.region_index = np.unique(self.region_ids, return_inverse=True)
+        self.region_index = self.region_index.ravel()
+
+        self._point_incidence = None
+        self._point_coordinates = None
+
+    @property
+    def point_incidence(self):
+        """
+        节点-积分点关联矩阵, 形状 (节点数, 积分点数) 的稀疏矩阵 (CSR)。
+
+        第 n 行在节点 n 所属单元的所有积分点处为1, 用于将积分点的量汇总到节点
+        (例如节点应力恢复), 第一次使用时构建。
+        """
+        if self._point_incidence is None:
+            elements = np.asarray(self._triangles)
+            rows = elements[self.point_element].ravel()
+            cols = np.repeat(np.arange(len(self.point_element)), self.nodes_per_element)
+            self._point_incidence = csr_matrix((np.ones(len(rows)), (rows, cols)),
+                                               shape=(self.num_nodes, len(self.point_element)))
+        return self._point_incidence
+
+    @property
+    def point_coordinates(self):
+        """积分点的整体坐标, 形状 (积分点数, 2), 第一次使用时计算。"""
+        if self._point_coordinates is None:
+            element_nodes = np.asarray(self._vertices, dtype=float)[np.asarray(self._triangles)]
+            self._point_coordinates = np.einsum('pk,pkd->pd', self.shape_values,
+                                                element_nodes[self.point_element])
+        return self._point_coordinates
+
+    def matches(self, mesh):
+        """判断缓存是否仍对应该网格 (节点、单元或区域属性数组被替换后需要重建)。"""
+        return (self._vertices is mesh['vertices'] and self._triangles is mesh['triangles']
+                and self._attributes is mesh.get('element_attributes'))
+
+    def sum_over_points(self, values):
+        """将逐积分点的量 (例如单元刚度矩阵的各积分点贡献) 按单元求和。"""
+        q = self.points_per_element
+        if q == 1:
+            return values
+        return values.reshape((self.num_elements, q) + values.shape[1:]).sum(axis=1)
+
+    def element_average(self, values):
+        """逐积分点的量按积分权重求单元平均值 (例如单元平均应力)。"""
+        q = self.points_per_element
+        if q == 1:
+            return values
+        shape = (-1,) + (1,) * (values.ndim - 1)
+        total = self.sum_over_points(values * self.area.reshape(shape))
+        # 退化单元 (面积为0) 的平均值取0
+        element_area = np.where(self.element_area != 0, self.element_area, np.inf)
+        return total / element_area.reshape(shape)
+
+    def element_any(self, mask):
+        """逐积分点的掩码在单元内任一积分点为真时为真 (例如塑性区)。"""
+        q = self.points_per_element
+        if q == 1:
+            return mask
+        return mask.reshape(self.num_elements, q).any(axis=1)
+
+
+def element_geometry(mesh):
+    """返回网格的单元几何缓存, 第一次调用时构建。"""
+    cache = mesh.get('_geometry_cache')
+    if cache is None or not cache.matches(mesh):
+        cache = ElementGeometryCache(mesh)
+        mesh['_geometry_cache'] = cache
+    return cache
+
+
+def element_materials(problem, geometry):
+    """
+    按区域属性 (材料ID) 解析每个单元的材料。
+
+    没有区域属性的单元使用材料库中的第一个材料。
+
+    Args:
+        problem (ProblemDefinition): 问题定义.
+        geometry (ElementGeometryCache): 单元几何缓存.
+
+    Returns:
+        tuple: (materials, element_material_index)
+            materials (list): 网格中用到的材料列表.
+            element_material_index (np.ndarray): 每个单元在 materials 中的下标.
+    """
+    mat_id_map = {mat.id: mat for mat in problem.materials.values()}
+    materials = []
+    for region_id in geometry.unique_region_ids:
+        if region_id < 0:
+            # 如果没有材料属性，使用第一个可用材料
+            if not mat_id_map:
+                bad_element = np.flatnonzero(geometry.region_ids < 0)[0]
+                raise ValueError(f"单元 {bad_element} 没有材料属性，且没有定义任何材料。")
+            material = list(mat_id_map.values())[0]
+            print(f"警告: {np.count_nonzero(geometry.region_ids < 0)} 个单元没有材料属性，"
+                  f"使用默认材料 {material.name}")
+        elif int(region_id) in mat_id_map:
+            material = mat_id_map[int(region_id)]
+        else:
+            bad_element = np.flatnonzero(geometry.region_ids == region_id)[0]
+            raise ValueError(f"单元 {bad_element} 的材料ID {region_id} 无效。")
+        materials.append(material)
+    return materials, geometry.region_index
+
+
+def _element_region_ids(attrs, num_elements):
+    """读取每个单元的区域属性 (第一个属性值), 没有属性的单元记为 -1。"""
+    region_ids = np.full(num_elements, -1, dtype=np.int64)
+    if len(attrs) == 0:
+        return region_ids
+    try:
+        attrs = np.asarray(attrs, dtype=float).reshape(len(attrs), -1)
+    except ValueError:
+        # 不规则的属性列表 (部分单元没有属性)
+        for i, attr in enumerate(attrs[:num_elements]):
+            if len(attr) > 0:
+                region_ids[i] = int(attr[0])
+        return region_ids
+    if attrs.shape[1] > 0:
+        count = min(len(attrs), num_elements)
+        region_ids[:count] = attrs[:count, 0].astype(np.int64)
+    return region_ids
@@ -0,0 +1,134 @@
+import hashlib
+import json
+import os
+from collections import OrderedDict
+import numpy as np
+import triangle as tr
+from .preprocessor import create_mesh, triangle_input, default_material_id
+
+# 缓存键的格式版本, 网格生成逻辑改变时递增以使旧的磁盘缓存失效
+MESH_CACHE_VERSION = 1
+
+
+def mesh_key(problem, mesh_opts='pq30a0.1', renumber=True, quadratic=False):
+    """
+    计算网格的内容地址: 传给triangle的PSLG (顶点、线段及其标记)、区域点及其属性、
+    剖分选项字符串的稳定哈希 (SHA-256)。只改变材料参数、荷载、约束时键不变。
+
+    Returns:
+        str: 十六进制哈希字符串.
+    """
+    geom, mesh_opts = triangle_input(problem, mesh_opts, quadratic)
+    h = hashlib.sha256()
+    h.update(f"v{MESH_CACHE_VERSION}|{getattr(tr, '__version__', '')}|{mesh_opts}|{bool(renumber)}".encode())
+    for name, dtype in (('vertices', np.float64), ('segments', np.int64),
+                        ('segment_markers', np.int64), ('regions', np.float64)):
+        values = np.ascontiguousarray(np.asarray(geom.get(name, []), dtype=dtype))
+        h.update(f"|{name}{values.shape}|".encode())
+        h.update(values.tobytes())
+    # 没有区域时所有单元取默认材料ID
+    if 'regions' not in geom:
+        h.update(f"|default_id={default_material_id(problem)}".encode())
+    return h.hexdigest()
+
+
+class MeshCache:
+    """
+    按内容地址缓存生成的网格, 几何与剖分选项不变时直接复用, 不再调用triangle。
+
+    内存中保留最近使用的 max_entries 个网格 (LRU)。cache_dir 不为None时网格同时
+    保存为该目录下的 <键>.npz, 重新打开项目后也能复用。缓存的网格字典在多次
+    计算间共用, 其上的几何、稀疏结构等缓存也一并复用; 调用方不应修改网格数组。
+
+    Args:
+        max_entries (int): 内存中缓存的网格数.
+        cache_dir (str): 磁盘缓存目录, None表示只使用内存缓存.
+    """
+    def __init__(self, max_entries=8, cache_dir=None):
+        self.max_entries = max_entries
+        self.cache_dir = cache_dir
+        self._meshes = OrderedDict()
+
+    def get_mesh(self, problem, mesh_opts='pq30a0.1', renumber=True, quadratic=False):
+        """
+        返回问题定义对应的网格, 缓存中没有时调用 create_mesh 生成。
+
+        Returns:
+            dict: 网格字典, 如果失败则返回None。
+        """
+        if not problem.vertices or not problem.segments:
+            return create_mesh(problem, mesh_opts, renumber, quadratic)
+
+        key = mesh_key(problem, mesh_opts, renumber, quadratic)
+        mesh = self._meshes.get(key)
+        if mesh is not None:
+            self._meshes.move_to_end(key)
+            print(f"使用缓存的网格 ({key[:12]})。")
+            return mesh
+
+        mesh = self._load(key)
+        if mesh is not None:
+            print(f"使用磁盘缓存的网格 ({key[:12]})。")
+        else:
+            mesh = create_mesh(problem, mesh_opts, renumber, quadratic)
+            if mesh is None:
+                return None
+            self._save(key, mesh)
+
+        self._meshes[key] = mesh
+        while len(self._meshes) > self.max_entries:
+            self._meshes.popitem(last=False)
+        return mesh
+
+    def clear(self):
+        """清空内存中的缓存 (磁盘缓存保留)。"""
+        self._meshes.clear()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.npz")
+
+    def _save(self, key, mesh):
+        """将网格的数组及其他数据 (JSON) 写入磁盘缓存。"""
+        if self.cache_dir is None:
+            return
+        arrays, extra = {}, {}
+        for name, value in mesh.items():
+            if name.startswith('_'):
+                continue
+            if isinstance(value, (np.ndarray, list)):
+                arrays[name] = np.asarray(value)
+            else:
+                extra[name] = value
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            # 先写临时文件再改名, 避免中断时留下不完整的缓存
+            temp_path = self._path(key) + '.tmp'
+            with open(temp_path, 'wb') as f:
+                np.savez(f, __extra__=np.array(json.dumps(extra, default=_json_scalar)), **arrays)
+            os.replace(temp_path, self._path(key))
+        except (OSError, TypeError, ValueError) as e:
+            print(f"警告: 网格缓存写入失败: {e}")
+
+    def _load(self, key):
+        """从磁盘缓存读取网格, 不存在或无法读取时返回None。"""
+        if self.cache_dir is None or not os.path.exists(self._path(key)):
+            return None
+        try:
+            with np.load(self._path(key), allow_pickle=False) as data:
+                mesh = {name: data[name] for name in data.files if name != '__extra__'}
+                mesh.update(json.loads(str(data['__extra__'])))
+        except (OSError, ValueError, KeyError) as e:
+            print(f"警告: 网格缓存读取失败: {e}")
+            return None
+        if ('triangle_attributes' in mesh
+                and np.array_equal(mesh.get('element_attributes'), mesh['triangle_attributes'])):
+            # 与 create_mesh 的结果一致, 两者为同一数组
+            mesh['element_attributes'] = mesh['triangle_attributes']
+        return mesh
+
+
+def _json_scalar(value):
+    """将numpy标量转换为JSON可写的类型。"""
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"无法写入JSON的类型: {type(value).__name__}")
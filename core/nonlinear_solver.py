@@ -0,0 +1,233 @@
+import time
+import numpy as np
+from scipy.sparse.linalg import splu
+from .solver import FemSolver
+from .assembly import element_stiffness_matrices
+from .plasticity import (reduce_strength, elastic_moduli, plane_strain_stress_matrices,
+                         mohr_coulomb_return_mapping, mohr_coulomb_tangent)
+
+
+class ElastoPlasticSolver:
+    """
+    理想弹塑性莫尔-库仑材料的增量-迭代非线性求解器。
+
+    荷载按荷载系数分级施加, 每级内进行平衡迭代:
+    - 'newton': 完全牛顿-拉弗森法, 每次迭代重新组装并分解切线刚度矩阵;
+    - 'modified': 修正牛顿法, 每级荷载开始时分解一次切线刚度矩阵, 该级内的
+      迭代复用同一个分解, 残差下降停滞时按当前应力状态重新分解;
+    - 'initial': 初应力法, 始终复用弹性刚度矩阵的分解。
+    所有单元的应力返回映射和切线矩阵都以数组运算一次完成。
+
+    某级荷载不收敛时将荷载增量减半重算 (自适应荷载步), 连续快速收敛时
+    放大荷载增量。
+
+    Args:
+        problem (ProblemDefinition): 问题定义.
+        mesh (dict): triangle库生成的网格字典.
+        method (str): 'newton', 'modified' 或 'initial'.
+        n_load_steps (int): 初始荷载分级数.
+        max_iterations (int): 每级荷载的最大迭代次数.
+        refactor_ratio (float): 修正牛顿法中, 残差与上一次迭代残差之比超过该值时
+                                重新分解切线刚度矩阵.
+        tol (float): 不平衡力的相对收敛容差 ||R|| <= tol * ||F||.
+        min_load_step (float): 最小荷载系数增量, 增量减小到该值以下仍不收敛时终止.
+        ordering (str): 稀疏LU分解的填充缩减排序.
+    """
+    def __init__(self, problem, mesh, method='newton', n_load_steps=5, max_iterations=50,
+                 tol=1.0e-4, min_load_step=1.0e-3, ordering='MMD_AT_PLUS_A', refactor_ratio=0.5):
+        if method not in ('newton', 'modified', 'initial'):
+            raise ValueError(f"未知的非线性迭代方法: {method}")
+        self.method = method
+        self.n_load_steps = n_load_steps
+        self.max_iterations = max_iterations
+        self.refactor_ratio = refactor_ratio
+        self.tol = tol
+        self.min_load_step = min_load_step
+        self.ordering = ordering
+
+        linear_solver = FemSolver(problem, mesh, ordering=ordering)
+        linear_solver.assemble_system()
+        self.total_dof = linear_solver.total_dof
+        self.free_dofs = linear_solver.free_dofs
+        self.F_ext = linear_solver.F[:, 0]
+        self._elastic_lu = None
+        self._linear_solver = linear_solver
+        # 切线刚度矩阵与弹性刚度矩阵结构相同, 每次重新组装只散射数值
+        self._pattern = linear_solver.sparsity_pattern
+        self._free_key = self._pattern.submatrix_key(self.free_dofs)
+
+        # 应力、屈服判断和材料参数均按积分点计算 (CST单元即逐单元)
+        materials, element_material_index = linear_solver._get_element_materials()
+        geometry = linear_solver.geometry
+        self.geometry = geometry
+        self.B, self.area, self.dof_indices = geometry.B, geometry.area, geometry.dof_indices
+        point_material_index = element_material_index[geometry.point_element]
+
+        def element_values(name):
+            return np.array([getattr(m, name) for m in materials], dtype=float)[point_material_index]
+
+        E, nu = element_values('elastic_modulus'), element_values('poisson_ratio')
+        self.G, self.K_bulk = elastic_moduli(E, nu)
+        self.D = plane_strain_stress_matrices(E, nu)
+        self.cohesion = element_values('cohesion')
+        self.friction_angle = element_values('friction_angle')
+        self.dilation_angle = element_values('dilation_angle')
+        # 关联流动 (ψ = φ) 时切线矩阵对称, 可使用对称模式分解
+        self.symmetric = bool(np.allclose(self.friction_angle, self.dilation_angle))
+
+        # 结果
+        self.displacements = None      # (总自由度数, 1)
+        self.stress_components = None  # (单元数, 4) 单元平均应力
+        self.plastic_mask = None       # (单元数,) 最终状态的塑性区
+        self.point_stress = None       # (积分点数, 4) 积分点应力
+        self.load_factor = 0.0         # 达到的荷载系数
+        # 每个荷载步 (含被减半重算的步) 的迭代记录:
+        # {'load_factor', 'load_increment', 'converged', 'diverged', 'iterations', 'residual_norms',
+        #  'plastic_elements'}; diverged 为False的不收敛步只是达到了最大迭代次数
+        self.convergence_history = []
+        # 每个收敛荷载步结束时的塑性区掩码
+        self.plastic_zone_masks = []
+        self.solver_info = {}
+
+    @property
+    def state(self):
+        """当前收敛状态 (位移, 应力), 可作为下一次 solve 的初始状态。"""
+        return self.displacements[:, 0], self.point_stress
+
+    def internal_forces(self, stress):
+        """由单元应力计算等效节点内力 F_int = Σ B^T σ A。"""
+        element_forces = np.einsum('eij,ei->ej', self.B, stress[:, :3]) * self.area[:, None]
+        return np.bincount(self.dof_indices.ravel(), weights=element_forces.ravel(),
+                           minlength=self.total_dof)
+
+    def solve(self, srf=1.0, initial_state=None):
+        """
+        求解弹塑性平衡状态。
+
+        Args:
+            srf (float): 强度折减系数, 常规分析取1.
+            initial_state (tuple): 已收敛的 (位移, 应力)。为None时从零应力状态分级
+                                   施加全部荷载; 否则在全部荷载下直接从该状态出发
+                                   重新平衡 (用于强度折减法的热启动).
+
+        Returns:
+            bool: 是否在全部荷载下收敛.
+        """
+        t0 = time.perf_counter()
+        c, phi, psi = reduce_strength(self.cohesion, self.friction_angle, self.dilation_angle, srf)
+        self.convergence_history = []
+        self.plastic_zone_masks = []
+        self.solver_info = {'method': self.method, 'factorizations': 0}
+
+        if initial_state is None:
+            u_n = np.zeros(self.total_dof)
+            stress_n = np.zeros((len(self.B), 4))
+            load_n = 0.0
+            step = 1.0 / self.n_load_steps
+        else:
+            u_n, stress_n = initial_state
+            load_n = 1.0
+            step = 0.0
+        yielded_n = np.zeros(len(self.B), dtype=bool)
+
+        finished = False
+        while True:
+            load = min(load_n + step, 1.0)
+            converged, u, stress, yielded, record = self._solve_step(
+                u_n, stress_n, yielded_n, load, c, phi, psi)
+            record['load_increment'] = load - load_n
+            self.convergence_history.append(record)
+
+            if converged:
+                u_n, stress_n, yielded_n, load_n = u, stress, yielded, load
+                self.plastic_zone_masks.append(self.geometry.element_any(yielded).copy())
+                if load_n >= 1.0:
+                    finished = True
+                    break
+                # 迭代次数较少时放大荷载增量
+                if record['iterations'] <= self.max_iterations // 4:
+                    step *= 1.5
+            else:
+                step /= 2
+                if step < self.min_load_step:
+                    break
+                print(f"弹塑性求解: 荷载系数 {load:.4f} 未收敛, 荷载增量减半为 {step:.4f}")
+
+        self.displacements = u_n.reshape(-1, 1)
+        self.point_stress = stress_n
+        self.stress_components = self.geometry.element_average(stress_n)
+        self.plastic_mask = self.geometry.element_any(yielded_n)
+        self.load_factor = load_n
+        self.solver_info['load_steps'] = len(self.plastic_zone_masks)
+        self.solver_info['iterations'] = sum(r['iterations'] for r in self.convergence_history)
+        self.solver_info['solve_time'] = time.perf_counter() - t0
+        # 未完成时区分残差发散 (可能失稳) 与仅达到最大迭代次数
+        self.solver_info['diverged'] = (not finished and bool(self.convergence_history)
+                                        and self.convergence_history[-1]['diverged'])
+        return finished
+
+    def _solve_step(self, u_n, stress_n, yielded_n, load, c, phi, psi):
+        """在荷载系数 load 下从收敛状态 (u_n, stress_n) 出发进行平衡迭代。"""
+        F = load * self.F_ext
+        F_norm = np.linalg.norm(F[self.free_dofs])
+        record = {'load_factor': load, 'converged': False, 'diverged': False, 'iterations': 0,
+                  'residual_norms': []}
+
+        u = u_n.copy()
+        stress, yielded = stress_n, yielded_n
+        lu = self._factorize(stress_n, yielded_n, phi, psi) if self.method == 'modified' else None
+        previous_norm = np.inf
+        for iteration in range(self.max_iterations + 1):
+            strain = np.einsum('eij,ej->ei', self.B, (u - u_n)[self.dof_indices])
+            trial = stress_n + np.einsum('eij,ej->ei', self.D, strain)
+            stress, yielded = mohr_coulomb_return_mapping(trial, self.G, self.K_bulk, c, phi, psi)
+            residual = (F - self.internal_forces(stress))[self.free_dofs]
+            residual_norm = np.linalg.norm(residual) / max(F_norm, 1e-30)
+            record['residual_norms'].append(float(residual_norm))
+            record['iterations'] = iteration
+            if residual_norm <= self.tol:
+                record['converged'] = True
+                break
+            # 残差发散 (或出现NaN) 时提前终止本步
+            if not np.isfinite(residual_norm) or residual_norm > 1e6:
+                record['diverged'] = True
+                break
+            if iteration == self.max_iterations:
+                break
+
+            if self.method == 'newton':
+                lu = self._factorize(stress, yielded, phi, psi)
+            elif self.method == 'modified' and residual_norm > self.refactor_ratio * previous_norm:
+                # 残差下降停滞 (塑性区在本级内扩展) 时按当前应力状态重新分解切线刚度
+                lu = self._factorize(stress, yielded, phi, psi)
+            elif self.method == 'initial':
+                lu = self._factorize_elastic()
+            previous_norm = residual_norm
+            du = lu.solve(residual)
+            if not np.all(np.isfinite(du)):
+                record['diverged'] = True
+                break
+            u[self.free_dofs] += du
+
+        record['plastic_elements'] = int(self.geometry.element_any(yielded).sum())
+        return record['converged'], u, stress, yielded, record
+
+    def _factorize(self, stress, yielded, phi, psi):
+        """组装并分解当前应力状态下的切线刚度矩阵 (自由自由度部分)。"""
+        if not np.any(yielded):
+            return self._factorize_elastic()
+        D_ep = mohr_coulomb_tangent(stress, yielded, self.G, self.K_bulk, phi, psi)
+        ke = self.geometry.sum_over_points(element_stiffness_matrices(self.B, D_ep, self.area))
+        K_ff = self._pattern.submatrix(self._pattern.assemble(ke), self.free_dofs)
+        self.solver_info['factorizations'] += 1
+        if self.symmetric:
+            return self._linear_solver.factorize(K_ff, self._free_key)
+        return splu(K_ff.tocsc(), permc_spec='COLAMD')
+
+    def _factorize_elastic(self):
+        """弹性刚度矩阵只分解一次, 之后一直复用。"""
+        if self._elastic_lu is None:
+            K_ff = self._pattern.submatrix(self._linear_solver.K, self.free_dofs)
+            self._elastic_lu = self._linear_solver.factorize(K_ff, self._free_key)
+            self.solver_info['factorizations'] += 1
+        return self._elastic_lu
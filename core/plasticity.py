@@ -0,0 +1,236 @@
+import numpy as np
+
+
+def reduce_strength(cohesion, friction_angle, dilation_angle, srf):
+    """
+    按强度折减系数折减莫尔-库仑强度参数。
+
+    c_f = c / SRF, tanφ_f = tanφ / SRF, tanψ_f = tanψ / SRF。
+
+    Args:
+        cohesion (np.ndarray): 粘聚力 c (Pa).
+        friction_angle (np.ndarray): 内摩擦角 φ (度).
+        dilation_angle (np.ndarray): 剪胀角 ψ (度).
+        srf (float): 强度折减系数.
+
+    Returns:
+        tuple: 折减后的 (c, φ, ψ), 角度单位为弧度.
+    """
+    c = np.asarray(cohesion, dtype=float) / srf
+    phi = np.arctan(np.tan(np.radians(friction_angle)) / srf)
+    psi = np.arctan(np.tan(np.radians(dilation_angle)) / srf)
+    return c, phi, psi
+
+
+def elastic_moduli(E, nu):
+    """由弹性模量和泊松比计算剪切模量 G 和体积模量 K。"""
+    E = np.asarray(E, dtype=float)
+    nu = np.asarray(nu, dtype=float)
+    return E / (2 * (1 + nu)), E / (3 * (1 - 2 * nu))
+
+
+def plane_strain_stress_matrices(E, nu):
+    """
+    批量计算平面应变下由应变 [εx, εy, γxy] 求应力 [σx, σy, τxy, σz] 的矩阵。
+
+    Returns:
+        np.ndarray: 形状 (n, 4, 3) 的矩阵, 前三行即为 get_d_matrices 的D矩阵.
+    """
+    E = np.asarray(E, dtype=float)
+    nu = np.asarray(nu, dtype=float)
+    factor = E / ((1 + nu) * (1 - 2 * nu))
+    matrices = np.zeros(E.shape + (4, 3))
+    matrices[..., 0, 0] = matrices[..., 1, 1] = factor * (1 - nu)
+    matrices[..., 0, 1] = matrices[..., 1, 0] = factor * nu
+    matrices[..., 2, 2] = factor * (1 - 2 * nu) / 2
+    matrices[..., 3, 0] = matrices[..., 3, 1] = factor * nu
+    return matrices
+
+
+def principal_stresses(stress):
+    """
+    计算应力 [σx, σy, τxy, σz] 的主应力及面内主方向。
+
+    Returns:
+        tuple: (principal, cos2t, sin2t)
+            principal (np.ndarray): 形状 (n, 3), 依次为面内较大主应力、面内较小主应力和 σz.
+            cos2t, sin2t (np.ndarray): 面内较大主应力方向角 θ 的 cos2θ 和 sin2θ.
+    """
+    sigma_x, sigma_y, tau_xy, sigma_z = stress.T
+    center = (sigma_x + sigma_y) / 2
+    half_diff = (sigma_x - sigma_y) / 2
+    radius = np.hypot(half_diff, tau_xy)
+
+    cos2t = np.ones_like(radius)
+    sin2t = np.zeros_like(radius)
+    nonzero = radius > 0
+    cos2t[nonzero] = half_diff[nonzero] / radius[nonzero]
+    sin2t[nonzero] = tau_xy[nonzero] / radius[nonzero]
+
+    principal = np.stack([center + radius, center - radius, sigma_z], axis=1)
+    return principal, cos2t, sin2t
+
+
+def stresses_from_principal(principal, cos2t, sin2t):
+    """principal_stresses 的逆变换: 由主应力和面内主方向还原 [σx, σy, τxy, σz]。"""
+    sigma_a, sigma_b, sigma_z = principal.T
+    center = (sigma_a + sigma_b) / 2
+    half_diff = (sigma_a - sigma_b) / 2
+    return np.stack([center + half_diff * cos2t,
+                     center - half_diff * cos2t,
+                     half_diff * sin2t,
+                     sigma_z], axis=1)
+
+
+def mohr_coulomb_return_mapping(trial_stress, G, K, cohesion, phi, psi):
+    """
+    理想弹塑性莫尔-库仑模型的应力返回映射, 对所有积分点同时以数组运算完成。
+
+    在主应力空间中依次尝试主平面返回、棱线返回 (两个屈服面同时激活) 和
+    锥顶返回。拉应力为正, 屈服函数为
+        f = (σ1 - σ3) + (σ1 + σ3)·sinφ - 2c·cosφ,  σ1 ≥ σ2 ≥ σ3。
+    塑性势取相同形式, 以剪胀角 ψ 代替 φ (非关联流动)。
+
+    Args:
+        trial_stress (np.ndarray): 形状 (n, 4) 的弹性试应力 [σx, σy, τxy, σz].
+        G, K (np.ndarray): 剪切模量和体积模量, 形状 (n,).
+        cohesion (np.ndarray): 粘聚力, 形状 (n,).
+        phi, psi (np.ndarray): 内摩擦角和剪胀角 (弧度), 形状 (n,).
+
+    Returns:
+        tuple: (stress, yielded)
+            stress (np.ndarray): 返回映射后的应力, 形状 (n, 4).
+            yielded (np.ndarray): 发生屈服的积分点掩码, 形状 (n,).
+    """
+    principal, cos2t, sin2t = principal_stresses(trial_stress)
+    order = np.argsort(-principal, axis=1)
+    sorted_trial = np.take_along_axis(principal, order, axis=1)
+
+    sin_phi, cos_phi, sin_psi = np.sin(phi), np.cos(phi), np.sin(psi)
+    two_c_cos_phi = 2 * cohesion * cos_phi
+
+    # 三个屈服面的梯度 n 和塑性势梯度 N (主应力空间, 按 σ1 ≥ σ2 ≥ σ3 排列)
+    # a: σ1-σ3 (主平面), b: σ1-σ2, c: σ2-σ3
+    zeros = np.zeros_like(sin_phi)
+    n_a = np.stack([1 + sin_phi, zeros, -(1 - sin_phi)], axis=1)
+    n_b = np.stack([1 + sin_phi, -(1 - sin_phi), zeros], axis=1)
+    n_c = np.stack([zeros, 1 + sin_phi, -(1 - sin_phi)], axis=1)
+    N_a = np.stack([1 + sin_psi, zeros, -(1 - sin_psi)], axis=1)
+    N_b = np.stack([1 + sin_psi, -(1 - sin_psi), zeros], axis=1)
+    N_c = np.stack([zeros, 1 + sin_psi, -(1 - sin_psi)], axis=1)
+
+    f_a = np.einsum('ij,ij->i', n_a, sorted_trial) - two_c_cos_phi
+    yielded = f_a > 0
+
+    result = sorted_trial.copy()
+    if np.any(yielded):
+        result[yielded] = _return_to_surface(
+            sorted_trial[yielded], f_a[yielded], G[yielded], K[yielded],
+            cohesion[yielded], sin_phi[yielded], cos_phi[yielded], two_c_cos_phi[yielded],
+            n_a[yielded], n_b[yielded], n_c[yielded], N_a[yielded], N_b[yielded], N_c[yielded])
+
+    new_principal = np.empty_like(principal)
+    np.put_along_axis(new_principal, order, result, axis=1)
+    return stresses_from_principal(new_principal, cos2t, sin2t), yielded
+
+
+def _return_to_surface(trial, f_a, G, K, cohesion, sin_phi, cos_phi, two_c_cos_phi,
+                       n_a, n_b, n_c, N_a, N_b, N_c):
+    """对已屈服的积分点在主应力空间中执行返回映射 (trial 已按降序排列)。"""
+    lame = K - 2 * G / 3
+
+    def elastic(N):
+        # 主应力空间中的弹性矩阵与向量之积: D·N = λ·tr(N)·1 + 2G·N
+        return lame[:, None] * N.sum(axis=1, keepdims=True) + 2 * G[:, None] * N
+
+    def dot(x, y):
+        return np.einsum('ij,ij->i', x, y)
+
+    DN_a = elastic(N_a)
+
+    # 1. 主平面返回
+    d_gamma = f_a / dot(n_a, DN_a)
+    result = trial - d_gamma[:, None] * DN_a
+    tol = 1e-10 * (np.abs(trial).max(axis=1) + cohesion)
+    on_plane = (result[:, 0] >= result[:, 1] - tol) & (result[:, 1] >= result[:, 2] - tol)
+    if np.all(on_plane):
+        return result
+
+    # 2. 棱线返回: 主平面返回后 σ2 > σ1 时激活屈服面 c, σ2 < σ3 时激活屈服面 b
+    edge = ~on_plane
+    use_c = (result[:, 1] > result[:, 0])[:, None]
+    n_x = np.where(use_c, n_c, n_b)
+    N_x = np.where(use_c, N_c, N_b)
+    DN_x = elastic(N_x)
+    f_x = dot(n_x, trial) - two_c_cos_phi
+
+    a11, a12 = dot(n_a, DN_a), dot(n_a, DN_x)
+    a21, a22 = dot(n_x, DN_a), dot(n_x, DN_x)
+    det = a11 * a22 - a12 * a21
+    d_gamma_a = (f_a * a22 - a12 * f_x) / det
+    d_gamma_x = (a11 * f_x - a21 * f_a) / det
+    edge_result = trial - d_gamma_a[:, None] * DN_a - d_gamma_x[:, None] * DN_x
+    ordered = (edge_result[:, 0] >= edge_result[:, 1] - tol) & (edge_result[:, 1] >= edge_result[:, 2] - tol)
+    on_edge = edge & (d_gamma_a >= 0) & (d_gamma_x >= 0) & ordered
+    result[on_edge] = edge_result[on_edge]
+
+    # 3. 锥顶返回: 三个主应力均等于 c·cotφ (φ=0 时不存在锥顶)
+    apex = edge & ~on_edge & (sin_phi > 0)
+    if np.any(apex):
+        result[apex] = (cohesion[apex] * cos_phi[apex] / sin_phi[apex])[:, None]
+    return result
+
+
+def mohr_coulomb_tangent(stress, yielded, G, K, phi, psi):
+    """
+    批量计算莫尔-库仑模型的平面应变连续体弹塑性切线矩阵。
+
+    D_ep = D - (D·N)(n^T·D) / (n^T·D·N), n 和 N 为主平面 (σ1-σ3) 屈服面和塑性势
+    在 [σx, σy, τxy, σz] 空间中的梯度; 棱线和锥顶处近似取主平面的切线。
+    ψ ≠ φ 时 D_ep 不对称。
+
+    Args:
+        stress (np.ndarray): 返回映射后的应力 [σx, σy, τxy, σz], 形状 (n, 4).
+        yielded (np.ndarray): 屈服积分点掩码, 形状 (n,). 未屈服处返回弹性矩阵.
+        G, K (np.ndarray): 剪切模量和体积模量, 形状 (n,).
+        phi, psi (np.ndarray): 内摩擦角和剪胀角 (弧度), 形状 (n,).
+
+    Returns:
+        np.ndarray: 形状 (n, 3, 3) 的切线矩阵, 对应应变 [εx, εy, γxy].
+    """
+    lame = K - 2 * G / 3
+    m = np.array([1.0, 1.0, 0.0, 1.0])
+    D = lame[:, None, None] * np.outer(m, m) + G[:, None, None] * np.diag([2.0, 2.0, 1.0, 2.0])
+    if not np.any(yielded):
+        return D[:, :3, :3].copy()
+
+    D_y = D[yielded]
+    principal, cos2t, sin2t = principal_stresses(stress[yielded])
+    order = np.argsort(-principal, axis=1)
+
+    # 主应力 σa, σb, σz 对 [σx, σy, τxy, σz] 的导数, 形状 (n, 3, 4)
+    zeros = np.zeros_like(cos2t)
+    ones = np.ones_like(cos2t)
+    d_principal = np.stack([
+        np.stack([(1 + cos2t) / 2, (1 - cos2t) / 2, sin2t, zeros], axis=1),
+        np.stack([(1 - cos2t) / 2, (1 + cos2t) / 2, -sin2t, zeros], axis=1),
+        np.stack([zeros, zeros, zeros, ones], axis=1),
+    ], axis=1)
+
+    def gradient(angle):
+        # 按 σ1 ≥ σ2 ≥ σ3 排列的系数还原到 (σa, σb, σz) 的顺序
+        sin_angle = np.sin(angle[yielded])
+        sorted_coeffs = np.stack([1 + sin_angle, zeros, -(1 - sin_angle)], axis=1)
+        coeffs = np.empty_like(sorted_coeffs)
+        np.put_along_axis(coeffs, order, sorted_coeffs, axis=1)
+        return np.einsum('ik,ikj->ij', coeffs, d_principal)
+
+    n = gradient(phi)
+    N = gradient(psi)
+    DN = np.einsum('eij,ej->ei', D_y, N)
+    nD = np.einsum('ei,eij->ej', n, D_y)
+    denominator = np.einsum('ei,ei->e', n, DN)
+
+    D_ep = D[:, :3, :3].copy()
+    D_ep[yielded] -= (DN[:, :3, None] * nD[:, None, :3]) / denominator[:, None, None]
+    return D_ep
@@ -1,5 +1,8 @@
 import numpy as np
-from .utils import get_d_matrix, get_b_matrix
+from .utils import get_d_matrices, von_mises_stress
+from .geometry import element_geometry, element_materials
+from .recovery import recover_nodal_values
+from .spatial import spatial_index
 
 class PostProcessor:
     """
@@ -10,6 +13,8 @@ class PostProcessor:
         self.mesh = mesh
         self.nodes = mesh['vertices']
         self.elements = mesh['triangles']
+        # 与求解器共用的单元几何缓存 (B矩阵、面积等)
+        self.geometry = element_geometry(mesh)
         # 将位移向量重塑为 (节点数, 2) 的形式，方便索引
         self.displacements = displacements.reshape(-1, 2)
 
@@ -23,67 +28,107 @@ class PostProcessor:
         
         return stresses, target_displacements
 
+    def calculate_load_case_results(self, load_case_displacements):
+        """
+        计算各荷载工况的单元应力分量、冯·米塞斯应力和目标点位移。
+
+        Args:
+            load_case_displacements (dict): {工况名称: 位移向量 (总自由度数, 1)}.
+
+        Returns:
+            tuple: (应力分量字典, 冯·米塞斯应力字典, 目标点位移字典), key为工况名称.
+        """
+        names = list(load_case_displacements.keys())
+        U = np.hstack([u.reshape(-1, 1) for u in load_case_displacements.values()])
+        components = self._calculate_element_stress_components(U)
+
+        case_components, case_stresses, case_targets = {}, {}, {}
+        for j, name in enumerate(names):
+            case_components[name] = components[:, :, j]
+            case_stresses[name] = von_mises_stress(components[:, :, j])
+            case_targets[name] = self._get_target_displacements(U[:, j].reshape(-1, 2))
+        return case_components, case_stresses, case_targets
+
     def _calculate_element_stresses(self):
-        """计算每个单元的应力和冯·米塞斯(Von Mises)等效应力。"""
-        mat_id_map = {mat.id: mat for mat in self.problem.materials.values()}
-        von_mises_stresses = np.zeros(len(self.elements))
-
-        for i, element in enumerate(self.elements):
-            node_ids = element
-            p1, p2, p3 = self.nodes[node_ids[0]], self.nodes[node_ids[1]], self.nodes[node_ids[2]]
-            
-            # 获取材料和D矩阵
-            # 获取材料和D矩阵
-            if i >= len(self.mesh['element_attributes']) or len(self.mesh['element_attributes'][i]) == 0:
-                # 如果没有材料属性，使用第一个可用材料
-                if mat_id_map:
-                    material = list(mat_id_map.values())[0]
-                else:
-                    raise ValueError(f"单元 {i} 没有材料属性，且没有定义任何材料。")
-            else:
-                element_attr = self.mesh['element_attributes'][i][0]
-                material = mat_id_map.get(int(element_attr))
-                if not material:
-                    raise ValueError(f"单元 {i} 的材料ID {element_attr} 无效。")
-            D = get_d_matrix(material.elastic_modulus, material.poisson_ratio)
-            
-            # 获取B矩阵
-            B = get_b_matrix(p1, p2, p3)
-            if B is None:
-                continue
-
-            # 获取单元的节点位移向量 [u1, v1, u2, v2, u3, v3]^T
-            element_disp = self.displacements[node_ids].flatten()
-
-            # 计算应力 {sigma} = [D] * [B] * {u_e}
-            sigma = D @ B @ element_disp
-            sigma_x, sigma_y, tau_xy = sigma[0], sigma[1], sigma[2]
-
-            # 计算冯·米塞斯等效应力
-            # sigma_v = sqrt(sigma_x^2 - sigma_x*sigma_y + sigma_y^2 + 3*tau_xy^2)
-            # 对于平面应变，还需考虑 sigma_z = nu * (sigma_x + sigma_y)
-            sigma_z = material.poisson_ratio * (sigma_x + sigma_y)
-            term1 = ((sigma_x - sigma_y)**2 + (sigma_y - sigma_z)**2 + (sigma_z - sigma_x)**2) / 2
-            term2 = 3 * tau_xy**2
-            von_mises_stresses[i] = np.sqrt(term1 + term2)
-            
-        return von_mises_stresses
-
-    def _get_target_displacements(self):
-        """找到距离目标点最近的节点的位移。"""
+        """计算每个单元的冯·米塞斯(Von Mises)等效应力。"""
+        components = self._calculate_element_stress_components(self.displacements.reshape(-1, 1))
+        return von_mises_stress(components[:, :, 0])
+
+    def calculate_nodal_stresses(self, method='spr'):
+        """
+        由积分点应力恢复连续的节点应力场, 用于绘制光滑的应力云图和导出节点应力。
+
+        Args:
+            method (str): 'average' (面积加权平均) 或 'spr' (超收敛分片恢复).
+
+        Returns:
+            tuple: (节点应力分量 (节点数, 4), 节点冯·米塞斯应力 (节点数,)).
+        """
+        point_components = self._calculate_point_stress_components(self.displacements.reshape(-1, 1))
+        nodal_components = recover_nodal_values(self.mesh, point_components[:, :, 0], method)
+        return nodal_components, von_mises_stress(nodal_components)
+
+    def _calculate_element_stress_components(self, U):
+        """
+        计算每个单元的应力分量 [σx, σy, τxy, σz]。
+
+        Args:
+            U (np.ndarray): 位移矩阵, 形状 (总自由度数, 工况数).
+
+        Returns:
+            np.ndarray: 形状 (单元数, 4, 工况数) 的应力分量.
+        """
+        # T6单元取各高斯点应力的面积加权平均, 退化单元的应力为0
+        return self.geometry.element_average(self._calculate_point_stress_components(U))
+
+    def _calculate_point_stress_components(self, U):
+        """
+        计算每个积分点的应力分量 [σx, σy, τxy, σz] (CST单元即逐单元)。
+
+        Args:
+            U (np.ndarray): 位移矩阵, 形状 (总自由度数, 工况数).
+
+        Returns:
+            np.ndarray: 形状 (积分点数, 4, 工况数) 的应力分量.
+        """
+        geometry = self.geometry
+        materials, element_material_index = element_materials(self.problem, geometry)
+        E = np.array([m.elastic_modulus for m in materials], dtype=float)
+        nu = np.array([m.poisson_ratio for m in materials], dtype=float)
+        point_material = element_material_index[geometry.point_element]
+
+        # 所有积分点的单元位移 [u1, v1, u2, v2, ...] 一次取出, 形状 (积分点数, 单元自由度数, 工况数)
+        point_disp = U[geometry.dof_indices]
+        strain = np.einsum('pij,pjc->pic', geometry.B, point_disp)
+        # 同一材料的D矩阵相同, 按材料取出后逐积分点相乘
+        sigma = np.einsum('pij,pjc->pic', get_d_matrices(E, nu)[point_material], strain)
+
+        components = np.empty((len(sigma), 4, U.shape[1]))
+        components[:, :3] = sigma
+        # 对于平面应变，还需考虑 sigma_z = nu * (sigma_x + sigma_y)
+        components[:, 3] = nu[point_material][:, None] * (sigma[:, 0] + sigma[:, 1])
+        return components
+
+    def _get_target_displacements(self, displacements=None):
+        """
+        计算目标点的位移: 由空间索引查找目标点所在的单元, 用单元形函数
+        (CST为面积坐标, T6为二次形函数) 插值节点位移。网格外的目标点取
+        最近单元边界上的值。
+        """
+        if displacements is None:
+            displacements = self.displacements
         target_results = {}
         if not self.problem.target_points:
             return target_results
-            
-        nodes_array = np.array(self.nodes)
-        
-        for name, point in self.problem.target_points.items():
-            # 计算所有节点到目标点的距离
-            distances = np.linalg.norm(nodes_array - np.array(point), axis=1)
-            # 找到最近节点的索引
-            nearest_node_id = np.argmin(distances)
-            # 提取该节点的位移
-            disp = self.displacements[nearest_node_id]
+
+        names = list(self.problem.target_points.keys())
+        points = np.array([self.problem.target_points[name] for name in names], dtype=float)
+        index = spatial_index(self.mesh)
+        element, N, inside = index.shape_values(points)
+        for name in np.array(names, dtype=object)[~inside]:
+            print(f"警告: 目标点 '{name}' 不在网格内, 取最近单元边界上的位移。")
+        values = np.einsum('pk,pkc->pc', N, np.asarray(displacements)[index.elements[element]])
+        for name, disp in zip(names, values):
             target_results[name] = (disp[0], disp[1]) # (水平位移, 竖直位移)
-            
+
         return target_results
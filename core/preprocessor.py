@@ -1,7 +1,11 @@
+import re
+import numpy as np
 import triangle as tr
 from core.fem_model import ProblemDefinition
+from core.renumbering import renumber_mesh
+from core.boundary import SEGMENT_MARKER_OFFSET, segment_markers
 
-def create_mesh(problem: ProblemDefinition, mesh_opts='pq30a0.1'):
+def create_mesh(problem: ProblemDefinition, mesh_opts='pq30a0.1', renumber=True, quadratic=False):
     """
     使用 'triangle' 库为给定的问题定义生成网格。
 
@@ -11,6 +15,9 @@ def create_mesh(problem: ProblemDefinition, mesh_opts='pq30a0.1'):
                          'p': PSLG (平面直线图)
                          'q30': 最小角度为30度的质量约束
                          'a': 施加最大面积约束
+        renumber (bool): 是否用逆Cuthill-McKee排序重新编号节点, 以减小带宽和分解填充。
+        quadratic (bool): 是否生成6节点二次三角形 (T6/LST) 单元, 即 'o2' 选项。
+                          也可以直接在 mesh_opts 中给出 'o2'。
 
     Returns:
         dict: triangle库生成的网格字典, 如果失败则返回None。
@@ -19,10 +26,41 @@ def create_mesh(problem: ProblemDefinition, mesh_opts='pq30a0.1'):
         print("错误: 无法生成网格，顶点或线段未定义。")
         return None
 
-    # 将问题定义打包成triangle库所需的格式
+    geom, mesh_opts = triangle_input(problem, mesh_opts, quadratic)
+
+    print(f"正在使用选项 '{mesh_opts}' 生成网格...")
+    try:
+        mesh = tr.triangulate(geom, mesh_opts)
+        print(f"网格生成成功！共 {len(mesh['vertices'])} 个节点, {len(mesh['triangles'])} 个单元。")
+        # 为每个单元附加材料属性
+        if 'regions' in geom:
+            # triangle的'triangle_attributes'字段存储了每个单元的区域属性
+            mesh['element_attributes'] = mesh.get('triangle_attributes', [])
+        else:
+            # 如果没有定义区域，为所有单元分配默认材料ID (第一个材料的ID)
+            num_elements = len(mesh['triangles'])
+            default_id = default_material_id(problem)
+            mesh['element_attributes'] = [[default_id] for _ in range(num_elements)]
+        mesh['segment_marker_offset'] = SEGMENT_MARKER_OFFSET
+        if renumber:
+            renumber_mesh(mesh)
+        return mesh
+    except Exception as e:
+        print(f"网格生成失败: {e}")
+        return None
+
+def triangle_input(problem: ProblemDefinition, mesh_opts='pq30a0.1', quadratic=False):
+    """
+    将问题定义打包成 'triangle' 库所需的输入 (PSLG、线段标记、区域点)。
+
+    Returns:
+        tuple: (geom, mesh_opts), mesh_opts 在 quadratic 为True时加上 'o2'.
+    """
+    # 线段标记记录每条子线段来自哪条线段, 用于直接查找边界节点
     geom = {
         'vertices': problem.vertices,
-        'segments': problem.segments
+        'segments': problem.segments,
+        'segment_markers': segment_markers(len(problem.segments)),
     }
     if problem.regions:
         # triangle需要区域属性，这里我们将材料ID作为属性
@@ -38,42 +76,72 @@ def create_mesh(problem: ProblemDefinition, mesh_opts='pq30a0.1'):
             else:
                 print(f"警告: 区域中的材料 '{material_name}' 未在材料库中找到")
                 # 使用第一个可用材料的ID，如果没有材料则使用1
-                if problem.materials:
-                    default_material = list(problem.materials.values())[0]
-                    default_id = default_material.id
-                else:
-                    default_id = 1
-                regions_for_tri.append([r[0], r[1], default_id, -1])
+                regions_for_tri.append([r[0], r[1], default_material_id(problem), -1])
         geom['regions'] = regions_for_tri
 
-    print(f"正在使用选项 '{mesh_opts}' 生成网格...")
+    if quadratic and 'o2' not in mesh_opts:
+        mesh_opts += 'o2'
+    return geom, mesh_opts
+
+def default_material_id(problem: ProblemDefinition):
+    """没有区域或区域材料不存在时使用的材料ID: 第一个材料的ID, 没有材料时为1。"""
+    if problem.materials:
+        return list(problem.materials.values())[0].id
+    return 1
+
+def refine_mesh(mesh, max_areas, mesh_opts='pq30a0.1', renumber=True):
+    """
+    使用 'triangle' 库的加密选项 'r' 对已有网格进行局部加密。
+
+    每个单元的最大面积由 max_areas 给出 (triangle_max_area), 不需要加密的单元取 -1。
+    原网格的线段及其标记、单元区域属性都会保留; 二次单元网格只将角点传给
+    triangle, 加密后重新生成边中点。
+
+    Args:
+        mesh (dict): 已有网格 (create_mesh 或 refine_mesh 的结果).
+        max_areas (np.ndarray): 形状 (单元数,) 的单元最大面积约束.
+        mesh_opts (str): 生成原网格时的剖分选项, 沿用其中的质量约束 'q' 和 'o2'.
+        renumber (bool): 是否用逆Cuthill-McKee排序重新编号节点.
+
+    Returns:
+        dict: 加密后的网格字典, 如果失败则返回None。
+    """
+    # 只保留角点 (二次单元的边中点不属于任何线性三角形, 会成为孤立节点)
+    corners = np.asarray(mesh['triangles'])[:, :3]
+    used, corners = np.unique(corners, return_inverse=True)
+    geom = {
+        'vertices': np.asarray(mesh['vertices'])[used],
+        'triangles': corners.reshape(-1, 3),
+        'triangle_max_area': np.asarray(max_areas, dtype=float),
+    }
+    if 'vertex_markers' in mesh:
+        geom['vertex_markers'] = np.asarray(mesh['vertex_markers'])[used]
+    if 'segments' in mesh:
+        new_index = np.full(len(mesh['vertices']), -1, dtype=np.int64)
+        new_index[used] = np.arange(len(used))
+        geom['segments'] = new_index[np.asarray(mesh['segments'])]
+        if 'segment_markers' in mesh:
+            geom['segment_markers'] = mesh['segment_markers']
+    attrs = mesh.get('element_attributes', [])
+    if len(attrs) > 0:
+        geom['triangle_attributes'] = np.asarray(attrs, dtype=float).reshape(len(attrs), -1)
+
+    quality = re.search(r'q[\d.]*', mesh_opts)
+    refine_opts = 'rpa' + (quality.group(0) if quality else '') + ('o2' if 'o2' in mesh_opts else '')
+
+    print(f"正在使用选项 '{refine_opts}' 加密网格...")
     try:
-        mesh = tr.triangulate(geom, mesh_opts)
-        print("网格生成成功！")
-        # 在网格生成后添加
-        print(f"调试: 定义的区域数据: {regions_for_tri}")
-        triangle_attrs = mesh.get('triangle_attributes', [])
-        print(f"调试: triangle生成的属性数量: {len(triangle_attrs)}")
-        if len(triangle_attrs) > 0:
-            print(f"调试: 前10个单元的属性: {triangle_attrs[:10]}")
-        # 为每个单元附加材料属性
-        if 'regions' in geom:
-            # triangle的'triangle_attributes'字段存储了每个单元的区域属性
-            mesh['element_attributes'] = mesh.get('triangle_attributes', [])
-        else:
-            # 如果没有定义区域，为所有单元分配默认材料ID (假设为第一个材料的ID)
-            num_elements = len(mesh['triangles'])
-            default_material_id = list(problem.materials.keys())[0] if problem.materials else "default"
-            # 获取材料的ID值
-            if problem.materials:
-                default_id = list(problem.materials.values())[0].id
-            else:
-                default_id = 1  # 默认材料ID
-            mesh['element_attributes'] = [[default_id] for _ in range(num_elements)]
-        return mesh
+        refined = tr.triangulate(geom, refine_opts)
     except Exception as e:
-        print(f"网格生成失败: {e}")
+        print(f"网格加密失败: {e}")
         return None
+    refined['element_attributes'] = refined.get('triangle_attributes', [])
+    if 'segment_marker_offset' in mesh:
+        refined['segment_marker_offset'] = mesh['segment_marker_offset']
+    print(f"网格加密完成: 单元数 {len(mesh['triangles'])} -> {len(refined['triangles'])}")
+    if renumber:
+        renumber_mesh(refined)
+    return refined
 
 # 将 'pq30a10.0' 改为 'pq30a10.0A'
 mesh_opts = 'pq30a10.0A'  # A标志启用区域属性
@@ -0,0 +1,130 @@
+import numpy as np
+from scipy.sparse import csr_matrix
+from .geometry import element_geometry
+from .boundary import T6_EDGE_NODES
+
+
+def average_nodal_values(geometry, point_values):
+    """
+    按面积加权平均将积分点的量恢复到节点。
+
+    节点值为其所属各单元的值按单元面积加权的平均, 即
+    Σ w_p·v_p / Σ w_p (对节点所属单元的全部积分点求和, w_p 为积分权重)。
+    通过节点-积分点关联矩阵计算, 每个分量只需一次稀疏矩阵乘法。
+
+    Args:
+        geometry (ElementGeometryCache): 单元几何缓存.
+        point_values (np.ndarray): 形状 (积分点数, 分量数) 的积分点值.
+
+    Returns:
+        np.ndarray: 形状 (节点数, 分量数) 的节点值.
+    """
+    incidence = geometry.point_incidence
+    weights = incidence @ geometry.area
+    weights[weights == 0] = 1.0
+    return (incidence @ (point_values * geometry.area[:, None])) / weights[:, None]
+
+
+def spr_nodal_values(geometry, nodes, elements, point_values):
+    """
+    超收敛分片恢复 (SPR, Zienkiewicz-Zhu) 节点值。
+
+    对每个节点, 取其所属单元的全部积分点 (分片) 用线性多项式
+    v = a0 + a1·x + a2·y 最小二乘拟合积分点值, 节点值即多项式在节点处的值。
+    以节点为原点的局部坐标拟合时节点值就是 a0。所有分片的法方程由关联矩阵
+    一次组装, 以批量的3x3求解得到。
+
+    边界节点的分片只在一侧有积分点, 外推误差大; 这些节点以及积分点不足以
+    确定线性多项式的节点, 取相邻内部分片的多项式在该节点处的值的平均,
+    没有相邻内部分片时退化为面积加权平均。
+
+    Args:
+        geometry (ElementGeometryCache): 单元几何缓存.
+        nodes (np.ndarray): 节点坐标, 形状 (节点数, 2).
+        elements (np.ndarray): 单元节点编号.
+        point_values (np.ndarray): 形状 (积分点数, 分量数) 的积分点值.
+
+    Returns:
+        np.ndarray: 形状 (节点数, 分量数) 的节点值.
+    """
+    nodes = np.asarray(nodes, dtype=float)
+    incidence = geometry.point_incidence
+    num_nodes, num_components = incidence.shape[0], point_values.shape[1]
+    rows = np.repeat(np.arange(num_nodes), np.diff(incidence.indptr))
+    cols = incidence.indices
+    count = np.diff(incidence.indptr)
+
+    # 以节点为原点、分片尺寸为单位长度的局部坐标
+    size = np.sqrt(np.maximum(incidence @ geometry.area, 1e-300))
+    local = (geometry.point_coordinates[cols] - nodes[rows]) / size[rows, None]
+    P = np.column_stack([np.ones(len(rows)), local])
+
+    # 分片法方程 M a = b: M = Σ P·Pᵀ, b = Σ P·vᵀ (按节点求和)
+    patch_sum = csr_matrix((np.ones(len(rows)), np.arange(len(rows)), incidence.indptr),
+                           shape=(num_nodes, len(rows)))
+    M = (patch_sum @ (P[:, :, None] * P[:, None, :]).reshape(len(rows), 9)).reshape(-1, 3, 3)
+    b = (patch_sum @ (P[:, :, None] * point_values[cols][:, None, :]).reshape(len(rows), -1))
+    b = b.reshape(-1, 3, num_components)
+
+    valid = (count >= 3) & (np.linalg.det(M) > 1e-8 * np.maximum(count, 1) ** 3)
+    valid &= ~_boundary_nodes(elements, num_nodes)
+    coefficients = np.zeros((num_nodes, 3, num_components))
+    coefficients[valid] = np.linalg.solve(M[valid], b[valid])
+
+    nodal = average_nodal_values(geometry, point_values)
+    nodal[valid] = coefficients[valid, 0]
+
+    # 边界节点及无效分片的节点: 取相邻有效分片的多项式在该节点处的值的平均
+    adjacency = (incidence[~valid] @ incidence.T).tocoo()
+    invalid_nodes = np.flatnonzero(~valid)[adjacency.row]
+    neighbours = adjacency.col
+    keep = valid[neighbours]
+    invalid_nodes, neighbours = invalid_nodes[keep], neighbours[keep]
+    if len(neighbours) > 0:
+        offset = (nodes[invalid_nodes] - nodes[neighbours]) / size[neighbours, None]
+        values = (coefficients[neighbours, 0]
+                  + offset[:, [0]] * coefficients[neighbours, 1]
+                  + offset[:, [1]] * coefficients[neighbours, 2])
+        total = np.zeros((num_nodes, num_components))
+        np.add.at(total, invalid_nodes, values)
+        neighbour_count = np.bincount(invalid_nodes, minlength=num_nodes)
+        has_neighbour = neighbour_count > 0
+        nodal[has_neighbour] = total[has_neighbour] / neighbour_count[has_neighbour, None]
+    return nodal
+
+
+def recover_nodal_values(mesh, point_values, method='spr'):
+    """
+    将积分点的量 (例如应力分量) 恢复为连续的节点场。
+
+    Args:
+        mesh (dict): 网格字典.
+        point_values (np.ndarray): 形状 (积分点数, 分量数) 的积分点值;
+                                   CST单元的积分点即单元.
+        method (str): 'average' (面积加权平均) 或 'spr' (超收敛分片恢复).
+
+    Returns:
+        np.ndarray: 形状 (节点数, 分量数) 的节点值.
+    """
+    geometry = element_geometry(mesh)
+    point_values = np.asarray(point_values, dtype=float)
+    if method == 'average':
+        return average_nodal_values(geometry, point_values)
+    if method == 'spr':
+        return spr_nodal_values(geometry, mesh['vertices'], mesh['triangles'], point_values)
+    raise ValueError(f"未知的节点恢复方法: {method}")
+
+
+def _boundary_nodes(elements, num_nodes):
+    """网格边界上的节点 (只属于一个单元的边上的节点) 的掩码。"""
+    elements = np.asarray(elements, dtype=np.int64)
+    edges = np.sort(elements[:, T6_EDGE_NODES[:, :2]].reshape(-1, 2), axis=1)
+    keys, edge_count = np.unique(edges[:, 0] * num_nodes + edges[:, 1], return_counts=True)
+    boundary_keys = keys[edge_count == 1]
+    mask = np.zeros(num_nodes, dtype=bool)
+    mask[boundary_keys // num_nodes] = True
+    mask[boundary_keys % num_nodes] = True
+    if elements.shape[1] == 6:
+        edge_mids = elements[:, T6_EDGE_NODES[:, 2]].ravel()
+        mask[edge_mids[np.bincount(edge_mids, minlength=num_nodes)[edge_mids] == 1]] = True
+    return mask
@@ -0,0 +1,103 @@
+import numpy as np
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import reverse_cuthill_mckee
+
+# 网格字典中以节点编号为下标的数组, 以及存储节点编号的数组
+NODE_ARRAY_KEYS = ('vertices', 'vertex_markers', 'vertex_attributes')
+NODE_INDEX_KEYS = ('triangles', 'segments', 'edges')
+
+
+def node_adjacency(elements, num_nodes):
+    """
+    由单元连接关系生成节点邻接矩阵 (同一单元内的节点两两相邻)。
+
+    Returns:
+        scipy.sparse.csr_matrix: 形状 (节点数, 节点数) 的对称邻接矩阵.
+    """
+    elements = np.asarray(elements, dtype=np.int64)
+    n = elements.shape[1]
+    rows = np.repeat(elements, n, axis=1).ravel()
+    cols = np.tile(elements, (1, n)).ravel()
+    graph = coo_matrix((np.ones(len(rows)), (rows, cols)), shape=(num_nodes, num_nodes))
+    return graph.tocsr()
+
+
+def bandwidth_and_profile(elements, num_nodes, dofs_per_node=2):
+    """
+    计算刚度矩阵的半带宽和轮廓 (包络) 大小。
+
+    Args:
+        elements (np.ndarray): 单元节点编号.
+        num_nodes (int): 节点数.
+        dofs_per_node (int): 每个节点的自由度数.
+
+    Returns:
+        tuple: (半带宽, 轮廓), 均按自由度计.
+                半带宽 = max|i - j|, 轮廓 = Σ_i (i - 第i行最左非零列).
+    """
+    elements = np.asarray(elements, dtype=np.int64)
+    offsets = np.arange(dofs_per_node)
+    dofs = (elements[:, :, None] * dofs_per_node + offsets).reshape(len(elements), -1)
+    bandwidth = int((dofs.max(axis=1) - dofs.min(axis=1)).max()) if len(dofs) else 0
+
+    # 每个自由度所在行的最左非零列 = 相连单元中的最小自由度编号
+    first_column = np.arange(num_nodes * dofs_per_node)
+    np.minimum.at(first_column, dofs.ravel(), np.repeat(dofs.min(axis=1), dofs.shape[1]))
+    profile = int((np.arange(len(first_column)) - first_column).sum())
+    return bandwidth, profile
+
+
+def reverse_cuthill_mckee_order(elements, num_nodes):
+    """
+    对节点邻接图执行逆Cuthill-McKee排序。
+
+    Returns:
+        np.ndarray: 排列 perm, 新编号 i 的节点为原编号 perm[i] 的节点.
+    """
+    graph = node_adjacency(elements, num_nodes)
+    return np.asarray(reverse_cuthill_mckee(graph, symmetric_mode=True), dtype=np.int64)
+
+
+def renumber_mesh(mesh):
+    """
+    用逆Cuthill-McKee排序重新编号网格节点, 以减小刚度矩阵的带宽和分解填充。
+
+    直接修改并返回网格字典: 节点数组按新编号重排, 单元/线段中的节点编号替换为
+    新编号。排列保存在 mesh['node_permutation'] (新编号 -> triangle原始编号),
+    重编号前后的带宽和轮廓保存在 mesh['renumbering']。由于整个网格一起重排,
+    求解和后处理得到的结果都直接对应新网格, 无需再映射。
+
+    Args:
+        mesh (dict): triangle库生成的网格字典.
+
+    Returns:
+        dict: 重新编号后的网格字典.
+    """
+    num_nodes = len(mesh['vertices'])
+    elements = np.asarray(mesh['triangles'])
+    bandwidth_before, profile_before = bandwidth_and_profile(elements, num_nodes)
+
+    perm = reverse_cuthill_mckee_order(elements, num_nodes)
+    inverse = np.empty_like(perm)
+    inverse[perm] = np.arange(num_nodes)
+
+    for key in NODE_ARRAY_KEYS:
+        if key in mesh and len(mesh[key]) == num_nodes:
+            mesh[key] = np.asarray(mesh[key])[perm]
+    for key in NODE_INDEX_KEYS:
+        if key in mesh:
+            indices = np.asarray(mesh[key])
+            mesh[key] = inverse[indices].astype(indices.dtype)
+
+    bandwidth_after, profile_after = bandwidth_and_profile(mesh['triangles'], num_nodes)
+    mesh['node_permutation'] = perm
+    mesh['renumbering'] = {
+        'method': 'RCM',
+        'bandwidth_before': bandwidth_before,
+        'bandwidth_after': bandwidth_after,
+        'profile_before': profile_before,
+        'profile_after': profile_after,
+    }
+    print(f"节点重编号 (RCM): 半带宽 {bandwidth_before} -> {bandwidth_after}, "
+          f"轮廓 {profile_before} -> {profile_after}")
+    return mesh
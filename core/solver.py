@@ -1,30 +1,139 @@
+import time
 import numpy as np
-from scipy.sparse import lil_matrix
-from .utils import get_d_matrix, get_b_matrix, is_point_on_segment
+from scipy.sparse import csr_matrix, diags
+from scipy.sparse.linalg import splu, spilu
+from .utils import get_d_matrices, points_on_segments
+from .fem_model import BASE_LOAD_CASE, LineLoad
+from .assembly import element_stiffness_matrices, cached_sparsity_pattern
+from .geometry import element_geometry, element_materials
+from .boundary import boundary_index, edge_inward_normals
+
+class _PermutedFactor:
+    """
+    按预先确定的对称排列 q 分解 K[q][:, q] 得到的LU分解, solve 时自动换回原编号。
+    用于复用同一结构的矩阵上一次分解得到的填充缩减排序。
+    """
+    def __init__(self, lu, perm):
+        self.lu = lu
+        self.perm = perm
+        self.L = lu.L
+        self.U = lu.U
+
+    def solve(self, b):
+        x = self.lu.solve(b[self.perm])
+        result = np.empty_like(x)
+        result[self.perm] = x
+        return result
+
 
 class FemSolver:
     """
     有限元求解器类。
+
+    Args:
+        problem (ProblemDefinition): 问题定义。
+        mesh (dict): triangle库生成的网格字典。
+        linear_solver (str): 线性方程组求解方式。
+                             'direct': 稀疏LU直接求解 (默认, 不构造稠密矩阵)
+                             'dense': 转换为稠密矩阵后求解 (仅适用于小模型)
+                             'cg': 预条件Krylov迭代法 (不保存完整分解, 适用于超大网格)
+        ordering (str): 稀疏LU分解使用的填充缩减排序 (SuperLU的permc_spec),
+                        例如 'MMD_AT_PLUS_A', 'COLAMD', 'NATURAL'。
+        preconditioner (str): 迭代法的预条件子。
+                              'jacobi': 对角线 (Jacobi) 预条件 (默认, 只需保存对角线)
+                              'ic': 对称模式的不完全分解, 取其 L 和对角线构成对称正定的
+                                    L·D·L^T, 用于共轭梯度法
+                              'ilu': 不完全LU分解, 非对称, 改用BiCGSTAB迭代
+                              'ic' 和 'ilu' 需要保存不完全分解因子 (fill_factor=3, 非零元
+                              最多约为 K 的3倍), 实际大小记录在
+                              solver_info['preconditioner_nnz'] 中。
+        tol (float): 迭代法的相对残差收敛容差 ||r|| / ||F||。
+        maxiter (int): 迭代法的最大迭代次数, 默认为自由度数的10倍。
+        bc_method (str): 位移边界条件的处理方式。
+                         'elimination': 删去约束自由度, 求解缩减方程组 (默认)
+                         'penalty': 罚函数法, 在对角线上叠加大数
     """
-    def __init__(self, problem, mesh):
+    def __init__(self, problem, mesh, linear_solver='direct', ordering='MMD_AT_PLUS_A',
+                 preconditioner='jacobi', tol=1.0e-8, maxiter=None, bc_method='elimination'):
+        if linear_solver not in ('direct', 'dense', 'cg'):
+            raise ValueError(f"未知的线性求解方式: {linear_solver}")
+        if preconditioner not in ('jacobi', 'ilu', 'ic'):
+            raise ValueError(f"未知的预条件子: {preconditioner}")
+        if bc_method not in ('elimination', 'penalty'):
+            raise ValueError(f"未知的边界条件处理方式: {bc_method}")
         self.problem = problem
         self.mesh = mesh
         self.nodes = mesh['vertices']
         self.elements = mesh['triangles']
+        # 单元B矩阵、面积、自由度编号和区域属性, 同一网格的各次分析共用
+        self.geometry = element_geometry(mesh)
+        # 问题定义中的线段 -> 网格边界节点/边, 由triangle线段标记建立
+        self.boundary = boundary_index(mesh)
         self.num_nodes = len(self.nodes)
         self.total_dof = self.num_nodes * 2  # 每个节点2个自由度 (x, y)
 
-        # 全局刚度矩阵 (K) 和 全局荷载向量 (F)
-        self.K = lil_matrix((self.total_dof, self.total_dof))
+        # 全局刚度矩阵 (K) 和 全局荷载矩阵 (F, 每个荷载工况一列)
+        self.K = csr_matrix((self.total_dof, self.total_dof))
         self.F = np.zeros((self.total_dof, 1))
         
         # 罚函数法使用的大数
         self.penalty_value = 1.0e20
+        self.bc_method = bc_method
+
+        # 自由度映射: 约束/自由自由度的全局编号, 以及全局编号到缩减方程组编号的映射
+        self.constrained_dofs = np.array([], dtype=np.int64)
+        self.free_dofs = np.arange(self.total_dof)
+        self.global_to_free = np.arange(self.total_dof)
+        # 约束自由度上的给定位移值
+        self.prescribed_values = np.zeros((0, 1))
+        # 支座反力, 形状与荷载矩阵相同
+        self.reactions = np.zeros((self.total_dof, 1))
+
+        # 荷载工况名称 (与 self.F 的列一一对应) 及各工况的位移解
+        self.load_case_names = [BASE_LOAD_CASE]
+        self.load_case_displacements = {}
+
+        self.linear_solver = linear_solver
+        self.ordering = ordering
+        self.preconditioner = preconditioner
+        self.tol = tol
+        self.maxiter = maxiter
+        # 求解过程的统计信息 (分解耗时、填充量等)
+        self.solver_info = {}
+        # 刚度矩阵的符号结构, 缓存在网格字典中供同一网格的后续分析复用
+        self.sparsity_pattern = None
 
     def solve(self):
         """
         执行有限元分析全过程。
+
+        所有荷载工况共用一次刚度矩阵组装和分解, 各工况的右端项作为一个
+        矩阵一次求解。各工况的位移保存在 self.load_case_displacements 中。
+
+        Returns:
+            np.ndarray: 基本工况的节点位移向量, 形状 (总自由度数, 1); 失败时为None。
         """
+        self.assemble_system()
+        
+        print("开始求解线性方程组...")
+        K_sys, F_sys = self._build_linear_system()
+        u_sys = self._solve_linear_system(K_sys, F_sys)
+        if u_sys is None:
+            return None
+
+        displacements = self._expand_solution(u_sys)
+        if 'renumbering' in self.mesh:
+            self.solver_info['renumbering'] = self.mesh['renumbering']
+        self.reactions = self._recover_reactions(displacements)
+        self.load_case_displacements = {
+            name: displacements[:, [j]] for j, name in enumerate(self.load_case_names)
+        }
+        print("求解成功！")
+        # 返回基本工况的位移
+        return displacements[:, [0]]
+
+    def assemble_system(self):
+        """组装全局刚度矩阵、确定约束自由度并组装荷载矩阵。"""
         print("开始组装全局刚度矩阵...")
         self._assemble_global_stiffness()
         
@@ -33,169 +142,529 @@ class FemSolver:
         
         print("开始组装荷载向量...")
         self._assemble_load_vector()
-        
-        print("开始求解线性方程组...")
-        # 将稀疏矩阵转换为更适合求解的CSR格式
-        K_csr = self.K.tocsr()
-        
+
+    def _build_linear_system(self):
+        """
+        根据边界条件处理方式生成待求解的线性方程组 (K_sys, F_sys)。
+
+        'elimination': 按下标删去约束自由度的行和列, 得到仅含自由自由度的
+                       缩减方程组 K_ff u_f = F_f - K_fc u_c。
+        'penalty': 在约束自由度的对角线上叠加大数。
+        """
+        K = self.K.tocsr()
+        if self.bc_method == 'penalty':
+            penalty = np.zeros(self.total_dof)
+            penalty[self.constrained_dofs] = self.penalty_value
+            F_sys = self.F.copy()
+            F_sys[self.constrained_dofs] += self.penalty_value * self.prescribed_values
+            return (K + diags(penalty)).tocsr(), F_sys
+
+        K_ff = self.sparsity_pattern.submatrix(K, self.free_dofs)
+        F_f = self.F[self.free_dofs]
+        if np.any(self.prescribed_values):
+            F_f = F_f - K[self.free_dofs][:, self.constrained_dofs] @ self.prescribed_values
+        return K_ff, F_f
+
+    def _solve_linear_system(self, K, F):
+        """按选定的线性求解方式求解 K u = F, 失败时返回None。"""
+        if self.linear_solver == 'dense':
+            try:
+                u = np.linalg.solve(K.toarray(), F)
+            except np.linalg.LinAlgError as e:
+                print(f"求解失败：矩阵为奇异矩阵。请检查约束是否足够。错误: {e}")
+                return None
+            self.solver_info = {'linear_solver': 'dense', 'num_dof': K.shape[0]}
+            return u
+
+        if self.linear_solver == 'cg':
+            u = self._solve_iterative(K, F)
+            if u is None:
+                print(f"求解失败：共轭梯度法在 {self.solver_info['iterations']} 次迭代内未收敛 "
+                      f"(相对残差 {self.solver_info['relative_residual']:.3e})。")
+            return u
+
         try:
-            displacements = np.linalg.solve(K_csr.toarray(), self.F)
-            print("求解成功！")
-            return displacements
-        except np.linalg.LinAlgError as e:
+            return self._solve_sparse_direct(K, F)
+        except RuntimeError as e:
             print(f"求解失败：矩阵为奇异矩阵。请检查约束是否足够。错误: {e}")
             return None
 
+    def _expand_solution(self, u_sys):
+        """将线性方程组的解还原为全部自由度的位移向量。"""
+        if self.bc_method == 'penalty':
+            return u_sys
+        displacements = np.zeros((self.total_dof,) + u_sys.shape[1:])
+        displacements[self.free_dofs] = u_sys
+        displacements[self.constrained_dofs] = self.prescribed_values
+        return displacements
+
+    def _recover_reactions(self, displacements):
+        """
+        由未施加约束的K计算支座反力 R_c = K_c u - F_c, 只涉及约束自由度所在的行。
+
+        Returns:
+            np.ndarray: 与荷载向量形状相同的反力向量, 自由自由度处为0。
+        """
+        reactions = np.zeros_like(self.F)
+        if len(self.constrained_dofs) > 0:
+            K_c = self.K.tocsr()[self.constrained_dofs]
+            reactions[self.constrained_dofs] = K_c @ displacements - self.F[self.constrained_dofs]
+        return reactions
+
+    def _solve_sparse_direct(self, K_csr, F):
+        """
+        使用带填充缩减排序的稀疏LU分解 (SuperLU) 求解 K u = F。
+
+        刚度矩阵是对称的，因此以对称模式分解 (只在对角线上选主元)，
+        使排序对 K + K^T 的图生效。全过程不构造稠密矩阵。
+        """
+        n = K_csr.shape[0]
+        K_csc = K_csr.tocsc()
+
+        t0 = time.perf_counter()
+        ordering_key = None
+        if self.bc_method == 'elimination':
+            ordering_key = self.sparsity_pattern.submatrix_key(self.free_dofs)
+        lu = self.factorize(K_csc, ordering_key)
+        factor_time = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        displacements = lu.solve(F)
+        solve_time = time.perf_counter() - t0
+
+        # 填充量: L 和 U 的非零元 (L 的单位对角线不计) 与 K 的非零元之比
+        nnz_factor = lu.L.nnz + lu.U.nnz - n
+        self.solver_info = {
+            'linear_solver': 'direct',
+            'ordering': self.ordering,
+            'num_dof': n,
+            'nnz_K': K_csc.nnz,
+            'nnz_LU': nnz_factor,
+            'fill_ratio': nnz_factor / max(K_csc.nnz, 1),
+            'factorization_time': factor_time,
+            'solve_time': solve_time,
+        }
+        print(f"稀疏LU分解完成: 自由度 {n}, 排序 {self.ordering}, "
+              f"nnz(K)={K_csc.nnz}, nnz(L+U)={nnz_factor} "
+              f"(填充比 {self.solver_info['fill_ratio']:.2f}), "
+              f"分解耗时 {factor_time:.3f} s, 回代耗时 {solve_time:.3f} s")
+        return displacements.reshape(F.shape)
+
+    def factorize(self, K, ordering_key=None):
+        """
+        以对称模式和选定的填充缩减排序对稀疏矩阵K进行LU分解。
+
+        给出 ordering_key 时, 该结构第一次分解得到的列排列会缓存在符号结构中,
+        之后相同结构的矩阵 (例如只改变了材料参数) 直接按该排列重排后以
+        'NATURAL' 排序分解, 省去排序计算。
+
+        Returns:
+            SuperLU 或 _PermutedFactor: 具有 solve 方法的分解对象.
+        """
+        options = dict(diag_pivot_thresh=0.0, options=dict(SymmetricMode=True))
+        if ordering_key is None or self.sparsity_pattern is None or self.ordering == 'NATURAL':
+            return splu(K.tocsc(), permc_spec=self.ordering, **options)
+
+        cache_key = (ordering_key, self.ordering)
+        perm = self.sparsity_pattern.orderings.get(cache_key)
+        if perm is not None and len(perm) == K.shape[0]:
+            K = K.tocsr()
+            lu = splu(K[perm][:, perm].tocsc(), permc_spec='NATURAL', **options)
+            return _PermutedFactor(lu, perm)
+
+        lu = splu(K.tocsc(), permc_spec=self.ordering, **options)
+        self.sparsity_pattern.orderings[cache_key] = np.argsort(lu.perm_c)
+        return lu
+
+    def _solve_iterative(self, K_csr, F):
+        """
+        使用预条件Krylov迭代法求解 K u = F, 只保存K和预条件子。
+
+        对称正定的预条件子 (Jacobi, IC) 使用共轭梯度法 (PCG); 非对称的ILU预条件子
+        不满足共轭梯度法的前提, 改用BiCGSTAB。逐个求解F的每一列。每次迭代的相对残差 ||r|| / ||F|| 记录在
+        solver_info['residual_history'] 中。未收敛时返回None。
+        """
+        n = K_csr.shape[0]
+        maxiter = self.maxiter if self.maxiter is not None else 10 * n
+
+        t0 = time.perf_counter()
+        apply_preconditioner, preconditioner_nnz = self._build_preconditioner(K_csr)
+        iterate = self._pbicgstab if self.preconditioner == 'ilu' else self._pcg
+        setup_time = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        F_columns = F.reshape(n, -1)
+        displacements = np.zeros(F_columns.shape)
+        histories = []
+        converged = True
+        for j in range(F_columns.shape[1]):
+            x, history, column_converged = iterate(K_csr, F_columns[:, j], apply_preconditioner, maxiter)
+            displacements[:, j] = x
+            histories.append(history)
+            converged = converged and column_converged
+        solve_time = time.perf_counter() - t0
+
+        self.solver_info = {
+            'linear_solver': 'cg',
+            'krylov_method': 'bicgstab' if self.preconditioner == 'ilu' else 'cg',
+            'preconditioner': self.preconditioner,
+            'preconditioner_nnz': preconditioner_nnz,
+            'num_dof': n,
+            'nnz_K': K_csr.nnz,
+            'tol': self.tol,
+            'maxiter': maxiter,
+            'converged': converged,
+            'iterations': max(len(h) - 1 for h in histories),
+            'relative_residual': max(h[-1] for h in histories),
+            'residual_history': histories[0] if len(histories) == 1 else histories,
+            'preconditioner_time': setup_time,
+            'solve_time': solve_time,
+        }
+        method_name = 'BiCGSTAB' if self.preconditioner == 'ilu' else '共轭梯度法'
+        print(f"{method_name} ({self.preconditioner}预条件): 自由度 {n}, "
+              f"预条件子非零元 {preconditioner_nnz} (nnz(K)={K_csr.nnz}), "
+              f"迭代 {self.solver_info['iterations']} 次, "
+              f"相对残差 {self.solver_info['relative_residual']:.3e}, "
+              f"预条件耗时 {setup_time:.3f} s, 迭代耗时 {solve_time:.3f} s")
+        if not converged:
+            return None
+        return displacements.reshape(F.shape)
+
+    def _build_preconditioner(self, K_csr):
+        """
+        构造预条件子。
+
+        Returns:
+            tuple: (计算 z = M^-1 r 的函数, 预条件子保存的非零元个数).
+        """
+        if self.preconditioner == 'jacobi':
+            diagonal = K_csr.diagonal()
+            inv_diagonal = np.zeros_like(diagonal)
+            nonzero = diagonal != 0
+            inv_diagonal[nonzero] = 1.0 / diagonal[nonzero]
+            return (lambda r: inv_diagonal * r), len(diagonal)
+
+        K_csc = K_csr.tocsc()
+        if self.preconditioner == 'ilu':
+            factor = spilu(K_csc, drop_tol=1e-4, fill_factor=3)
+            return factor.solve, factor.L.nnz + factor.U.nnz
+
+        # SciPy没有不完全Cholesky; 对称模式下只在对角线选主元并使用对称排序,
+        # P·K·P^T ≈ L·U。丢弃元素使 U 与 D·L^T 不完全相同, 因此只取 L 和 U 的对角线
+        # 构成 M = P^T·L·D·L^T·P, 保证预条件子对称 (D > 0 时正定)
+        factor = spilu(K_csc, drop_tol=1e-4, fill_factor=3, permc_spec='MMD_AT_PLUS_A',
+                       diag_pivot_thresh=0.0, options=dict(SymmetricMode=True))
+        perm = factor.perm_c
+        inv_d = 1.0 / np.abs(factor.U.diagonal())
+        # 单位下三角的 L 以自然排序"分解"即得到其本身, 用SuperLU完成 L 和 L^T 的回代
+        L = splu(factor.L.tocsc(), permc_spec='NATURAL', diag_pivot_thresh=0.0,
+                 options=dict(SymmetricMode=True))
+
+        def apply(r):
+            y = np.empty_like(r)
+            y[perm] = r
+            return L.solve(L.solve(y) * inv_d, trans='T')[perm]
+        return apply, L.L.nnz
+
+    def _pcg(self, K, b, apply_preconditioner, maxiter):
+        """预条件共轭梯度迭代, 返回 (解, 相对残差历史, 是否收敛)。"""
+        x = np.zeros_like(b)
+        b_norm = np.linalg.norm(b)
+        if b_norm == 0:
+            return x, [0.0], True
+
+        r = b.copy()
+        z = apply_preconditioner(r)
+        p = z.copy()
+        rz = r @ z
+        history = [1.0]
+        for _ in range(maxiter):
+            Kp = K @ p
+            alpha = rz / (p @ Kp)
+            x += alpha * p
+            r -= alpha * Kp
+            history.append(np.linalg.norm(r) / b_norm)
+            if history[-1] <= self.tol:
+                return x, history, True
+            z = apply_preconditioner(r)
+            rz_new = r @ z
+            p = z + (rz_new / rz) * p
+            rz = rz_new
+        return x, history, False
+
+    def _pbicgstab(self, K, b, apply_preconditioner, maxiter):
+        """右预条件BiCGSTAB迭代 (适用于非对称预条件子), 返回 (解, 相对残差历史, 是否收敛)。"""
+        x = np.zeros_like(b)
+        b_norm = np.linalg.norm(b)
+        if b_norm == 0:
+            return x, [0.0], True
+
+        r = b.copy()
+        r_hat = r.copy()
+        rho = alpha = omega = 1.0
+        v = np.zeros_like(b)
+        p = np.zeros_like(b)
+        history = [1.0]
+        for _ in range(maxiter):
+            rho_new = r_hat @ r
+            if rho_new == 0:
+                break
+            p = r + (rho_new / rho) * (alpha / omega) * (p - omega * v)
+            p_hat = apply_preconditioner(p)
+            v = K @ p_hat
+            alpha = rho_new / (r_hat @ v)
+            s = r - alpha * v
+            if np.linalg.norm(s) / b_norm <= self.tol:
+                x += alpha * p_hat
+                history.append(np.linalg.norm(s) / b_norm)
+                return x, history, True
+            s_hat = apply_preconditioner(s)
+            t = K @ s_hat
+            omega = (t @ s) / (t @ t)
+            x += alpha * p_hat + omega * s_hat
+            r = s - omega * t
+            history.append(np.linalg.norm(r) / b_norm)
+            if history[-1] <= self.tol:
+                return x, history, True
+            if omega == 0:
+                break
+            rho = rho_new
+        return x, history, False
+
     def _assemble_global_stiffness(self):
-        """组装全局刚度矩阵。"""
-        mat_id_map = {mat.id: mat for mat in self.problem.materials.values()}
-        
-        for i, element in enumerate(self.elements):
-            node_ids = element
-            p1, p2, p3 = self.nodes[node_ids[0]], self.nodes[node_ids[1]], self.nodes[node_ids[2]]
-            
-            # 获取单元的材料属性
-            if i >= len(self.mesh['element_attributes']) or len(self.mesh['element_attributes'][i]) == 0:
-                # 如果没有材料属性，使用第一个可用材料
-                if mat_id_map:
-                    material = list(mat_id_map.values())[0]
-                    print(f"警告: 单元 {i} 没有材料属性，使用默认材料 {material.name}")
-                else:
-                    raise ValueError(f"单元 {i} 没有材料属性，且没有定义任何材料。")
-            else:
-                element_attr = self.mesh['element_attributes'][i][0]
-                material = mat_id_map.get(int(element_attr))
-                if not material:
-                    raise ValueError(f"单元 {i} 的材料ID {element_attr} 无效。")
-
-            # 计算D矩阵和B矩阵
-            D = get_d_matrix(material.elastic_modulus, material.poisson_ratio)
-            B = get_b_matrix(p1, p2, p3)
-            
-            if B is None: continue # 忽略面积为0的单元
-
-            # 计算单元面积
-            area = 0.5 * np.linalg.det(np.array([[1, p1[0], p1[1]], [1, p2[0], p2[1]], [1, p3[0], p3[1]]]))
-
-            # 计算单元刚度矩阵 ke = B^T * D * B * area * t (厚度t=1)
-            ke = B.T @ D @ B * area
-            
-            # 组装到全局刚度矩阵
-            dof_indices = [node_ids[0]*2, node_ids[0]*2+1,
-                           node_ids[1]*2, node_ids[1]*2+1,
-                           node_ids[2]*2, node_ids[2]*2+1]
-            
-            for r in range(6):
-                for c in range(6):
-                    self.K[dof_indices[r], dof_indices[c]] += ke[r, c]
+        """
+        组装全局刚度矩阵。
+
+        所有单元的B矩阵、面积和单元刚度矩阵 ke = B^T*D*B*A 以 (单元数, 6, 6)
+        的批量数组一次算出，再散射到网格缓存的CSR结构中。同一网格再次组装
+        (例如只修改了材料参数) 时只需重新计算数值。
+        面积为0的单元B矩阵为0, 不产生刚度贡献。
+        T6单元先对各高斯点的 B^T*D*B*w 求和得到 (单元数, 12, 12) 的单元刚度矩阵。
+        """
+        D = self._get_element_d_matrices()
+        geometry = self.geometry
+
+        ke = element_stiffness_matrices(geometry.B, D[geometry.point_element], geometry.area)
+        ke = geometry.sum_over_points(ke)
+        self.sparsity_pattern = cached_sparsity_pattern(self.mesh, geometry.element_dof_indices,
+                                                        self.total_dof)
+        self.K = self.sparsity_pattern.assemble(ke)
+
+    def _get_element_d_matrices(self):
+        """根据单元的材料属性批量生成D矩阵, 形状为 (单元数, 3, 3)。"""
+        materials, element_material_index = self._get_element_materials()
+        D_unique = get_d_matrices([m.elastic_modulus for m in materials],
+                                  [m.poisson_ratio for m in materials])
+        return D_unique[element_material_index]
+
+    def _get_element_materials(self):
+        """
+        解析每个单元的材料。
+
+        Returns:
+            tuple: (materials, element_material_index)
+                materials (list): 网格中用到的材料列表.
+                element_material_index (np.ndarray): 每个单元在 materials 中的下标.
+        """
+        return element_materials(self.problem, self.geometry)
+
+    def _get_element_material_ids(self):
+        """读取每个单元的材料ID, 没有材料属性的单元记为 -1。"""
+        return self.geometry.region_ids.copy()
 
     def _apply_boundary_conditions(self):
-        """使用罚函数法施加位移边界条件。"""
+        """确定被约束的自由度, 建立约束/自由自由度映射。"""
         constrained_nodes = self._find_constrained_nodes()
         
+        constrained_dofs = []
         for node_id, constraints in constrained_nodes.items():
             if 'x' in constraints:
-                dof = node_id * 2
-                self.K[dof, dof] += self.penalty_value
+                constrained_dofs.append(node_id * 2)
             if 'y' in constraints:
-                dof = node_id * 2 + 1
-                self.K[dof, dof] += self.penalty_value
+                constrained_dofs.append(node_id * 2 + 1)
+
+        is_constrained = np.zeros(self.total_dof, dtype=bool)
+        is_constrained[constrained_dofs] = True
+        self.constrained_dofs = np.flatnonzero(is_constrained)
+        self.free_dofs = np.flatnonzero(~is_constrained)
+        self.global_to_free = np.full(self.total_dof, -1, dtype=np.int64)
+        self.global_to_free[self.free_dofs] = np.arange(len(self.free_dofs))
+        # 目前所有约束均为零位移约束
+        self.prescribed_values = np.zeros((len(self.constrained_dofs), 1))
 
     def _assemble_load_vector(self):
-        """组装等效节点荷载向量。"""
-        if not self.problem.loads:
+        """
+        组装等效节点荷载矩阵, 每个荷载工况对应 self.F 的一列。
+
+        第一列为基本工况 (problem.loads, 以及启用时的自重荷载),
+        其后依次为 problem.load_cases 中的工况。
+        """
+        load_cases = self._get_load_cases()
+        self.load_case_names = list(load_cases.keys())
+        self.F = np.zeros((self.total_dof, len(load_cases)))
+
+        # 自重荷载计入基本工况
+        if self.problem.include_self_weight:
+            self.F[:, 0] += self._self_weight_vector()
+
+        loaded_seg_ids = set()
+        for loads in load_cases.values():
+            loaded_seg_ids.update(loads.keys())
+        if not loaded_seg_ids:
             return
-            
-        # 使用字典记录每个节点应该承受的总荷载，避免重复施加
-        node_loads = {}  # {node_id: total_load}
-        
-        loaded_nodes = self._find_loaded_nodes()
-        
-        for seg_id, node_ids in loaded_nodes.items():
-            load_val = self.problem.loads[seg_id]
-            p1, p2 = self.problem.vertices[self.problem.segments[seg_id][0]], self.problem.vertices[self.problem.segments[seg_id][1]]
-            seg_length = np.linalg.norm(np.array(p1) - np.array(p2))
-            
-            # 计算该线段上每个节点应该承受的荷载
-            if len(node_ids) == 0:
+
+        loaded_edges = self._find_loaded_edges(sorted(loaded_seg_ids))
+        for j, loads in enumerate(load_cases.values()):
+            self.F[:, j] += self._line_load_vector(loads, loaded_edges)
+
+    def _self_weight_vector(self):
+        """
+        计算所有单元自重的等效节点荷载向量, 形状 (总自由度数,)。
+
+        等效节点荷载为 ∫N_i·γ dA (厚度 t=1), 方向竖直向下。CST单元即将自重 γ·A
+        平均分配到三个节点; T6单元的自重全部分配到三个边中点, 每个 γ·A/3。
+        """
+        materials, element_material_index = self._get_element_materials()
+        unit_weights = np.array([m.unit_weight for m in materials])[element_material_index]
+        geometry = self.geometry
+
+        point_weight = geometry.area * unit_weights[geometry.point_element]
+        nodal_weight = point_weight[:, None] * geometry.shape_values
+        point_nodes = np.asarray(self.elements)[geometry.point_element]
+        node_forces = np.bincount(point_nodes.ravel(), weights=nodal_weight.ravel(),
+                                  minlength=self.num_nodes)
+        F = np.zeros(self.total_dof)
+        F[1::2] = -node_forces  # 荷载向下为负
+        return F
+
+    def _get_load_cases(self):
+        """返回有序的荷载工况字典 {工况名称: {线段ID: 荷载值}}, 基本工况在最前。"""
+        if BASE_LOAD_CASE in self.problem.load_cases:
+            raise ValueError(f"荷载工况名称 '{BASE_LOAD_CASE}' 已被基本工况占用。")
+        load_cases = {BASE_LOAD_CASE: self.problem.loads}
+        load_cases.update(self.problem.load_cases)
+        return load_cases
+
+    def _line_load_vector(self, loads, loaded_edges):
+        """
+        计算一组线段荷载的一致等效节点荷载向量, 形状 (总自由度数,)。
+
+        荷载集度在每条网格边上线性变化 (均布荷载为其特例), 等效节点力为
+        ∫N_i·q dL: 线性边两端为 L(2q_a + q_b)/6 和 L(q_a + 2q_b)/6; 二次边两端为
+        L·q_a/6 和 L·q_b/6, 边中点为 L(q_a + q_b)/3。所有边的节点力由一次
+        np.add.at 累加到荷载向量中。
+
+        Args:
+            loads (dict): {线段ID: 荷载值或 LineLoad}.
+            loaded_edges (dict): {线段ID: 线段上的网格边}, 见 _find_loaded_edges.
+        """
+        nodes = np.asarray(self.nodes, dtype=float)
+        vertices = np.asarray(self.problem.vertices, dtype=float)
+        edge_nodes, edge_forces = [], []
+        for seg_id, value in loads.items():
+            edges = loaded_edges[seg_id]
+            if len(edges) == 0:
                 continue
-            elif len(node_ids) == 1:
-                # 如果线段上只有一个节点（不太可能，但为了健壮性）
-                nodal_force = seg_length * load_val
-                node_id = node_ids[0]
-                if node_id not in node_loads:
-                    node_loads[node_id] = 0.0
-                node_loads[node_id] += nodal_force
+            load = LineLoad.from_value(value)
+            start_value = load.start_value
+            end_value = start_value if load.end_value is None else load.end_value
+
+            # 边端点在线段上的参数坐标, 由此得到端点处的荷载集度
+            p1, p2 = vertices[list(self.problem.segments[seg_id])]
+            d = p2 - p1
+            ends = nodes[edges[:, [0, -1]]]
+            t = (ends - p1) @ d / (d @ d)
+            q = start_value + (end_value - start_value) * t
+            q_a, q_b = q[:, 0], q[:, 1]
+            length = np.linalg.norm(ends[:, 1] - ends[:, 0], axis=1)
+
+            if edges.shape[1] == 3:
+                magnitude = np.column_stack([q_a, 2 * (q_a + q_b), q_b]) * (length / 6)[:, None]
             else:
-                # 线段上有多个节点，需要按照节点间距离分配荷载
-                # 对于均布荷载，可以按照节点在线段上的分布来分配
-                
-                # 获取线段上所有节点的坐标
-                seg_nodes = [(node_id, self.nodes[node_id]) for node_id in node_ids]
-                
-                # 按照在线段上的位置排序
-                seg_vector = np.array(p2) - np.array(p1)
-                seg_nodes.sort(key=lambda x: np.dot(np.array(x[1]) - np.array(p1), seg_vector))
-                
-                # 为每个节点分配荷载
-                for i, (node_id, node_coord) in enumerate(seg_nodes):
-                    if i == 0:  # 第一个节点
-                        if len(seg_nodes) == 1:
-                            segment_length = seg_length
-                        else:
-                            next_coord = seg_nodes[i+1][1]
-                            segment_length = np.linalg.norm(np.array(next_coord) - np.array(node_coord)) / 2
-                    elif i == len(seg_nodes) - 1:  # 最后一个节点
-                        prev_coord = seg_nodes[i-1][1]
-                        segment_length = np.linalg.norm(np.array(node_coord) - np.array(prev_coord)) / 2
-                    else:  # 中间节点
-                        prev_coord = seg_nodes[i-1][1]
-                        next_coord = seg_nodes[i+1][1]
-                        segment_length = (np.linalg.norm(np.array(node_coord) - np.array(prev_coord)) + 
-                                        np.linalg.norm(np.array(next_coord) - np.array(node_coord))) / 2
-                    
-                    nodal_force = segment_length * load_val
-                    
-                    if node_id not in node_loads:
-                        node_loads[node_id] = 0.0
-                    node_loads[node_id] += nodal_force
-        
-        # 将计算出的节点荷载施加到全局荷载向量中
-        for node_id, total_load in node_loads.items():
-            dof = node_id * 2 + 1  # Y方向自由度
-            self.F[dof] -= total_load  # 荷载向下为负
+                magnitude = np.column_stack([2 * q_a + q_b, q_a + 2 * q_b]) * (length / 6)[:, None]
+
+            if load.direction == 'vertical':
+                direction = np.broadcast_to([0.0, -1.0], (len(edges), 2))  # 荷载向下为负
+            elif load.direction == 'normal':
+                direction = edge_inward_normals(nodes, self.elements, edges)
+            else:
+                raise ValueError(f"线段 {seg_id} 的荷载方向 '{load.direction}' 无效。")
+            edge_nodes.append(edges.ravel())
+            edge_forces.append((magnitude[:, :, None] * direction[:, None, :]).reshape(-1, 2))
+
+        node_forces = np.zeros((self.num_nodes, 2))
+        if edge_nodes:
+            np.add.at(node_forces, np.concatenate(edge_nodes), np.concatenate(edge_forces))
+        return node_forces.ravel()
 
     def _find_constrained_nodes(self):
         """在网格中找到所有被约束的节点。"""
         constrained_nodes = {}
+        segment_nodes = self._find_segment_nodes(list(self.problem.constraints.keys()))
         for seg_id, const_type in self.problem.constraints.items():
-            p1 = self.problem.vertices[self.problem.segments[seg_id][0]]
-            p2 = self.problem.vertices[self.problem.segments[seg_id][1]]
-            
-            for node_id, node_coord in enumerate(self.nodes):
-                if is_point_on_segment(node_coord, p1, p2):
-                    if node_id not in constrained_nodes:
-                        constrained_nodes[node_id] = set()
-                    
-                    if "固定" in const_type:
-                        constrained_nodes[node_id].update(['x', 'y'])
-                    elif "X向" in const_type:
-                        constrained_nodes[node_id].add('x')
-                    elif "Y向" in const_type:
-                        constrained_nodes[node_id].add('y')
+            for node_id in segment_nodes[seg_id]:
+                if node_id not in constrained_nodes:
+                    constrained_nodes[node_id] = set()
+                
+                if "固定" in const_type:
+                    constrained_nodes[node_id].update(['x', 'y'])
+                elif "X向" in const_type:
+                    constrained_nodes[node_id].add('x')
+                elif "Y向" in const_type:
+                    constrained_nodes[node_id].add('y')
         return constrained_nodes
         
-    def _find_loaded_nodes(self):
-        """在网格中找到所有施加了荷载的节点。"""
-        loaded_nodes_on_segs = {}
-        for seg_id in self.problem.loads.keys():
-            p1 = self.problem.vertices[self.problem.segments[seg_id][0]]
-            p2 = self.problem.vertices[self.problem.segments[seg_id][1]]
-            
-            nodes_on_this_seg = []
-            for node_id, node_coord in enumerate(self.nodes):
-                if is_point_on_segment(node_coord, p1, p2):
-                    nodes_on_this_seg.append(node_id)
-            loaded_nodes_on_segs[seg_id] = nodes_on_this_seg
-        return loaded_nodes_on_segs
+    def _find_loaded_edges(self, seg_ids):
+        """
+        返回给定荷载线段上的网格边 {线段ID: 形状 (边数, 2) 或 (边数, 3) 的数组}。
+
+        每行为 [起点, 终点] 或二次单元的 [起点, 边中点, 终点]。优先使用边界索引;
+        网格没有线段标记时, 将线段上的节点按位置排序后依次连成边。
+        """
+        loaded_edges, missing = {}, []
+        for seg_id in seg_ids:
+            edges = self.boundary.edges_on_segment(seg_id)
+            if edges is None:
+                missing.append(seg_id)
+            else:
+                loaded_edges[seg_id] = edges
+        if not missing:
+            return loaded_edges
+
+        nodes = np.asarray(self.nodes, dtype=float)
+        vertices = np.asarray(self.problem.vertices, dtype=float)
+        for seg_id, node_ids in self._find_segment_nodes(missing).items():
+            p1, p2 = vertices[list(self.problem.segments[seg_id])]
+            node_ids = np.asarray(node_ids, dtype=np.int64)
+            node_ids = node_ids[np.argsort((nodes[node_ids] - p1) @ (p2 - p1), kind='stable')]
+            if self.geometry.nodes_per_element == 6 and len(node_ids) % 2 == 1:
+                edges = np.column_stack([node_ids[:-2:2], node_ids[1::2], node_ids[2::2]])
+            else:
+                edges = np.column_stack([node_ids[:-1], node_ids[1:]])
+            loaded_edges[seg_id] = edges
+        return loaded_edges
+
+    def _find_segment_nodes(self, seg_ids):
+        """
+        返回问题定义中各线段上的网格节点编号 {线段ID: [节点编号, ...]}。
+
+        优先使用由triangle线段标记建立的边界索引; 网格没有线段标记时,
+        用 points_on_segments 一次判断所有节点与其余线段的从属关系。
+        """
+        segment_nodes, missing = {}, []
+        for seg_id in seg_ids:
+            node_ids = self.boundary.nodes_on_segment(seg_id)
+            if node_ids is None:
+                missing.append(seg_id)
+            else:
+                segment_nodes[seg_id] = [int(node_id) for node_id in node_ids]
+        if not missing:
+            return segment_nodes
 
+        vertices = np.asarray(self.problem.vertices, dtype=float)
+        endpoints = np.array([self.problem.segments[seg_id] for seg_id in missing])
+        point_index, segment_index, _ = points_on_segments(
+            self.nodes, vertices[endpoints[:, 0]], vertices[endpoints[:, 1]])
+        for k, seg_id in enumerate(missing):
+            segment_nodes[seg_id] = point_index[segment_index == k].tolist()
+        return segment_nodes
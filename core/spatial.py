@@ -0,0 +1,191 @@
+import numpy as np
+from scipy.spatial import cKDTree
+from .elements import t6_shape_functions
+
+
+class MeshSpatialIndex:
+    """
+    网格的空间索引, 用于查找任意点所在的单元并在单元内插值节点量。
+
+    以单元形心建立KD树: 对每个查询点取最近的若干个单元作为候选, 用面积坐标
+    判断点是否在单元内, 全部查询点一次批量计算。包含某点的单元, 其形心到该点
+    的距离不超过单元的外接半径 (形心到角点的最大距离), 因此候选单元的形心距离
+    超过所有单元外接半径的最大值后即可确定点在网格外, 不需要继续扩大候选范围。
+    网格外的点取最接近的单元, 面积坐标截断为非负 (即取该单元边界上的值)。
+    通过 spatial_index(mesh) 获取, 缓存在网格字典的 '_spatial_index' 中。
+
+    Args:
+        mesh (dict): 网格字典.
+        candidates (int): 每个查询点首先检查的候选单元数.
+    """
+    def __init__(self, mesh, candidates=8):
+        self._vertices = mesh['vertices']
+        self._triangles = mesh['triangles']
+        self.nodes = np.asarray(mesh['vertices'], dtype=float)
+        self.elements = np.asarray(mesh['triangles'])
+        self.candidates = candidates
+        corners = self.nodes[self.elements[:, :3]]
+        self.centroids = corners.mean(axis=1)
+        self.max_radius = float(np.linalg.norm(corners - self.centroids[:, None], axis=2).max(initial=0.0))
+        self.element_tree = cKDTree(self.centroids)
+        self.node_tree = cKDTree(self.nodes)
+
+    def matches(self, mesh):
+        """判断索引是否仍对应该网格 (节点或单元数组被替换后需要重建)。"""
+        return self._vertices is mesh['vertices'] and self._triangles is mesh['triangles']
+
+    def nearest_nodes(self, points):
+        """返回距离各点最近的节点编号及距离。"""
+        distance, node = self.node_tree.query(np.asarray(points, dtype=float).reshape(-1, 2))
+        return node, distance
+
+    def locate(self, points, tol=1e-9):
+        """
+        查找各点所在的单元。
+
+        Args:
+            points (np.ndarray): 查询点坐标, 形状 (点数, 2).
+            tol (float): 面积坐标的容差, 单元边上的点视为在单元内.
+
+        Returns:
+            tuple: (element, barycentric, inside)
+                element (np.ndarray): 每个点所在 (或最接近) 的单元编号.
+                barycentric (np.ndarray): 形状 (点数, 3) 的面积坐标 (对应单元的3个角点).
+                inside (np.ndarray): 点是否在网格内.
+        """
+        points = np.asarray(points, dtype=float).reshape(-1, 2)
+        element = np.zeros(len(points), dtype=np.int64)
+        barycentric = np.zeros((len(points), 3))
+        inside = np.zeros(len(points), dtype=bool)
+        if len(points) == 0:
+            return element, barycentric, inside
+
+        # 先检查少量候选单元, 未确定的点再扩大候选范围
+        remaining = np.arange(len(points))
+        num_elements = len(self.elements)
+        k = self.candidates
+        while len(remaining) > 0:
+            k = min(k, num_elements)
+            found, candidate_element, candidate_lambda, farthest = self._search(points[remaining], k, tol)
+            element[remaining] = candidate_element
+            barycentric[remaining] = candidate_lambda
+            inside[remaining] = found
+            if k == num_elements:
+                break
+            remaining = remaining[~found & (farthest <= self.max_radius)]
+            k *= 8
+
+        # 网格外的点: 面积坐标截断为非负并归一化
+        outside = ~inside
+        clipped = np.maximum(barycentric[outside], 0.0)
+        barycentric[outside] = clipped / clipped.sum(axis=1, keepdims=True)
+        return element, barycentric, inside
+
+    def shape_values(self, points):
+        """
+        计算各点处所在单元的形函数值。
+
+        Returns:
+            tuple: (element, N, inside), N 的形状为 (点数, 每单元节点数).
+        """
+        element, barycentric, inside = self.locate(points)
+        if self.elements.shape[1] == 6:
+            N, _ = t6_shape_functions(barycentric[:, 1:])
+        else:
+            N = barycentric
+        return element, N, inside
+
+    def interpolate(self, points, nodal_values):
+        """
+        用所在单元的形函数插值节点量 (例如节点位移)。
+
+        Args:
+            points (np.ndarray): 查询点坐标, 形状 (点数, 2).
+            nodal_values (np.ndarray): 形状 (节点数, ...) 的节点量.
+
+        Returns:
+            np.ndarray: 形状 (点数, ...) 的插值结果.
+        """
+        element, N, _ = self.shape_values(points)
+        nodal_values = np.asarray(nodal_values)
+        return np.einsum('pk,pk...->p...', N, nodal_values[self.elements[element]])
+
+    def _search(self, points, k, tol):
+        """
+        在每个点最近的 k 个单元 (按形心距离) 中查找包含该点的单元。
+
+        Returns:
+            tuple: (found, element, barycentric, farthest), 未找到时 element 为
+                   面积坐标最小值最大 (最接近) 的候选单元; farthest 为第 k 个
+                   候选单元的形心距离.
+        """
+        distance, candidates = self.element_tree.query(points, k=k)
+        distance = np.asarray(distance).reshape(len(points), -1)
+        candidates = np.asarray(candidates).reshape(len(points), -1)
+        corners = self.nodes[self.elements[candidates][..., :3]]  # (点数, k, 3, 2)
+        a, b, c = corners[..., 0, :], corners[..., 1, :], corners[..., 2, :]
+        r = points[:, None, :] - a
+        e1, e2 = b - a, c - a
+        det = e1[..., 0] * e2[..., 1] - e1[..., 1] * e2[..., 0]
+        degenerate = np.abs(det) <= 1e-300
+        det = np.where(degenerate, 1.0, det)
+        l2 = (r[..., 0] * e2[..., 1] - r[..., 1] * e2[..., 0]) / det
+        l3 = (e1[..., 0] * r[..., 1] - e1[..., 1] * r[..., 0]) / det
+        lam = np.stack([1 - l2 - l3, l2, l3], axis=-1)
+
+        # 面积坐标的最小值越大点越靠近单元内部, 取最大者
+        score = lam.min(axis=-1)
+        score[degenerate] = -np.inf
+        best = np.argmax(score, axis=1)
+        rows = np.arange(len(points))
+        found = score[rows, best] >= -tol
+        return found, candidates[rows, best], lam[rows, best], distance[:, -1]
+
+def spatial_index(mesh):
+    """返回网格的空间索引, 第一次调用时构建。"""
+    index = mesh.get('_spatial_index')
+    if index is None or not index.matches(mesh):
+        index = MeshSpatialIndex(mesh)
+        mesh['_spatial_index'] = index
+    return index
+
+
+def sample_polyline(vertices, spacing=None, num_points=None):
+    """
+    沿折线生成采样点。
+
+    给定 spacing 时每段折线按不超过 spacing 的间距等分, 折线的各顶点都是采样点;
+    给定 num_points 时沿折线全长等间距取 num_points 个点。
+
+    Args:
+        vertices (np.ndarray): 折线顶点坐标, 形状 (顶点数, 2), 至少2个顶点.
+        spacing (float): 最大采样间距.
+        num_points (int): 采样点总数 (spacing 为None时使用, 默认每段10等分).
+
+    Returns:
+        tuple: (points, distance)
+            points (np.ndarray): 形状 (采样点数, 2) 的采样点坐标.
+            distance (np.ndarray): 各采样点沿折线到起点的距离.
+    """
+    vertices = np.asarray(vertices, dtype=float).reshape(-1, 2)
+    if len(vertices) < 2:
+        raise ValueError("折线至少需要2个顶点。")
+    lengths = np.linalg.norm(np.diff(vertices, axis=0), axis=1)
+    cumulative = np.concatenate([[0.0], np.cumsum(lengths)])
+
+    if spacing is None and num_points is not None:
+        if num_points < 2:
+            raise ValueError("折线采样点数至少为2。")
+        distance = np.linspace(0.0, cumulative[-1], int(num_points))
+    else:
+        if spacing is not None and spacing <= 0:
+            raise ValueError("折线采样间距必须大于0。")
+        divisions = (np.full(len(lengths), 10) if spacing is None
+                     else np.maximum(np.ceil(lengths / spacing - 1e-9), 1).astype(np.int64))
+        t = np.concatenate([np.arange(n) / n for n in divisions] + [[1.0]])
+        segment = np.concatenate([np.full(n, i) for i, n in enumerate(divisions)] + [[len(lengths) - 1]])
+        distance = cumulative[segment] + t * lengths[segment]
+
+    points = np.column_stack([np.interp(distance, cumulative, vertices[:, 0]),
+                              np.interp(distance, cumulative, vertices[:, 1])])
+    return points, distance
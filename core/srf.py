@@ -0,0 +1,189 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from .nonlinear_solver import ElastoPlasticSolver
+
+
+def _run_model(model, srf, state, srf_from=None, min_step=None):
+    """
+    执行一次试算。
+
+    没有起始状态时从零应力状态分级加载。给出起始状态时从其折减系数 srf_from
+    出发逐级提高到 srf: 某级不收敛时将折减系数增量减半重算, 增量小于 min_step
+    仍不收敛即判为失稳。
+
+    Returns:
+        tuple: (是否收敛, 达到的折减系数, 该折减系数下的收敛状态, 迭代次数, 塑性区掩码,
+                失稳时最后一个不收敛的折减系数 (收敛时为None)).
+    """
+    if state is None:
+        converged = model.solve(srf, None)
+        return (converged, srf, model.state, model.solver_info['iterations'], model.plastic_mask,
+                None if converged else srf)
+
+    current, step, iterations = srf_from, srf - srf_from, 0
+    plastic_mask = None
+    while current < srf:
+        target = min(current + step, srf)
+        converged = model.solve(target, state)
+        iterations += model.solver_info['iterations']
+        if converged:
+            current, state, plastic_mask = target, model.state, model.plastic_mask
+        else:
+            step /= 2
+            if step < min_step:
+                return False, current, state, iterations, plastic_mask, target
+    return True, current, state, iterations, plastic_mask, None
+
+
+# 子进程中的弹塑性模型, 每个进程只构建 (组装和分解) 一次
+_worker_model = None
+
+
+def _init_worker(problem, mesh, model_options):
+    global _worker_model
+    _worker_model = ElastoPlasticSolver(problem, mesh, **model_options)
+
+
+def _run_trial(srf, state, srf_from, min_step):
+    return _run_model(_worker_model, srf, state, srf_from, min_step)
+
+
+class StrengthReductionSolver:
+    """
+    强度折减法 (SRF) 边坡安全系数求解器。
+
+    将各材料的 c、tanφ、tanψ 同除以折减系数 SRF, 搜索临界折减系数作为安全系数。
+    每一轮在当前区间 [已收敛SRF, 已失稳SRF] 内均匀选取 max_workers 个试算点,
+    在进程池中同时计算 (单进程时即为二分法)。
+
+    每个试算点都从区间下端 (最近的已收敛状态) 出发, 逐级提高折减系数到试算值,
+    不收敛时将折减系数增量减半重算。失稳判据: 折减系数增量减小到 tol/4 以下
+    仍不能在 max_iterations 次牛顿迭代内收敛, 即在该折减系数附近已不存在平衡
+    状态; 单纯因一大步增量耗尽迭代次数不判为失稳。失稳的试算点同时给出了
+    最后收敛和第一个不收敛的折减系数, 区间直接缩小到两者之间, 因此结果与
+    并行进程数基本无关 (差别在 tol 量级)。
+
+    Args:
+        problem (ProblemDefinition): 问题定义, 通常应启用自重荷载。
+        mesh (dict): triangle库生成的网格字典。
+        srf_min (float): 搜索区间下限, 该折减系数下边坡应当稳定。
+        srf_max (float): 搜索区间上限。
+        tol (float): 安全系数的搜索精度。
+        max_workers (int): 并行进程数, 默认为CPU核数; 为1时在当前进程中串行计算。
+        method (str): 平衡迭代方法, 见 ElastoPlasticSolver, 默认为完全牛顿法。
+        n_load_steps (int): 初次加载时的荷载分级数。
+        max_iterations (int): 每个折减系数增量的最大迭代次数。临近失稳时牛顿迭代收敛
+                              很慢, 该值越大得到的安全系数略高 (示例边坡取 25/50/100
+                              次时约为 1.90/1.93/1.95)。
+        residual_tol (float): 不平衡力的相对收敛容差。
+    """
+    def __init__(self, problem, mesh, srf_min=0.5, srf_max=5.0, tol=0.01, max_workers=None,
+                 method='newton', n_load_steps=5, max_iterations=50, residual_tol=1.0e-4):
+        if not 0 < srf_min < srf_max:
+            raise ValueError("强度折减系数的搜索区间无效。")
+        self.problem = problem
+        self.mesh = mesh
+        self.srf_min = srf_min
+        self.srf_max = srf_max
+        self.tol = tol
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.model_options = dict(method=method, n_load_steps=n_load_steps,
+                                  max_iterations=max_iterations, tol=residual_tol)
+
+        self.factor_of_safety = None
+        # 试算记录: [{'srf', 'converged', 'reached_srf', 'iterations', 'max_displacement'}, ...]
+        # reached_srf 为该试算达到的 (最后收敛的) 折减系数, max_displacement 为该状态的最大位移
+        self.trials = []
+        # 最后一个收敛试算点的位移 (总自由度数, 1)、单元应力 (单元数, 4) 和塑性区
+        self.displacements = None
+        self.stress_components = None
+        self.plastic_mask = None
+
+    def solve(self):
+        """
+        执行安全系数搜索。
+
+        Returns:
+            float: 安全系数; 在 srf_min 下即已失稳时返回None。
+        """
+        if not self.problem.include_self_weight:
+            print("警告: 未启用自重荷载，强度折减分析通常应在自重作用下进行。")
+
+        t0 = time.perf_counter()
+        model = ElastoPlasticSolver(self.problem, self.mesh, **self.model_options)
+        print(f"强度折减: 初始加载, SRF={self.srf_min:.3f}")
+        outcome = _run_model(model, self.srf_min, None)
+        self._record_trial(self.srf_min, outcome)
+        if not outcome[0]:
+            print(f"强度折减分析失败: SRF={self.srf_min} 时即不收敛，安全系数小于该值。")
+            return None
+
+        lo, hi = self.srf_min, self.srf_max
+        lo_state, lo_mask = outcome[2], outcome[4]
+        hi_failed = False
+        min_step = self.tol / 4
+        executor = None
+        if self.max_workers > 1:
+            executor = ProcessPoolExecutor(max_workers=self.max_workers, initializer=_init_worker,
+                                           initargs=(self.problem, self.mesh, self.model_options))
+        try:
+            while not hi_failed or hi - lo > self.tol:
+                if hi_failed:
+                    candidates = np.linspace(lo, hi, self.max_workers + 2)[1:-1]
+                else:
+                    # 第一轮同时试算区间上限, 以确认失稳点已被区间包含
+                    candidates = np.linspace(lo, hi, self.max_workers + 1)[1:]
+                print(f"强度折减: 区间 [{lo:.3f}, {hi:.3f}], 试算 SRF = "
+                      + ", ".join(f"{srf:.3f}" for srf in candidates))
+
+                if executor is None:
+                    outcomes = [_run_model(model, srf, lo_state, lo, min_step) for srf in candidates]
+                else:
+                    futures = [executor.submit(_run_trial, srf, lo_state, lo, min_step) for srf in candidates]
+                    outcomes = [future.result() for future in futures]
+
+                for srf, outcome in zip(candidates, outcomes):
+                    self._record_trial(srf, outcome)
+
+                # 新区间: 第一个失稳的试算点达到的折减系数 (或其前一个收敛的试算点)
+                # 到其第一个不收敛的折减系数
+                failed = [i for i, outcome in enumerate(outcomes) if not outcome[0]]
+                if failed:
+                    first = failed[0]
+                    _, reached, state, _, mask, failed_at = outcomes[first]
+                    if first > 0 and candidates[first - 1] > reached:
+                        lo, lo_state, lo_mask = candidates[first - 1], outcomes[first - 1][2], outcomes[first - 1][4]
+                    elif reached > lo:
+                        lo, lo_state, lo_mask = reached, state, mask
+                    hi, hi_failed = (failed_at if failed_at > lo else candidates[first]), True
+                elif hi_failed:
+                    lo, lo_state, lo_mask = candidates[-1], outcomes[-1][2], outcomes[-1][4]
+                else:
+                    print(f"强度折减: SRF={self.srf_max} 时仍收敛，安全系数大于搜索上限。")
+                    lo, lo_state, lo_mask = candidates[-1], outcomes[-1][2], outcomes[-1][4]
+                    self.factor_of_safety = self.srf_max
+                    break
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+        if hi_failed:
+            self.factor_of_safety = (lo + hi) / 2
+        self.displacements = lo_state[0].reshape(-1, 1)
+        self.stress_components = model.geometry.element_average(lo_state[1])
+        self.plastic_mask = lo_mask
+        print(f"强度折减分析完成: 安全系数 FoS = {self.factor_of_safety:.3f}, "
+              f"共试算 {len(self.trials)} 次, 耗时 {time.perf_counter() - t0:.2f} s")
+        return self.factor_of_safety
+
+    def _record_trial(self, srf, outcome):
+        converged, reached, state, iterations = outcome[:4]
+        self.trials.append({
+            'srf': float(srf),
+            'converged': bool(converged),
+            'reached_srf': float(reached),
+            'iterations': int(iterations),
+            'max_displacement': float(np.abs(state[0]).max()),
+        })
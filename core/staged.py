@@ -0,0 +1,159 @@
+import time
+import numpy as np
+from .solver import FemSolver
+from .assembly import element_stiffness_matrices, assemble_sparse
+
+
+class StagedConstructionSolver:
+    """
+    分步施工 (填筑/开挖) 分析求解器。
+
+    所有施工步共用一个网格。单元按区域属性 (element_attributes, 即区域的材料ID)
+    激活或移除: 在任何施工步的 'activate' 中出现的区域初始为未激活, 其余区域
+    初始即存在。每个施工步:
+    1. 只组装被激活/移除单元的刚度贡献, 增量地加到/减去全局刚度矩阵;
+    2. 计算当前外荷载 (激活单元的自重 + 累计的线荷载) 与当前应力的内力之差
+       作为不平衡力, 开挖释放的荷载由此自动得到;
+    3. 求解位移增量, 累加到位移和激活单元的应力上。
+    没有任何激活单元相连的节点在该步中固定。
+
+    问题定义的基本荷载 (problem.loads) 在第一个施工步施加并一直保持, 各施工步的
+    'loads' 在该步追加施加; 荷载工况和荷载组合不参与分步施工分析。
+
+    Args:
+        problem (ProblemDefinition): 问题定义, 施工步见 problem.construction_stages.
+        mesh (dict): triangle库生成的网格字典.
+        ordering (str): 稀疏LU分解的填充缩减排序.
+    """
+    def __init__(self, problem, mesh, ordering='MMD_AT_PLUS_A'):
+        self.problem = problem
+        self.mesh = mesh
+        self.linear_solver = FemSolver(problem, mesh, ordering=ordering)
+
+        # 每个施工步的结果, 与 problem.construction_stages 一一对应
+        self.stage_names = []
+        self.stage_displacements = {}      # {施工步名称: (总自由度数, 1)}
+        self.stage_stress_components = {}  # {施工步名称: (单元数, 4)}
+        self.stage_active_elements = {}    # {施工步名称: (单元数,) 布尔掩码}
+        self.solver_info = {}
+
+    def solve(self):
+        """
+        依次计算所有施工步。
+
+        Returns:
+            np.ndarray: 最后一个施工步的累计位移, 形状 (总自由度数, 1); 失败时为None。
+        """
+        stages = self.problem.construction_stages
+        if not stages:
+            print("没有定义施工步。")
+            return None
+
+        t0 = time.perf_counter()
+        solver = self.linear_solver
+        solver._apply_boundary_conditions()
+        elements = np.asarray(solver.elements)
+
+        region_ids = solver._get_element_material_ids()
+        names = [stage.get('name', f"施工步{i + 1}") for i, stage in enumerate(stages)]
+        for name, stage in zip(names, stages):
+            if names.count(name) > 1:
+                raise ValueError(f"施工步名称 '{name}' 重复，各施工步的结果按名称保存。")
+            for region_id in list(stage.get('activate', [])) + list(stage.get('deactivate', [])):
+                if not np.any(region_ids == region_id):
+                    raise ValueError(f"施工步 '{name}' 中的区域 {region_id} 在网格中不存在。")
+
+        # 单元矩阵只计算一次, 各施工步按需取用; 应力按积分点保存 (CST单元即逐单元)
+        geometry = solver.geometry
+        points = geometry.point_element
+        B, area, dof_indices = geometry.B, geometry.area, geometry.dof_indices
+        D = solver._get_element_d_matrices()[points]
+        ke = geometry.sum_over_points(element_stiffness_matrices(B, D, area))
+        element_dofs = geometry.element_dof_indices
+        materials, element_material_index = solver._get_element_materials()
+        unit_weights = np.array([m.unit_weight for m in materials])[element_material_index[points]]
+        poisson = np.array([m.poisson_ratio for m in materials])[element_material_index[points]]
+        point_nodes = elements[points]
+
+        activated_regions = [rid for stage in stages for rid in stage.get('activate', [])]
+        active = ~np.isin(region_ids, activated_regions)
+        K = assemble_sparse(ke[active], element_dofs[active], solver.total_dof)
+
+        u = np.zeros(solver.total_dof)
+        stress = np.zeros((len(B), 4))
+        line_loads = np.zeros(solver.total_dof)
+        if self.problem.loads:
+            # 基本荷载在第一个施工步施加
+            loaded_edges = solver._find_loaded_edges(sorted(self.problem.loads.keys()))
+            line_loads += solver._line_load_vector(self.problem.loads, loaded_edges)
+        self.stage_names = []
+        factorization_time = 0.0
+
+        for name, stage in zip(names, stages):
+            activate = np.isin(region_ids, stage.get('activate', [])) & ~active
+            deactivate = np.isin(region_ids, stage.get('deactivate', [])) & active
+            print(f"施工步 '{name}': 激活 {np.count_nonzero(activate)} 个单元, "
+                  f"移除 {np.count_nonzero(deactivate)} 个单元")
+
+            # 1. 增量更新刚度矩阵
+            if np.any(activate):
+                K = K + assemble_sparse(ke[activate], element_dofs[activate], solver.total_dof)
+            if np.any(deactivate):
+                K = K - assemble_sparse(ke[deactivate], element_dofs[deactivate], solver.total_dof)
+            active = (active | activate) & ~deactivate
+            active_points = active[points]
+            stress[~active_points] = 0.0
+
+            # 2. 不平衡力 = 当前外荷载 - 当前应力的等效节点内力
+            stage_loads = stage.get('loads', {})
+            if stage_loads:
+                loaded_edges = solver._find_loaded_edges(sorted(stage_loads.keys()))
+                line_loads += solver._line_load_vector(stage_loads, loaded_edges)
+            F_ext = line_loads.copy()
+            if self.problem.include_self_weight:
+                point_weight = area[active_points] * unit_weights[active_points]
+                nodal_weight = point_weight[:, None] * geometry.shape_values[active_points]
+                F_ext[1::2] -= np.bincount(point_nodes[active_points].ravel(), weights=nodal_weight.ravel(),
+                                           minlength=solver.num_nodes)
+            point_forces = (np.einsum('eij,ei->ej', B[active_points], stress[active_points, :3])
+                            * area[active_points, None])
+            F_int = np.bincount(dof_indices[active_points].ravel(), weights=point_forces.ravel(),
+                                minlength=solver.total_dof)
+            residual = F_ext - F_int
+
+            # 3. 求解位移增量 (与激活单元不相连的节点固定)
+            active_dof = np.zeros(solver.total_dof, dtype=bool)
+            active_dof[element_dofs[active].ravel()] = True
+            free = solver.free_dofs[active_dof[solver.free_dofs]]
+            if len(free) == 0:
+                print(f"施工步 '{name}' 没有可求解的自由度。")
+                return None
+            t1 = time.perf_counter()
+            try:
+                lu = solver.factorize(K[free][:, free])
+            except RuntimeError as e:
+                print(f"施工步 '{name}' 求解失败：矩阵为奇异矩阵。请检查约束是否足够。错误: {e}")
+                return None
+            factorization_time += time.perf_counter() - t1
+
+            du = np.zeros(solver.total_dof)
+            du[free] = lu.solve(residual[free])
+            u += du
+            strain = np.einsum('eij,ej->ei', B[active_points], du[dof_indices[active_points]])
+            stress[active_points, :3] += np.einsum('eij,ej->ei', D[active_points], strain)
+            # 平面应变 σz = ν(σx + σy)
+            stress[active_points, 3] = poisson[active_points] * (stress[active_points, 0]
+                                                                 + stress[active_points, 1])
+
+            self.stage_names.append(name)
+            self.stage_displacements[name] = u.reshape(-1, 1).copy()
+            self.stage_stress_components[name] = geometry.element_average(stress).copy()
+            self.stage_active_elements[name] = active.copy()
+
+        self.solver_info = {
+            'stages': len(stages),
+            'factorization_time': factorization_time,
+            'solve_time': time.perf_counter() - t0,
+        }
+        print(f"分步施工分析完成: 共 {len(stages)} 个施工步, 耗时 {self.solver_info['solve_time']:.3f} s")
+        return u.reshape(-1, 1)
@@ -0,0 +1,244 @@
+import dataclasses
+import json
+import os
+import numpy as np
+from .geometry import _element_region_ids
+from .fem_model import FemResult, ProblemDefinition, Material, LineLoad
+
+# 结果中保留的网格数据, 其余 (triangle的调试/属性数组、节点标记、各类缓存) 在
+# 压缩时丢弃; 缓存在需要时由压缩后的网格重新建立
+MESH_KEYS = ('vertices', 'triangles', 'segments', 'segment_markers', 'element_attributes',
+             'segment_marker_offset', 'renumbering')
+
+# FemResult 中的结果数组, 以及由数组组成的列表/字典 (按施工步、荷载工况等)
+RESULT_ARRAY_FIELDS = ('displacements', 'stresses', 'nodal_stress_components', 'nodal_stresses',
+                       'displacements_x', 'reactions', 'element_errors', 'plastic_zone')
+RESULT_ARRAY_COLLECTIONS = ('plastic_zone_masks', 'stage_displacements', 'stage_stress_components',
+                            'stage_active_elements', 'load_case_displacements',
+                            'load_case_stress_components', 'load_case_stresses')
+# 结果存档: 目录中的 header.json 记录各数组块 (.npy) 及其余结果
+ARCHIVE_FORMAT = 'SlopeFEM_2D-result'
+ARCHIVE_VERSION = 1
+ARCHIVE_HEADER = 'header.json'
+
+# FemResult 中的其他结果 (可写入JSON)
+RESULT_METADATA = ('target_displacements', 'solver_info', 'refinement_history', 'factor_of_safety',
+                   'srf_trials', 'convergence_history', 'load_case_target_displacements')
+
+
+def compact_array(values, float32=False, rtol=1e-6, name=''):
+    """
+    返回数组的只读紧凑视图: 整数转为int32, 浮点数在 float32 为True且精度满足
+    要求时转为单精度。
+
+    精度检查: 单精度值与原值之差不超过 rtol 倍的数组最大绝对值 (且不产生溢出),
+    否则保留双精度并给出警告。
+
+    Args:
+        values (np.ndarray): 原数组.
+        float32 (bool): 浮点数组是否转为单精度.
+        rtol (float): 单精度转换允许的相对误差.
+        name (str): 数组名称, 用于警告信息.
+
+    Returns:
+        np.ndarray: 只读数组; 类型不变时为原数组的视图, 不复制数据.
+    """
+    values = np.asarray(values)
+    if values.dtype.kind in 'iu' and values.size > 0:
+        if np.iinfo(np.int32).min <= values.min() and values.max() <= np.iinfo(np.int32).max:
+            values = values.astype(np.int32, copy=False)
+    elif values.dtype.kind == 'f' and float32 and values.dtype != np.float32:
+        single = values.astype(np.float32)
+        scale = np.max(np.abs(values), initial=0.0)
+        with np.errstate(invalid='ignore'):
+            error = np.max(np.abs(single.astype(values.dtype) - values), initial=0.0)
+        if np.isfinite(error) and error <= rtol * scale:
+            values = single
+        else:
+            print(f"警告: 结果 '{name}' 转换为单精度的误差超过容许值, 保留双精度。")
+    view = values.view()
+    view.setflags(write=False)
+    return view
+
+
+def compact_mesh(mesh):
+    """
+    生成只保留结果所需数据的紧凑网格字典。
+
+    单元、线段等编号数组转为int32, 单元属性压缩为int32的区域ID (没有属性的单元为 -1),
+    节点坐标保持双精度 (点定位和应变计算需要)。原网格不被修改。
+
+    Args:
+        mesh (dict): 网格字典.
+
+    Returns:
+        dict: 紧凑网格字典, 数组均为只读.
+    """
+    compact = {}
+    for key in MESH_KEYS:
+        if key not in mesh:
+            continue
+        value = mesh[key]
+        if key == 'element_attributes':
+            value = _element_region_ids(value, len(mesh['triangles'])).reshape(-1, 1)
+        if isinstance(value, (np.ndarray, list)):
+            value = compact_array(value, name=key)
+        compact[key] = value
+    return compact
+
+
+def save_result_archive(result, path):
+    """
+    将结果保存为二进制存档 (目录): 每个数组保存为一个 .npy 块, 网格中的其他数据、
+    目标点位移、求解信息等及问题定义写入 header.json。
+
+    Args:
+        result (FemResult): 计算结果.
+        path (str): 存档目录, 不存在时创建; 已存在的存档被覆盖.
+    """
+    if os.path.isdir(path) and os.listdir(path) and not os.path.exists(os.path.join(path, ARCHIVE_HEADER)):
+        raise ValueError(f"目录已存在且不是结果存档: {path}")
+    os.makedirs(path, exist_ok=True)
+    _remove_archive_blocks(path)
+
+    blocks = []
+
+    def add_block(group, name, values):
+        values = np.ascontiguousarray(values)
+        if values.dtype == object:
+            raise ValueError(f"结果 '{group}/{name}' 不是数值数组, 不能保存。")
+        file_name = f"block_{len(blocks):04d}.npy"
+        np.save(os.path.join(path, file_name), values, allow_pickle=False)
+        blocks.append({'group': group, 'name': str(name), 'file': file_name,
+                       'dtype': values.dtype.str, 'shape': list(values.shape)})
+
+    mesh_data = {}
+    for key, value in compact_mesh(result.mesh).items():
+        if isinstance(value, np.ndarray):
+            add_block('mesh', key, value)
+        else:
+            mesh_data[key] = value
+    for name in RESULT_ARRAY_FIELDS:
+        add_block('result', name, getattr(result, name))
+    for name in RESULT_ARRAY_COLLECTIONS:
+        values = getattr(result, name)
+        items = values.items() if isinstance(values, dict) else enumerate(values)
+        for key, array in items:
+            add_block(name, key, array)
+    for name, values in result._derived.items():
+        add_block('fields', name, values)
+
+    header = {
+        'format': ARCHIVE_FORMAT,
+        'version': ARCHIVE_VERSION,
+        'blocks': blocks,
+        'mesh': mesh_data,
+        'metadata': {name: getattr(result, name) for name in RESULT_METADATA},
+        'problem': dataclasses.asdict(result.problem) if result.problem is not None else None,
+    }
+    with open(os.path.join(path, ARCHIVE_HEADER), 'w', encoding='utf-8') as f:
+        json.dump(header, f, ensure_ascii=False, indent=1, default=_json_default)
+
+
+def load_result_archive(path, mmap=True):
+    """
+    打开结果存档。
+
+    mmap 为True时数组以 np.load(mmap_mode='r') 内存映射方式打开, 打开时只读取
+    header.json, 数组数据在访问时才由操作系统按页读入, 大型结果也能立即打开。
+
+    Args:
+        path (str): 存档目录.
+        mmap (bool): 是否内存映射 (否则全部读入内存).
+
+    Returns:
+        FemResult: 结果, 数组均为只读.
+    """
+    header_path = os.path.join(path, ARCHIVE_HEADER)
+    if not os.path.exists(header_path):
+        raise ValueError(f"不是结果存档: {path}")
+    with open(header_path, 'r', encoding='utf-8') as f:
+        header = json.load(f)
+    if header.get('format') != ARCHIVE_FORMAT:
+        raise ValueError(f"不是结果存档: {path}")
+    if header.get('version', 0) > ARCHIVE_VERSION:
+        raise ValueError(f"结果存档的版本 {header['version']} 高于当前程序支持的版本 {ARCHIVE_VERSION}。")
+
+    groups = {}
+    for block in header['blocks']:
+        values = np.load(os.path.join(path, block['file']), mmap_mode='r' if mmap else None,
+                         allow_pickle=False)
+        if not mmap:
+            values.setflags(write=False)
+        groups.setdefault(block['group'], {})[block['name']] = values
+
+    mesh = dict(header.get('mesh', {}))
+    mesh.update(groups.get('mesh', {}))
+    result = FemResult(mesh=mesh, problem=_problem_from_dict(header.get('problem')))
+    for name, values in groups.get('result', {}).items():
+        setattr(result, name, values)
+    for name in RESULT_ARRAY_COLLECTIONS:
+        values = groups.get(name, {})
+        if isinstance(getattr(result, name), list):
+            values = [values[key] for key in sorted(values, key=int)]
+        setattr(result, name, values)
+    metadata = header.get('metadata', {})
+    for name in RESULT_METADATA:
+        if name in metadata:
+            setattr(result, name, metadata[name])
+    result.target_displacements = {name: tuple(value)
+                                   for name, value in result.target_displacements.items()}
+    result.load_case_target_displacements = {
+        case: {name: tuple(value) for name, value in targets.items()}
+        for case, targets in result.load_case_target_displacements.items()}
+    result._derived.update(groups.get('fields', {}))
+    return result
+
+
+def _remove_archive_blocks(path):
+    """删除已有存档的数组块 (覆盖存档时)。"""
+    header_path = os.path.join(path, ARCHIVE_HEADER)
+    if not os.path.exists(header_path):
+        return
+    with open(header_path, 'r', encoding='utf-8') as f:
+        header = json.load(f)
+    for block in header.get('blocks', []):
+        block_path = os.path.join(path, block['file'])
+        if os.path.exists(block_path):
+            os.remove(block_path)
+    os.remove(header_path)
+
+
+def _json_default(value):
+    """将numpy标量和数组转换为JSON可写的类型。"""
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    raise TypeError(f"无法写入JSON的类型: {type(value).__name__}")
+
+
+def _problem_from_dict(data):
+    """由 dataclasses.asdict 得到的字典 (JSON中整数键为字符串) 重建问题定义。"""
+    if data is None:
+        return None
+
+    def loads(values):
+        return {int(seg_id): LineLoad.from_value(value) if isinstance(value, dict) else value
+                for seg_id, value in values.items()}
+
+    problem = ProblemDefinition()
+    problem.vertices = [tuple(v) for v in data.get('vertices', [])]
+    problem.segments = [tuple(s) for s in data.get('segments', [])]
+    problem.materials = {name: Material(**m) for name, m in data.get('materials', {}).items()}
+    problem.regions = [tuple(r) for r in data.get('regions', [])]
+    problem.constraints = {int(seg_id): c for seg_id, c in data.get('constraints', {}).items()}
+    problem.loads = loads(data.get('loads', {}))
+    problem.load_cases = {name: loads(case) for name, case in data.get('load_cases', {}).items()}
+    problem.load_combinations = data.get('load_combinations', {})
+    problem.include_self_weight = data.get('include_self_weight', False)
+    problem.construction_stages = [dict(stage, loads=loads(stage.get('loads', {})))
+                                   for stage in data.get('construction_stages', [])]
+    problem.target_points = {name: tuple(p) for name, p in data.get('target_points', {}).items()}
+    problem.profile_lines = data.get('profile_lines', {})
+    return problem
@@ -51,6 +51,80 @@ def get_b_matrix(p1, p2, p3):
     
     return b_matrix
 
+def get_d_matrices(E, nu):
+    """
+    批量计算平面应变弹性本构矩阵 [D]。
+
+    Args:
+        E (np.ndarray): 弹性模量数组, 形状 (n,).
+        nu (np.ndarray): 泊松比数组, 形状 (n,).
+
+    Returns:
+        np.ndarray: 形状为 (n, 3, 3) 的D矩阵数组.
+    """
+    E = np.asarray(E, dtype=float)
+    nu = np.asarray(nu, dtype=float)
+    factor = E / ((1 + nu) * (1 - 2 * nu))
+    d_matrices = np.zeros(E.shape + (3, 3))
+    d_matrices[..., 0, 0] = d_matrices[..., 1, 1] = factor * (1 - nu)
+    d_matrices[..., 0, 1] = d_matrices[..., 1, 0] = factor * nu
+    d_matrices[..., 2, 2] = factor * (1 - 2 * nu) / 2
+    return d_matrices
+
+def get_b_matrices(nodes, elements):
+    """
+    批量计算所有CST单元的应变-位移矩阵 [B] 及单元面积。
+
+    与 get_b_matrix 使用相同的公式, 对每个单元的结果逐位相同。
+
+    Args:
+        nodes (np.ndarray): 节点坐标, 形状 (节点数, 2).
+        elements (np.ndarray): 单元节点编号, 形状 (单元数, 3).
+
+    Returns:
+        tuple: (B, area)
+            B (np.ndarray): 形状 (单元数, 3, 6) 的B矩阵数组, 退化单元为0.
+            area (np.ndarray): 形状 (单元数,) 的带符号单元面积.
+    """
+    nodes = np.asarray(nodes, dtype=float)
+    elements = np.asarray(elements)
+    x = nodes[elements, 0]
+    y = nodes[elements, 1]
+    x1, x2, x3 = x[:, 0], x[:, 1], x[:, 2]
+    y1, y2, y3 = y[:, 0], y[:, 1], y[:, 2]
+
+    # 计算单元面积的两倍
+    area2 = (x2 - x1) * (y3 - y1) - (x3 - x1) * (y2 - y1)
+    degenerate = np.abs(area2) < 1e-12
+    inv_area2 = np.zeros_like(area2)
+    inv_area2[~degenerate] = 1 / area2[~degenerate]
+
+    b = np.stack([y2 - y3, y3 - y1, y1 - y2], axis=1)
+    c = np.stack([x3 - x2, x1 - x3, x2 - x1], axis=1)
+
+    B = np.zeros((len(elements), 3, 6))
+    B[:, 0, 0::2] = b
+    B[:, 1, 1::2] = c
+    B[:, 2, 0::2] = c
+    B[:, 2, 1::2] = b
+    B *= inv_area2[:, None, None]
+    return B, 0.5 * area2
+
+def von_mises_stress(components):
+    """
+    由平面应变应力分量计算冯·米塞斯等效应力。
+
+    Args:
+        components (np.ndarray): 形状 (..., 4) 的应力分量 [σx, σy, τxy, σz].
+
+    Returns:
+        np.ndarray: 形状 (...,) 的冯·米塞斯应力.
+    """
+    sigma_x, sigma_y, tau_xy, sigma_z = np.moveaxis(np.asarray(components), -1, 0)
+    term1 = ((sigma_x - sigma_y)**2 + (sigma_y - sigma_z)**2 + (sigma_z - sigma_x)**2) / 2
+    term2 = 3 * tau_xy**2
+    return np.sqrt(term1 + term2)
+
 def is_point_on_segment(p, a, b, tol=1e-6):
     """
     检查点p是否在线段ab上（带容差）。
@@ -65,3 +139,43 @@ def is_point_on_segment(p, a, b, tol=1e-6):
     if dot_product < 0 or dot_product > np.dot(b-a, b-a):
         return False
     return True
+
+def points_on_segments(points, seg_start, seg_end, tol=1e-6, chunk_size=1_000_000):
+    """
+    批量判断 N 个点与 M 条线段的从属关系, 判据与 is_point_on_segment 相同。
+
+    按点分块广播计算, 每块最多 chunk_size 个 (点, 线段) 组合, 以限制内存占用。
+
+    Args:
+        points (np.ndarray): 点坐标, 形状 (N, 2).
+        seg_start (np.ndarray): 线段起点坐标, 形状 (M, 2).
+        seg_end (np.ndarray): 线段终点坐标, 形状 (M, 2).
+        tol (float): 共线判断的容差.
+        chunk_size (int): 每块计算的 (点, 线段) 组合数上限.
+
+    Returns:
+        tuple: (point_index, segment_index, t), 稀疏的从属关系 (按点编号升序):
+            point_index (np.ndarray): 位于线段上的点的编号.
+            segment_index (np.ndarray): 对应线段的编号.
+            t (np.ndarray): 点在线段上的参数坐标, 0为起点, 1为终点.
+    """
+    points = np.asarray(points, dtype=float).reshape(-1, 2)
+    a = np.asarray(seg_start, dtype=float).reshape(-1, 2)
+    d = np.asarray(seg_end, dtype=float).reshape(-1, 2) - a
+    length_sq = np.einsum('ij,ij->i', d, d)
+    inv_length_sq = np.zeros_like(length_sq)
+    inv_length_sq[length_sq > 0] = 1 / length_sq[length_sq > 0]
+
+    step = max(1, chunk_size // max(len(a), 1))
+    point_index, segment_index, t = [], [], []
+    for start in range(0, len(points), step):
+        r = points[start:start + step, None, :] - a[None, :, :]  # (块大小, M, 2)
+        cross = np.abs(d[:, 0] * r[..., 1] - d[:, 1] * r[..., 0])
+        dot = d[:, 0] * r[..., 0] + d[:, 1] * r[..., 1]
+        p, s = np.nonzero((cross <= tol) & (dot >= 0) & (dot <= length_sq))
+        point_index.append(p + start)
+        segment_index.append(s)
+        t.append(dot[p, s] * inv_length_sq[s])
+    if not point_index:
+        return np.array([], dtype=np.int64), np.array([], dtype=np.int64), np.array([])
+    return np.concatenate(point_index), np.concatenate(segment_index), np.concatenate(t)
@@ -1,8 +1,19 @@
+import copy
+import os
 from PyQt6.QtCore import QObject, pyqtSignal
-from core.fem_model import ProblemDefinition, FemResult
-from core.preprocessor import create_mesh
+from core.fem_model import ProblemDefinition, FemResult, LineLoad
+from core.mesh_cache import MeshCache
 from core.solver import FemSolver
 from core.postprocessor import PostProcessor
+from core.srf import StrengthReductionSolver
+from core.nonlinear_solver import ElastoPlasticSolver
+from core.staged import StagedConstructionSolver
+from core.adaptivity import AdaptiveMeshRefinement
+from core.utils import von_mises_stress
+from core.recovery import recover_nodal_values
+
+# 项目文件旁保存网格缓存的目录名
+MESH_CACHE_DIR = '.slopefem_mesh_cache'
 
 class AppController(QObject):
     """
@@ -17,6 +28,13 @@ class AppController(QObject):
         self.problem = ProblemDefinition()
         self.result = FemResult()
         self.main_window = main_window
+        # 网格缓存: 几何和网格参数不变时 (例如只修改荷载或材料参数) 不再重新剖分
+        self.mesh_cache = MeshCache()
+
+    def set_project_path(self, file_path):
+        """设置当前项目文件, 网格缓存同时保存在项目文件旁的目录中; None表示只用内存缓存。"""
+        self.mesh_cache.cache_dir = (os.path.join(os.path.dirname(os.path.abspath(file_path)), MESH_CACHE_DIR)
+                                     if file_path else None)
 
     def update_problem_from_dict(self, data):
         if data:
@@ -26,6 +44,52 @@ class AppController(QObject):
             self.problem.constraints = data.get('constraints', {})
             self.problem.loads = data.get('loads', {})
             self.problem.target_points = data.get('target_points', {})
+            self.problem.include_self_weight = data.get('include_self_weight', False)
+            if 'load_cases' in data or 'load_combinations' in data:
+                self.update_load_cases(data)
+            if 'construction_stages' in data:
+                self.update_construction_stages(data)
+            if 'profile_lines' in data:
+                self.update_profile_lines(data)
+
+    def update_load_cases(self, data):
+        """
+        从项目数据更新荷载工况和荷载组合 (JSON中线段ID为字符串)。
+
+        荷载值可以是数值 (竖直均布荷载), 也可以是梯形荷载/法向压力的字典
+        {'start_value', 'end_value', 'direction'}。
+        """
+        self.problem.load_cases = {
+            name: {int(seg_id): LineLoad.from_value(value) for seg_id, value in loads.items()}
+            for name, loads in data.get('load_cases', {}).items()
+        }
+        self.problem.load_combinations = {
+            name: {case: float(factor) for case, factor in factors.items()}
+            for name, factors in data.get('load_combinations', {}).items()
+        }
+
+    def update_construction_stages(self, data):
+        """从项目数据更新施工步 (JSON中线段ID为字符串)。"""
+        self.problem.construction_stages = [
+            {
+                'name': stage.get('name', f"施工步{i + 1}"),
+                'activate': [int(region_id) for region_id in stage.get('activate', [])],
+                'deactivate': [int(region_id) for region_id in stage.get('deactivate', [])],
+                'loads': {int(seg_id): LineLoad.from_value(value)
+                          for seg_id, value in stage.get('loads', {}).items()},
+            }
+            for i, stage in enumerate(data.get('construction_stages', []))
+        ]
+
+    def update_profile_lines(self, data):
+        """从项目数据更新剖面线 {名称: {'points': [[x, y], ...], 'spacing': 采样间距}}。"""
+        self.problem.profile_lines = {
+            name: {
+                'points': [tuple(map(float, point)) for point in line.get('points', [])],
+                'spacing': float(line['spacing']) if line.get('spacing') is not None else None,
+            }
+            for name, line in data.get('profile_lines', {}).items()
+        }
 
     def update_materials(self, materials_dict):
         self.problem.materials = materials_dict
@@ -39,24 +103,177 @@ class AppController(QObject):
         # 1. 网格剖分
         # 获取用户设置的网格参数
         mesh_options = self.main_window.input_panel.get_mesh_options()
-        mesh = create_mesh(self.problem, mesh_options)
+        solver_options = self.main_window.input_panel.get_solver_options()
+        adaptive_options = self.main_window.input_panel.get_adaptive_options()
+        if adaptive_options is not None:
+            # 自适应加密: 网格生成与求解交替进行, 得到最终网格上的解
+            adaptive = AdaptiveMeshRefinement(self.problem, mesh_options, solver_options=solver_options,
+                                              **adaptive_options)
+            displacements_vec = adaptive.run()
+            mesh, solver = adaptive.mesh, adaptive.solver
+        else:
+            mesh = self.mesh_cache.get_mesh(self.problem, mesh_options)
+            solver = None
         if mesh is None:
             self.computation_finished.emit(False, "网格生成失败，请检查几何定义。")
             return
-        self.result.mesh = mesh
+        # 每次计算生成新的结果, 不保留上一次分析 (强度折减、弹塑性、分步施工等) 的结果
+        result = FemResult(mesh=mesh, problem=copy.deepcopy(self.problem))
+        if adaptive_options is not None:
+            result.refinement_history = adaptive.history
+            result.element_errors = adaptive.element_errors
         
         # 2. 求解
-        solver = FemSolver(self.problem, mesh)
-        displacements_vec = solver.solve()
+        if solver is None:
+            solver = FemSolver(self.problem, mesh, **solver_options)
+            displacements_vec = solver.solve()
         if displacements_vec is None:
             self.computation_finished.emit(False, "求解失败，请检查约束是否充分。")
             return
-        self.result.displacements = displacements_vec.reshape(-1, 2)
+        result.displacements = displacements_vec.reshape(-1, 2)
+        result.reactions = solver.reactions[:, 0].reshape(-1, 2)
+        result.solver_info = solver.solver_info
         
         # 3. 后处理
         post_proc = PostProcessor(self.problem, mesh, displacements_vec)
         stresses, target_displacements = post_proc.calculate_results()
-        self.result.stresses = stresses
-        self.result.target_displacements = target_displacements
+        result.stresses = stresses
+        result.target_displacements = target_displacements
+        result.nodal_stress_components, result.nodal_stresses = post_proc.calculate_nodal_stresses()
+        
+        # 4. 荷载工况与荷载组合 (组合结果由各工况线性叠加得到)
+        if self.problem.load_cases or self.problem.load_combinations:
+            case_components, case_stresses, case_targets = post_proc.calculate_load_case_results(
+                solver.load_case_displacements)
+            result.load_case_displacements = {
+                name: u.reshape(-1, 2) for name, u in solver.load_case_displacements.items()}
+            result.load_case_stress_components = case_components
+            result.load_case_stresses = case_stresses
+            result.load_case_target_displacements = case_targets
+            try:
+                for combo_name, factors in self.problem.load_combinations.items():
+                    disp, components, von_mises, targets = result.combine_load_cases(factors)
+                    result.load_case_displacements[combo_name] = disp
+                    result.load_case_stress_components[combo_name] = components
+                    result.load_case_stresses[combo_name] = von_mises
+                    result.load_case_target_displacements[combo_name] = targets
+            except ValueError as e:
+                self.computation_finished.emit(False, f"荷载组合计算失败: {e}")
+                return
         
+        # 5. 压缩结果存储 (丢弃网格缓存等计算中间数据)
+        self.result = result.compact(**self.main_window.input_panel.get_storage_options())
         self.computation_finished.emit(True, "计算成功完成！")
+
+    def run_staged_analysis(self):
+        """
+        执行分步施工 (填筑/开挖) 分析, 结果中的位移和应力为最后一个施工步的状态。
+        """
+        self.computation_started.emit()
+        if not self.problem.construction_stages:
+            self.computation_finished.emit(False, "没有定义施工步。")
+            return
+        
+        mesh_options = self.main_window.input_panel.get_mesh_options()
+        mesh = self.mesh_cache.get_mesh(self.problem, mesh_options)
+        if mesh is None:
+            self.computation_finished.emit(False, "网格生成失败，请检查几何定义。")
+            return
+        
+        solver = StagedConstructionSolver(self.problem, mesh)
+        try:
+            displacements_vec = solver.solve()
+        except ValueError as e:
+            self.computation_finished.emit(False, f"分步施工分析失败: {e}")
+            return
+        if displacements_vec is None:
+            self.computation_finished.emit(False, "分步施工分析失败，请检查约束是否充分。")
+            return
+        
+        final_stage = solver.stage_names[-1]
+        result = FemResult(mesh=mesh, problem=copy.deepcopy(self.problem))
+        result.displacements = displacements_vec.reshape(-1, 2)
+        result.set_field('stress_components', solver.stage_stress_components[final_stage])
+        result.stresses = von_mises_stress(solver.stage_stress_components[final_stage])
+        result.solver_info = solver.solver_info
+        result.stage_displacements = {
+            name: u.reshape(-1, 2) for name, u in solver.stage_displacements.items()}
+        result.stage_stress_components = solver.stage_stress_components
+        result.stage_active_elements = solver.stage_active_elements
+        post_proc = PostProcessor(self.problem, mesh, displacements_vec)
+        result.target_displacements = post_proc._get_target_displacements()
+        self.result = result.compact(**self.main_window.input_panel.get_storage_options())
+        
+        self.computation_finished.emit(True, f"分步施工分析完成，共 {len(solver.stage_names)} 个施工步。")
+
+    def run_elastoplastic_analysis(self):
+        """
+        执行莫尔-库仑弹塑性分析 (增量-迭代求解)。
+        """
+        self.computation_started.emit()
+        
+        mesh_options = self.main_window.input_panel.get_mesh_options()
+        mesh = self.mesh_cache.get_mesh(self.problem, mesh_options)
+        if mesh is None:
+            self.computation_finished.emit(False, "网格生成失败，请检查几何定义。")
+            return
+        
+        solver = ElastoPlasticSolver(self.problem, mesh)
+        converged = solver.solve()
+        
+        result = FemResult(mesh=mesh, problem=copy.deepcopy(self.problem))
+        result.displacements = solver.displacements.reshape(-1, 2)
+        result.set_field('stress_components', solver.stress_components)
+        result.stresses = von_mises_stress(solver.stress_components)
+        result.solver_info = solver.solver_info
+        result.convergence_history = solver.convergence_history
+        result.plastic_zone_masks = solver.plastic_zone_masks
+        result.plastic_zone = solver.plastic_mask
+        result.nodal_stress_components = recover_nodal_values(mesh, solver.point_stress)
+        result.nodal_stresses = von_mises_stress(result.nodal_stress_components)
+        post_proc = PostProcessor(self.problem, mesh, solver.displacements)
+        result.target_displacements = post_proc._get_target_displacements()
+        self.result = result.compact(**self.main_window.input_panel.get_storage_options())
+        
+        if not converged and solver.solver_info['diverged']:
+            self.computation_finished.emit(
+                False, f"弹塑性分析不收敛：仅加载到荷载系数 {solver.load_factor:.3f}，边坡可能已失稳。")
+            return
+        if not converged:
+            self.computation_finished.emit(
+                False, f"弹塑性分析在荷载系数 {solver.load_factor:.3f} 处达到最大迭代次数仍未收敛，"
+                       f"请增加迭代次数或荷载分级后重试。")
+            return
+        self.computation_finished.emit(
+            True, f"弹塑性分析完成，塑性区单元数: {int(solver.plastic_mask.sum())}")
+
+    def run_strength_reduction(self):
+        """
+        执行强度折减法边坡稳定分析, 结果中的位移和应力为最后一个收敛试算点的状态。
+        """
+        self.computation_started.emit()
+        
+        mesh_options = self.main_window.input_panel.get_mesh_options()
+        mesh = self.mesh_cache.get_mesh(self.problem, mesh_options)
+        if mesh is None:
+            self.computation_finished.emit(False, "网格生成失败，请检查几何定义。")
+            return
+        
+        srf_solver = StrengthReductionSolver(self.problem, mesh)
+        factor_of_safety = srf_solver.solve()
+        if factor_of_safety is None:
+            self.computation_finished.emit(False, "强度折减分析失败：初始状态即不收敛，请检查强度参数和约束。")
+            return
+        
+        result = FemResult(mesh=mesh, problem=copy.deepcopy(self.problem))
+        result.displacements = srf_solver.displacements.reshape(-1, 2)
+        result.set_field('stress_components', srf_solver.stress_components)
+        result.stresses = von_mises_stress(srf_solver.stress_components)
+        result.factor_of_safety = factor_of_safety
+        result.srf_trials = srf_solver.trials
+        result.plastic_zone = srf_solver.plastic_mask
+        post_proc = PostProcessor(self.problem, mesh, srf_solver.displacements)
+        result.target_displacements = post_proc._get_target_displacements()
+        self.result = result.compact(**self.main_window.input_panel.get_storage_options())
+        
+        self.computation_finished.emit(True, f"强度折减分析完成，安全系数 FoS = {factor_of_safety:.3f}")
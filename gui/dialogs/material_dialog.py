@@ -12,7 +12,7 @@ class MaterialDialog(QDialog):
     def __init__(self, materials_data, parent=None):
         super().__init__(parent)
         self.setWindowTitle("材料库编辑器")
-        self.setMinimumSize(500, 300)
+        self.setMinimumSize(800, 300)
         
         # 这是此对话框将返回的数据
         self.materials = materials_data
@@ -25,8 +25,9 @@ class MaterialDialog(QDialog):
         layout = QVBoxLayout(self)
 
         self.table = QTableWidget()
-        self.table.setColumnCount(4)
-        self.table.setHorizontalHeaderLabels(["ID", "材料名称", "弹性模量 (E / Pa)", "泊松比 (ν)"])
+        self.table.setColumnCount(8)
+        self.table.setHorizontalHeaderLabels(["ID", "材料名称", "弹性模量 (E / Pa)", "泊松比 (ν)", "重度 (γ / N/m³)",
+                                              "粘聚力 (c / Pa)", "内摩擦角 (φ / °)", "剪胀角 (ψ / °)"])
         self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
         self.table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
         
@@ -81,6 +82,10 @@ class MaterialDialog(QDialog):
         self.table.setItem(row_index, 1, QTableWidgetItem(material.name))
         self.table.setItem(row_index, 2, QTableWidgetItem(str(material.elastic_modulus)))
         self.table.setItem(row_index, 3, QTableWidgetItem(str(material.poisson_ratio)))
+        self.table.setItem(row_index, 4, QTableWidgetItem(str(material.unit_weight)))
+        self.table.setItem(row_index, 5, QTableWidgetItem(str(material.cohesion)))
+        self.table.setItem(row_index, 6, QTableWidgetItem(str(material.friction_angle)))
+        self.table.setItem(row_index, 7, QTableWidgetItem(str(material.dilation_angle)))
 
     def get_materials(self):
         """当对话框被接受时，从表格中读取数据并返回。"""
@@ -89,7 +94,12 @@ class MaterialDialog(QDialog):
             name = self.table.item(row, 1).text()
             E = float(self.table.item(row, 2).text())
             nu = float(self.table.item(row, 3).text())
-            mat = Material(id=row, name=name, elastic_modulus=E, poisson_ratio=nu)
+            gamma = float(self.table.item(row, 4).text())
+            c = float(self.table.item(row, 5).text())
+            phi = float(self.table.item(row, 6).text())
+            psi = float(self.table.item(row, 7).text())
+            mat = Material(id=row, name=name, elastic_modulus=E, poisson_ratio=nu, unit_weight=gamma,
+                           cohesion=c, friction_angle=phi, dilation_angle=psi)
             updated_materials[name] = mat
         return updated_materials
 
@@ -17,7 +17,9 @@ from gui.widgets.input_panel import InputPanel
 from .widgets.enhanced_canvas_widget import EnhancedCanvasWidget
 from gui.widgets.results_panel import ResultsPanel
 from gui.dialogs.material_dialog import MaterialDialog
-from core.fem_model import ProblemDefinition, FemResult
+from core.fem_model import ProblemDefinition, FemResult, LineLoad
+from core.fields import DERIVED_FIELDS
+from core.storage import load_result_archive
 
 class MainWindow(QMainWindow):
     def __init__(self, controller, parent=None):
@@ -242,11 +244,14 @@ class MainWindow(QMainWindow):
         self.plot_selector.addItems([
             "模型预览", 
             "Von Mises 应力", 
+            "Von Mises 应力 (节点光滑)", 
             "水平位移 (原始)", 
             "竖直位移 (原始)",
             "水平位移 (放大)", 
             "竖直位移 (放大)"
         ])
+        # 派生结果字段 (主应力、体积应变等), 选中时才计算
+        self.plot_selector.addItems([f.label for f in DERIVED_FIELDS.values() if f.scalar])
         self.plot_selector.setStyleSheet("""
             QComboBox {
                 background-color: white;
@@ -309,6 +314,7 @@ class MainWindow(QMainWindow):
         self.save_action = QAction("保存项目", self)
         self.save_as_action = QAction("另存为...", self)
         self.load_example_action = QAction("加载预设案例", self)
+        self.open_result_action = QAction("打开结果存档...", self)
         self.exit_action = QAction("退出", self)
         
         # 导出功能已移至选项卡页面，不再需要菜单动作
@@ -337,6 +343,12 @@ class MainWindow(QMainWindow):
         if calc_icon:
             self.calc_action.setIcon(QIcon(calc_icon))
 
+        self.staged_action = QAction("分步施工分析", self)
+        self.plastic_action = QAction("弹塑性分析", self)
+        self.srf_action = QAction("强度折减分析 (安全系数)", self)
+        if calc_icon:
+            self.srf_action.setIcon(QIcon(calc_icon))
+
         # 其他操作
         self.material_action = QAction("材料库...", self)
         material_icon = safe_get_icon_path('材料库.png')
@@ -368,6 +380,7 @@ class MainWindow(QMainWindow):
         # 移除导出菜单，导出功能已移至选项卡页面
         file_menu.addSeparator()
         file_menu.addAction(self.load_example_action)
+        file_menu.addAction(self.open_result_action)
         file_menu.addSeparator()
         file_menu.addAction(self.exit_action)
         
@@ -378,6 +391,9 @@ class MainWindow(QMainWindow):
         # 运行菜单
         run_menu = menu_bar.addMenu("运行")
         run_menu.addAction(self.calc_action)
+        run_menu.addAction(self.staged_action)
+        run_menu.addAction(self.plastic_action)
+        run_menu.addAction(self.srf_action)
         
         # 帮助菜单
         help_menu = menu_bar.addMenu("帮助")
@@ -416,11 +432,14 @@ class MainWindow(QMainWindow):
         self.plot_selector.addItems([
             "模型预览", 
             "Von Mises 应力", 
+            "Von Mises 应力 (节点光滑)", 
             "水平位移 (原始)", 
             "竖直位移 (原始)",
             "水平位移 (放大)", 
             "竖直位移 (放大)"
         ])
+        # 派生结果字段 (主应力、体积应变等), 选中时才计算
+        self.plot_selector.addItems([f.label for f in DERIVED_FIELDS.values() if f.scalar])
         plot_controls.addWidget(QLabel("显示内容:"))
         plot_controls.addWidget(self.plot_selector)
         plot_controls.addStretch()
@@ -463,10 +482,14 @@ class MainWindow(QMainWindow):
         self.save_as_action.triggered.connect(self._save_project_as)
         # 导出功能已移至输入面板的导出选项卡，不再需要这些连接
         self.load_example_action.triggered.connect(self._load_example_case)
+        self.open_result_action.triggered.connect(self._open_result_archive)
         self.exit_action.triggered.connect(self.close)
         
         # 计算和分析
         self.calc_action.triggered.connect(self._run_analysis)
+        self.staged_action.triggered.connect(self._run_staged_analysis)
+        self.plastic_action.triggered.connect(self._run_elastoplastic_analysis)
+        self.srf_action.triggered.connect(self._run_strength_reduction)
         self.controller.computation_started.connect(lambda: self.statusBar().showMessage("正在计算，请稍候..."))
         self.controller.computation_finished.connect(self._on_computation_finished)
         
@@ -486,6 +509,18 @@ class MainWindow(QMainWindow):
         self._update_all() # 确保使用最新的数据
         self.controller.run_analysis()
 
+    def _run_staged_analysis(self):
+        self._update_all() # 确保使用最新的数据
+        self.controller.run_staged_analysis()
+
+    def _run_elastoplastic_analysis(self):
+        self._update_all() # 确保使用最新的数据
+        self.controller.run_elastoplastic_analysis()
+
+    def _run_strength_reduction(self):
+        self._update_all() # 确保使用最新的数据
+        self.controller.run_strength_reduction()
+
     def _on_computation_finished(self, success, message):
         self.statusBar().showMessage(message)
         if success:
@@ -509,11 +544,13 @@ class MainWindow(QMainWindow):
                 return
             plot_map = { 
                 "Von Mises 应力": "stress", 
+                "Von Mises 应力 (节点光滑)": "stress_nodal", 
                 "水平位移 (原始)": "disp_x_original", 
                 "竖直位移 (原始)": "disp_y_original",
                 "水平位移 (放大)": "disp_x", 
                 "竖直位移 (放大)": "disp_y" 
             }
+            plot_map.update({f.label: name for name, f in DERIVED_FIELDS.items() if f.scalar})
             self.canvas.plot_result(self.controller.result, plot_map.get(plot_type_text))
 
     def _open_material_dialog(self):
@@ -563,7 +600,10 @@ class MainWindow(QMainWindow):
                         name=name,
                         elastic_modulus=mat_data['elastic_modulus'],
                         poisson_ratio=mat_data['poisson_ratio'],
-                        unit_weight=mat_data.get('unit_weight', 18000.0)
+                        unit_weight=mat_data.get('unit_weight', 18000.0),
+                        cohesion=mat_data.get('cohesion', 20000.0),
+                        friction_angle=mat_data.get('friction_angle', 30.0),
+                        dilation_angle=mat_data.get('dilation_angle', 0.0)
                     )
                     materials_dict[name] = material
                 self.controller.update_materials(materials_dict)
@@ -580,6 +620,23 @@ class MainWindow(QMainWindow):
         except Exception as e:
             QMessageBox.critical(self, "错误", f"加载预设案例失败：{str(e)}")
     
+    def _open_result_archive(self):
+        """打开二进制结果存档 (内存映射, 不需要重新计算)"""
+        archive_path = QFileDialog.getExistingDirectory(self, "打开结果存档", "")
+        if not archive_path:
+            return
+        try:
+            self.controller.result = load_result_archive(archive_path)
+        except Exception as e:
+            QMessageBox.critical(self, "错误", f"打开结果存档失败：{str(e)}")
+            return
+        
+        self.results_panel.update_results(self.controller.result)
+        self.plot_selector.setCurrentIndex(1) # 默认显示应力云图
+        self._update_plot_view()
+        self.input_panel.enable_export_buttons()
+        self.statusBar().showMessage(f"结果存档打开成功：{os.path.basename(archive_path)}")
+    
     def _new_project(self):
         """新建项目"""
         reply = QMessageBox.question(self, "新建项目", 
@@ -597,6 +654,7 @@ class MainWindow(QMainWindow):
             self.input_panel.disable_export_buttons()
             
             self.current_file_path = None
+            self.controller.set_project_path(self.current_file_path)
             self._update_window_title()
             self._update_all()
             self.statusBar().showMessage("新项目已创建")
@@ -660,11 +718,21 @@ class MainWindow(QMainWindow):
                         name=name,
                         elastic_modulus=mat_data['elastic_modulus'],
                         poisson_ratio=mat_data['poisson_ratio'],
-                        unit_weight=mat_data.get('unit_weight', 18000.0)
+                        unit_weight=mat_data.get('unit_weight', 18000.0),
+                        cohesion=mat_data.get('cohesion', 20000.0),
+                        friction_angle=mat_data.get('friction_angle', 30.0),
+                        dilation_angle=mat_data.get('dilation_angle', 0.0)
                     )
                     materials_dict[name] = material
                 self.controller.update_materials(materials_dict)
             
+            # 加载荷载工况和荷载组合
+            self.controller.update_load_cases(project_data)
+            # 加载施工步
+            self.controller.update_construction_stages(project_data)
+            # 加载剖面线
+            self.controller.update_profile_lines(project_data)
+            
             # 清除之前的计算结果
             self.controller.result = FemResult()
             self.results_panel.clear()
@@ -674,6 +742,7 @@ class MainWindow(QMainWindow):
             
             # 更新当前文件路径和窗口标题
             self.current_file_path = file_path
+            self.controller.set_project_path(self.current_file_path)
             self._update_window_title()
             self.statusBar().showMessage(f"项目文件加载成功：{os.path.basename(file_path)}")
             
@@ -696,10 +765,28 @@ class MainWindow(QMainWindow):
                         'id': material.id,
                         'elastic_modulus': material.elastic_modulus,
                         'poisson_ratio': material.poisson_ratio,
-                        'unit_weight': material.unit_weight
+                        'unit_weight': material.unit_weight,
+                        'cohesion': material.cohesion,
+                        'friction_angle': material.friction_angle,
+                        'dilation_angle': material.dilation_angle
                     }
                 all_data['materials'] = materials_data
             
+            # 添加荷载工况和荷载组合
+            if self.controller.problem.load_cases:
+                all_data['load_cases'] = {
+                    name: {seg_id: LineLoad.from_value(value).to_value() for seg_id, value in loads.items()}
+                    for name, loads in self.controller.problem.load_cases.items()}
+            if self.controller.problem.load_combinations:
+                all_data['load_combinations'] = self.controller.problem.load_combinations
+            if self.controller.problem.construction_stages:
+                all_data['construction_stages'] = [
+                    dict(stage, loads={seg_id: LineLoad.from_value(value).to_value()
+                                       for seg_id, value in stage.get('loads', {}).items()})
+                    for stage in self.controller.problem.construction_stages]
+            if self.controller.problem.profile_lines:
+                all_data['profile_lines'] = self.controller.problem.profile_lines
+            
             # 添加项目信息
             if 'name' not in all_data:
                 all_data['name'] = os.path.splitext(os.path.basename(file_path))[0]
@@ -712,6 +799,7 @@ class MainWindow(QMainWindow):
             
             # 更新当前文件路径和窗口标题
             self.current_file_path = file_path
+            self.controller.set_project_path(self.current_file_path)
             self._update_window_title()
             self.statusBar().showMessage(f"项目文件保存成功：{os.path.basename(file_path)}")
             
@@ -6,6 +6,8 @@ import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.gridspec import GridSpec
 from utils.resource_manager import get_icon_path
+from core.elements import display_triangles
+from core.fields import DERIVED_FIELDS
 
 # 设置matplotlib中文字体支持
 plt.rcParams['font.sans-serif'] = ['SimHei', 'Microsoft YaHei', 'DejaVu Sans']
@@ -261,7 +263,9 @@ class CanvasWidget(QWidget):
             
         mesh = result.mesh
         nodes = mesh['vertices']
-        elements = mesh['triangles']
+        # 二次单元划分为线性子三角形绘制云图, 网格线只画角点连线
+        elements, parent = display_triangles(mesh['triangles'])
+        outline = np.asarray(mesh['triangles'])[:, :3]
         
         # 判断是否需要放大显示
         use_deformation = plot_type in ['disp_x', 'disp_y', 'disp_x_original', 'disp_y_original']
@@ -286,6 +290,11 @@ class CanvasWidget(QWidget):
         title, values, unit = "", None, ""
         if plot_type == 'stress':
             title, values, unit = "Von Mises 应力云图", result.stresses, "Pa"
+        elif plot_type == 'stress_nodal':
+            # 节点光滑应力 (分片恢复) 绘制连续云图; 没有节点应力时退回单元应力
+            nodal = len(result.nodal_stresses) > 0
+            title = "Von Mises 应力云图 (节点光滑)" if nodal else "Von Mises 应力云图"
+            values, unit = (result.nodal_stresses if nodal else result.stresses), "Pa"
         elif plot_type == 'disp_x':
             title, values, unit = f"水平位移 (X) [放大{scale_factor:.0f}倍]", result.displacements[:, 0], "m"
         elif plot_type == 'disp_y':
@@ -294,11 +303,14 @@ class CanvasWidget(QWidget):
             title, values, unit = "水平位移 (X) [原始尺寸]", result.displacements[:, 0], "m"
         elif plot_type == 'disp_y_original':
             title, values, unit = "竖直位移 (Y) [原始尺寸]", result.displacements[:, 1], "m"
+        elif plot_type in DERIVED_FIELDS:
+            derived = DERIVED_FIELDS[plot_type]
+            title, values, unit = derived.label, result.get_field(plot_type), derived.unit
         
         # 绘制云图
         if values is not None:
-            if values.ndim == 1 and len(values) == len(elements): # 单元数据
-                cax = self.ax.tripcolor(deformed_nodes[:, 0], deformed_nodes[:, 1], elements, facecolors=values, cmap='jet_r')
+            if values.ndim == 1 and len(values) == len(outline): # 单元数据
+                cax = self.ax.tripcolor(deformed_nodes[:, 0], deformed_nodes[:, 1], elements, facecolors=values[parent], cmap='jet_r')
             elif values.ndim == 1 and len(values) == len(nodes): # 节点数据
                 cax = self.ax.tricontourf(deformed_nodes[:, 0], deformed_nodes[:, 1], elements, values, cmap='jet_r', levels=20)
             
@@ -307,11 +319,11 @@ class CanvasWidget(QWidget):
             self.colorbar = self.figure.colorbar(cax, cax=self.cbar_ax, label=f"{title} ({unit})")
         
         # 叠加网格 - 显示变形后的形状
-        self.ax.triplot(deformed_nodes[:, 0], deformed_nodes[:, 1], elements, 'k-', linewidth=0.5, alpha=0.5)
+        self.ax.triplot(deformed_nodes[:, 0], deformed_nodes[:, 1], outline, 'k-', linewidth=0.5, alpha=0.5)
         
         # 如果是放大位移图，额外显示原始形状作为对比
         if use_deformation and use_scale and scale_factor > 1:
-            self.ax.triplot(nodes[:, 0], nodes[:, 1], elements, color='gray', linewidth=0.3, alpha=0.3, linestyle='--')
+            self.ax.triplot(nodes[:, 0], nodes[:, 1], outline, color='gray', linewidth=0.3, alpha=0.3, linestyle='--')
 
         self._setup_plot(title=title)
         self.canvas.draw()
@@ -11,6 +11,16 @@ from PyQt6.QtGui import QIcon
 
 # 导入资源管理器
 from utils.resource_manager import get_icon_path, safe_get_icon_path
+from core.fields import DERIVED_FIELDS
+from core.storage import save_result_archive
+
+# 剖面结果导出的列: FemResult.probe_polyline 结果的键 -> 列标题
+PROFILE_EXPORT_COLUMNS = {
+    'distance': '沿线距离 (m)', 'x': 'X坐标 (m)', 'y': 'Y坐标 (m)',
+    'ux': '水平位移 (m)', 'uy': '竖直位移 (m)',
+    'sigma_x': 'σx (Pa)', 'sigma_y': 'σy (Pa)', 'tau_xy': 'τxy (Pa)', 'sigma_z': 'σz (Pa)',
+    'von_mises': '冯·米塞斯应力 (Pa)',
+}
 
 class InputPanel(QWidget):
     """
@@ -353,6 +363,7 @@ class InputPanel(QWidget):
                 if const_type != "无": data['constraints'][seg_id] = const_type
                 if load_val != 0.0: data['loads'][seg_id] = load_val
             data['target_points'] = {self.targets_table.item(r, 0).text(): (float(self.targets_table.item(r, 1).text()), float(self.targets_table.item(r, 2).text())) for r in range(self.targets_table.rowCount())}
+            data['include_self_weight'] = hasattr(self, 'self_weight_checkbox') and self.self_weight_checkbox.isChecked()
             return data
         except (ValueError, AttributeError, IndexError, TypeError):
             return None
@@ -370,6 +381,12 @@ class InputPanel(QWidget):
             self.mesh_area_input.setText("10")
         if hasattr(self, 'mesh_quality_input'):
             self.mesh_quality_input.setText("30")
+        if hasattr(self, 'element_type_combo'):
+            self.element_type_combo.setCurrentIndex(0)
+        if hasattr(self, 'adaptive_checkbox'):
+            self.adaptive_checkbox.setChecked(False)
+        if hasattr(self, 'self_weight_checkbox'):
+            self.self_weight_checkbox.setChecked(False)
         
         # 发出数据变化信号
         self.data_changed.emit()
@@ -453,6 +470,10 @@ class InputPanel(QWidget):
                     self.targets_table.setItem(i, 1, QTableWidgetItem(str(x)))
                     self.targets_table.setItem(i, 2, QTableWidgetItem(str(y)))
             
+            # 自重荷载设置
+            if hasattr(self, 'self_weight_checkbox'):
+                self.self_weight_checkbox.setChecked(bool(data.get('include_self_weight', False)))
+            
             # 发出数据变化信号
             self.data_changed.emit()
             
@@ -496,6 +517,81 @@ class InputPanel(QWidget):
         form_layout.addRow(quality_label, self.mesh_quality_input)
         form_layout.addRow("", quality_help)
         
+        # 单元类型
+        self.element_type_combo = QComboBox()
+        self.element_type_combo.addItems(["线性三角形 (CST, 3节点)", "二次三角形 (LST/T6, 6节点)"])
+        self.element_type_combo.currentIndexChanged.connect(self.data_changed.emit)
+        element_type_help = QLabel("二次单元在弯曲为主的边坡中精度更高，可使用更粗的网格")
+        element_type_help.setStyleSheet("color: gray; font-size: 9pt;")
+        
+        form_layout.addRow("单元类型:", self.element_type_combo)
+        form_layout.addRow("", element_type_help)
+        
+        # 自适应网格加密
+        self.adaptive_checkbox = QCheckBox("自适应网格加密 (ZZ误差估计)")
+        self.adaptive_checkbox.toggled.connect(self._update_adaptive_option_state)
+        self.adaptive_checkbox.toggled.connect(self.data_changed.emit)
+        adaptive_help = QLabel("以上面积作为初始网格，按应力误差在坡脚、加载处等局部加密")
+        adaptive_help.setStyleSheet("color: gray; font-size: 9pt;")
+        
+        form_layout.addRow("网格加密:", self.adaptive_checkbox)
+        form_layout.addRow("", adaptive_help)
+        
+        self.adaptive_error_input = QLineEdit()
+        self.adaptive_error_input.setText("5")
+        self.adaptive_error_input.setPlaceholderText("目标相对误差 (%)")
+        form_layout.addRow("目标误差 (%):", self.adaptive_error_input)
+        
+        self.adaptive_max_dofs_input = QLineEdit()
+        self.adaptive_max_dofs_input.setText("20000")
+        self.adaptive_max_dofs_input.setPlaceholderText("自由度数上限")
+        form_layout.addRow("自由度上限:", self.adaptive_max_dofs_input)
+        
+        self._update_adaptive_option_state()
+        
+        # 自重荷载
+        self.self_weight_checkbox = QCheckBox("考虑自重荷载")
+        self.self_weight_checkbox.toggled.connect(self.data_changed.emit)
+        self_weight_help = QLabel("按材料重度计算单元自重，计入基本工况")
+        self_weight_help.setStyleSheet("color: gray; font-size: 9pt;")
+        
+        form_layout.addRow("荷载:", self.self_weight_checkbox)
+        form_layout.addRow("", self_weight_help)
+        
+        # 求解器设置
+        self.solver_type_combo = QComboBox()
+        self.solver_type_combo.addItems(["稀疏直接法 (LU)", "预条件共轭梯度法 (PCG)"])
+        self.solver_type_combo.currentIndexChanged.connect(self._update_solver_option_state)
+        
+        solver_help = QLabel("超大网格建议使用共轭梯度法，内存占用更小")
+        solver_help.setStyleSheet("color: gray; font-size: 9pt;")
+        
+        form_layout.addRow("求解器:", self.solver_type_combo)
+        form_layout.addRow("", solver_help)
+        
+        self.preconditioner_combo = QComboBox()
+        self.preconditioner_combo.addItems(["Jacobi (对角)", "不完全Cholesky (IC)", "不完全LU (ILU, BiCGSTAB迭代)"])
+        form_layout.addRow("预条件子:", self.preconditioner_combo)
+        
+        self.solver_tol_input = QLineEdit()
+        self.solver_tol_input.setText("1e-8")
+        self.solver_tol_input.setPlaceholderText("相对残差容差 (例如: 1e-8)")
+        form_layout.addRow("收敛容差:", self.solver_tol_input)
+        
+        self.solver_maxiter_input = QLineEdit()
+        self.solver_maxiter_input.setPlaceholderText("留空则为自由度数的10倍")
+        form_layout.addRow("最大迭代次数:", self.solver_maxiter_input)
+        
+        self._update_solver_option_state()
+        
+        # 结果存储
+        self.float32_results_checkbox = QCheckBox("以单精度 (float32) 保存结果")
+        storage_help = QLabel("结果数组占用内存减半，误差超过 1e-6 (相对) 的数组仍保留双精度")
+        storage_help.setStyleSheet("color: gray; font-size: 9pt;")
+        
+        form_layout.addRow("结果存储:", self.float32_results_checkbox)
+        form_layout.addRow("", storage_help)
+        
         layout.addLayout(form_layout)
         layout.addStretch()  # 添加弹性空间
         
@@ -506,13 +602,66 @@ class InputPanel(QWidget):
         try:
             area = float(self.mesh_area_input.text()) if hasattr(self, 'mesh_area_input') and self.mesh_area_input.text() else 10.0
             quality = int(self.mesh_quality_input.text()) if hasattr(self, 'mesh_quality_input') and self.mesh_quality_input.text() else 30
-            # 添加'A'标志来启用区域属性生成
-            return f'pq{quality}a{area}A'
+            # 添加'A'标志来启用区域属性生成, 'o2'标志生成6节点二次单元
+            order = 'o2' if hasattr(self, 'element_type_combo') and self.element_type_combo.currentIndex() == 1 else ''
+            return f'pq{quality}a{area}A{order}'
         except ValueError:
             # 如果输入无效，返回默认值
             return 'pq30a10A'  # 也要添加A标志
             raise e
     
+    def _update_adaptive_option_state(self):
+        """仅在启用自适应加密时启用目标误差和自由度上限的设置。"""
+        enabled = self.adaptive_checkbox.isChecked()
+        self.adaptive_error_input.setEnabled(enabled)
+        self.adaptive_max_dofs_input.setEnabled(enabled)
+    
+    def get_adaptive_options(self):
+        """获取自适应网格加密参数, 未启用时返回None。"""
+        if not hasattr(self, 'adaptive_checkbox') or not self.adaptive_checkbox.isChecked():
+            return None
+        options = {}
+        try:
+            options['target_error'] = float(self.adaptive_error_input.text()) / 100.0
+        except ValueError:
+            pass
+        try:
+            options['max_dofs'] = int(self.adaptive_max_dofs_input.text())
+        except ValueError:
+            pass
+        return options
+    
+    def _update_solver_option_state(self):
+        """仅在选择共轭梯度法时启用迭代求解相关的设置。"""
+        is_iterative = self.solver_type_combo.currentIndex() == 1
+        self.preconditioner_combo.setEnabled(is_iterative)
+        self.solver_tol_input.setEnabled(is_iterative)
+        self.solver_maxiter_input.setEnabled(is_iterative)
+    
+    def get_storage_options(self):
+        """获取结果存储参数, 作为关键字参数传给 FemResult.compact。"""
+        float32 = hasattr(self, 'float32_results_checkbox') and self.float32_results_checkbox.isChecked()
+        return {'float32': float32}
+    
+    def get_solver_options(self):
+        """获取用户设置的求解器参数, 作为关键字参数传给FemSolver。"""
+        if not hasattr(self, 'solver_type_combo') or self.solver_type_combo.currentIndex() == 0:
+            return {'linear_solver': 'direct'}
+        preconditioners = ['jacobi', 'ic', 'ilu']
+        options = {
+            'linear_solver': 'cg',
+            'preconditioner': preconditioners[self.preconditioner_combo.currentIndex()],
+        }
+        try:
+            options['tol'] = float(self.solver_tol_input.text())
+        except ValueError:
+            pass
+        try:
+            options['maxiter'] = int(self.solver_maxiter_input.text())
+        except ValueError:
+            pass
+        return options
+    
     def _create_export_page(self):
         """创建导出页面"""
         widget = QWidget()
@@ -574,7 +723,8 @@ class InputPanel(QWidget):
             ("导出为CSV格式", "将数据导出为CSV文件，便于在Excel等软件中查看", "#4caf50"),
             ("导出为Excel格式", "将数据导出为Excel文件，包含多个工作表", "#2196f3"),
             ("导出为PNG图像", "将当前视图导出为高质量PNG图像", "#ff9800"),
-            ("导出为PDF文档", "将分析报告导出为PDF文档", "#9c27b0")
+            ("导出为PDF文档", "将分析报告导出为PDF文档", "#9c27b0"),
+            ("导出为结果存档", "保存网格、位移、应力等全部结果的二进制存档，可通过“打开结果存档”重新载入，无需重新计算", "#607d8b")
         ]
         
         for button_text, description, color in export_buttons:
@@ -704,6 +854,8 @@ class InputPanel(QWidget):
             export_btn.clicked.connect(self._export_png)
         elif "PDF" in text:
             export_btn.clicked.connect(self._export_pdf)
+        elif "存档" in text:
+            export_btn.clicked.connect(self._export_archive)
         
         return container
     
@@ -779,6 +931,30 @@ class InputPanel(QWidget):
         except Exception as e:
             QMessageBox.critical(self, "错误", f"导出Excel文件时发生错误：{str(e)}")
     
+    def _export_archive(self):
+        """导出二进制结果存档 (目录)"""
+        from PyQt6.QtWidgets import QFileDialog, QMessageBox
+        
+        if not self.controller.result or not hasattr(self.controller.result, 'mesh') or not self.controller.result.mesh:
+            QMessageBox.warning(self, "警告", "没有可导出的计算结果，请先运行计算。")
+            return
+        
+        file_path, _ = QFileDialog.getSaveFileName(
+            self, "导出结果存档", "", "结果存档 (*.sfres)"
+        )
+        
+        if not file_path:
+            return
+        if not file_path.endswith('.sfres'):
+            file_path += '.sfres'
+        
+        try:
+            save_result_archive(self.controller.result, file_path)
+            QMessageBox.information(self, "成功", f"结果存档已保存到：{file_path}")
+            self.export_status_label.setText(f"已导出到：{file_path}")
+        except Exception as e:
+            QMessageBox.critical(self, "错误", f"保存结果存档时发生错误：{str(e)}")
+    
     def _export_to_csv(self, file_path):
         """将结果数据导出为CSV格式"""
         import csv
@@ -805,18 +981,38 @@ class InputPanel(QWidget):
             # 节点位移结果
             if len(result.displacements) > 0:
                 writer.writerow(['节点位移结果'])
-                writer.writerow(['节点ID', 'X坐标 (m)', 'Y坐标 (m)', '水平位移 (m)', '竖直位移 (m)'])
+                derived = self._derived_export_columns('node')
+                writer.writerow(['节点ID', 'X坐标 (m)', 'Y坐标 (m)', '水平位移 (m)', '竖直位移 (m)'] + list(derived))
                 displacements_2d = result.displacements.reshape(-1, 2)
                 for i, (node, disp) in enumerate(zip(result.mesh['vertices'], displacements_2d)):
-                    writer.writerow([i, f'{node[0]:.6f}', f'{node[1]:.6f}', f'{disp[0]:.6e}', f'{disp[1]:.6e}'])
+                    writer.writerow([i, f'{node[0]:.6f}', f'{node[1]:.6f}', f'{disp[0]:.6e}', f'{disp[1]:.6e}']
+                                    + [f'{values[i]:.6e}' for values in derived.values()])
                 writer.writerow([])
             
             # 单元应力结果
             if len(result.stresses) > 0:
                 writer.writerow(['单元应力结果'])
-                writer.writerow(['单元ID', '冯·米塞斯应力 (Pa)'])
+                derived = self._derived_export_columns('element')
+                writer.writerow(['单元ID', '冯·米塞斯应力 (Pa)'] + list(derived))
                 for i, stress in enumerate(result.stresses):
-                    writer.writerow([i, f'{stress:.6e}'])
+                    writer.writerow([i, f'{stress:.6e}'] + [f'{values[i]:.6e}' for values in derived.values()])
+                writer.writerow([])
+            
+            # 节点应力结果 (超收敛分片恢复)
+            if len(result.nodal_stresses) > 0:
+                writer.writerow(['节点应力结果 (分片恢复)'])
+                writer.writerow(['节点ID', 'σx (Pa)', 'σy (Pa)', 'τxy (Pa)', 'σz (Pa)', '冯·米塞斯应力 (Pa)'])
+                for i, (components, stress) in enumerate(zip(result.nodal_stress_components, result.nodal_stresses)):
+                    writer.writerow([i] + [f'{value:.6e}' for value in components] + [f'{stress:.6e}'])
+                writer.writerow([])
+            
+            # 剖面线结果 (沿折线插值的位移和应力)
+            for name, probe in self._probe_profiles().items():
+                writer.writerow([f'剖面结果: {name}'])
+                writer.writerow(list(PROFILE_EXPORT_COLUMNS.values()))
+                for row in zip(*(probe[key] for key in PROFILE_EXPORT_COLUMNS)):
+                    writer.writerow([f'{value:.6e}' for value in row])
+                writer.writerow([])
     
     def _export_to_excel(self, file_path):
         """将结果数据导出为Excel格式"""
@@ -853,6 +1049,8 @@ class InputPanel(QWidget):
                         '竖直位移 (m)': disp[1]
                     })
                 df_nodes = pd.DataFrame(node_data)
+                for title, values in self._derived_export_columns('node').items():
+                    df_nodes[title] = values
                 df_nodes.to_excel(writer, sheet_name='节点位移', index=False)
             
             # 单元应力结果
@@ -864,7 +1062,50 @@ class InputPanel(QWidget):
                         '冯·米塞斯应力 (Pa)': stress
                     })
                 df_stress = pd.DataFrame(stress_data)
+                for title, values in self._derived_export_columns('element').items():
+                    df_stress[title] = values
                 df_stress.to_excel(writer, sheet_name='单元应力', index=False)
+            
+            # 节点应力结果 (超收敛分片恢复)
+            if len(result.nodal_stresses) > 0:
+                components = result.nodal_stress_components
+                df_nodal_stress = pd.DataFrame({
+                    '节点ID': range(len(result.nodal_stresses)),
+                    'σx (Pa)': components[:, 0],
+                    'σy (Pa)': components[:, 1],
+                    'τxy (Pa)': components[:, 2],
+                    'σz (Pa)': components[:, 3],
+                    '冯·米塞斯应力 (Pa)': result.nodal_stresses,
+                })
+                df_nodal_stress.to_excel(writer, sheet_name='节点应力', index=False)
+            
+            # 剖面线结果, 每条剖面一个工作表 (工作表名最长31个字符)
+            for name, probe in self._probe_profiles().items():
+                df_profile = pd.DataFrame({title: probe[key] for key, title in PROFILE_EXPORT_COLUMNS.items()})
+                df_profile.to_excel(writer, sheet_name=f'剖面-{name}'[:31], index=False)
+    
+    def _derived_export_columns(self, location):
+        """
+        导出的派生结果字段 {列标题: 值}, location 为 'node' 或 'element';
+        不能由当前结果计算的字段 (例如缺少问题定义) 不导出。
+        """
+        result = self.controller.result
+        columns = {}
+        for name, derived in DERIVED_FIELDS.items():
+            if not derived.scalar or derived.location != location:
+                continue
+            try:
+                columns[f'{derived.label} ({derived.unit})'] = result.get_field(name)
+            except ValueError:
+                continue
+        return columns
+    
+    def _probe_profiles(self):
+        """提取项目中定义的全部剖面线的结果。"""
+        profile_lines = self.controller.problem.profile_lines
+        if not profile_lines:
+            return {}
+        return self.controller.result.probe_profiles(profile_lines)
     
     def _export_png(self):
         """导出PNG格式图像 - 导出所有结果类型"""
@@ -919,6 +1160,7 @@ class InputPanel(QWidget):
         # 定义所有结果类型
         result_types = [
             ('stress', 'Von_Mises应力'),
+            ('stress_nodal', 'Von_Mises应力_节点光滑'),
             ('disp_x_original', '水平位移_原始'),
             ('disp_y_original', '竖直位移_原始'),
             ('disp_x', '水平位移_放大'),
@@ -969,6 +1211,7 @@ class InputPanel(QWidget):
         # 定义所有结果类型
         result_types = [
             ('stress', 'Von Mises应力'),
+            ('stress_nodal', 'Von Mises应力_节点光滑'),
             ('disp_x_original', '水平位移_原始'),
             ('disp_y_original', '竖直位移_原始'),
             ('disp_x', '水平位移_放大'),
@@ -76,7 +76,18 @@ class ResultsPanel(QWidget):
             if child.widget():
                 child.widget().deleteLater()
         
+        # 强度折减分析的安全系数
+        row_offset = 0
+        if result and result.factor_of_safety is not None:
+            fos_label = QLabel(f"<b>安全系数 FoS = {result.factor_of_safety:.3f}</b>")
+            fos_label.setFont(QFont("Arial", 11))
+            fos_label.setStyleSheet("padding: 5px; color: #c0392b;")
+            self.grid_layout.addWidget(fos_label, 0, 0, 1, 3)
+            row_offset = 1
+        
         if not result or not result.target_displacements:
+            if row_offset:
+                return
             error_label = QLabel("计算失败或无目标点结果。")
             error_label.setFont(QFont("Arial", 10))
             self.grid_layout.addWidget(error_label, 0, 0)
@@ -96,10 +107,10 @@ class ResultsPanel(QWidget):
             header_label = QLabel(f"<b>{header}</b>")
             header_label.setFont(header_font)
             header_label.setStyleSheet("padding: 5px; background-color: #f0f0f0;")
-            self.grid_layout.addWidget(header_label, 0, col)
+            self.grid_layout.addWidget(header_label, row_offset, col)
 
         # 填充数据
-        row = 1
+        row = row_offset + 1
         for name, (dx, dy) in result.target_displacements.items():
             name_label = QLabel(name)
             name_label.setFont(content_font)
@@ -11,6 +11,8 @@ from abc import ABC, abstractmethod
 
 # 导入资源管理器
 from utils.resource_manager import safe_get_icon_path
+from core.elements import display_triangles
+from core.fields import DERIVED_FIELDS
 
 class BaseVisualizationWidget(ABC):
     """可视化组件的抽象基类（仅作为接口参考）"""
@@ -341,10 +343,11 @@ class VTKCanvasWidget(QWidget):
         
         mesh = result.mesh
         nodes = mesh['vertices']
-        elements = mesh['triangles']
+        # 二次单元划分为线性子三角形显示
+        elements, parent = display_triangles(mesh['triangles'])
         
         # 创建网格可视化
-        scale_factor = self.create_mesh_visualization(nodes, elements, result, plot_type)
+        scale_factor = self.create_mesh_visualization(nodes, elements, result, plot_type, parent)
         
         # 更新渲染
         self.renderer.ResetCamera()
@@ -352,8 +355,12 @@ class VTKCanvasWidget(QWidget):
         
         return scale_factor  # 返回放大系数供颜色条使用
         
-    def create_mesh_visualization(self, nodes, elements, result, plot_type):
-        """创建网格可视化"""
+    def create_mesh_visualization(self, nodes, elements, result, plot_type, parent=None):
+        """创建网格可视化, parent 为每个显示三角形所属的单元编号"""
+        stresses = result.stresses if parent is None or len(result.stresses) == 0 else result.stresses[parent]
+        if plot_type == 'stress_nodal' and len(result.nodal_stresses) == 0:
+            # 没有节点光滑应力时退回单元应力, 与Matplotlib画布一致
+            plot_type = 'stress'
         # 创建点
         points = vtk.vtkPoints()
         
@@ -398,7 +405,7 @@ class VTKCanvasWidget(QWidget):
         scalars.SetName("Values")
         
         if plot_type == 'stress' and hasattr(result, 'stresses'):
-            for stress in result.stresses:
+            for stress in stresses:
                 scalars.InsertNextValue(stress)
             polydata.GetCellData().SetScalars(scalars)
         elif plot_type in ['disp_x', 'disp_y'] and hasattr(result, 'displacements'):
@@ -423,14 +430,23 @@ class VTKCanvasWidget(QWidget):
         
         # 确保数值范围与Matplotlib完全一致
         if plot_type == 'stress' and hasattr(result, 'stresses'):
-            values = result.stresses
+            values = stresses
             min_val, max_val = np.min(values), np.max(values)
             lut.SetTableRange(min_val, max_val)
             mapper.SetScalarRange(min_val, max_val)
-            for i, stress in enumerate(result.stresses):
+            for i, stress in enumerate(stresses):
                 scalars.InsertNextValue(stress)
             polydata.GetCellData().SetScalars(scalars)
             mapper.SetScalarModeToUseCellData()
+        elif plot_type == 'stress_nodal' and len(result.nodal_stresses) > 0:
+            values = result.nodal_stresses
+            min_val, max_val = np.min(values), np.max(values)
+            lut.SetTableRange(min_val, max_val)
+            mapper.SetScalarRange(min_val, max_val)
+            for stress in values:
+                scalars.InsertNextValue(stress)
+            polydata.GetPointData().SetScalars(scalars)
+            mapper.SetScalarModeToUsePointData()
         elif plot_type in ['disp_x', 'disp_y'] and hasattr(result, 'displacements'):
             idx = 0 if plot_type == 'disp_x' else 1
             values = result.displacements[:, idx]
@@ -451,6 +467,22 @@ class VTKCanvasWidget(QWidget):
                 scalars.InsertNextValue(disp)
             polydata.GetPointData().SetScalars(scalars)
             mapper.SetScalarModeToUsePointData()
+        elif plot_type in DERIVED_FIELDS:
+            # 派生结果字段: 单元字段按显示三角形所属的单元取值
+            values = result.get_field(plot_type)
+            if DERIVED_FIELDS[plot_type].location == 'element' and parent is not None:
+                values = values[parent]
+            min_val, max_val = np.min(values), np.max(values)
+            lut.SetTableRange(min_val, max_val)
+            mapper.SetScalarRange(min_val, max_val)
+            for value in values:
+                scalars.InsertNextValue(value)
+            if DERIVED_FIELDS[plot_type].location == 'element':
+                polydata.GetCellData().SetScalars(scalars)
+                mapper.SetScalarModeToUseCellData()
+            else:
+                polydata.GetPointData().SetScalars(scalars)
+                mapper.SetScalarModeToUsePointData()
         
         lut.Build()
         mapper.SetLookupTable(lut)
@@ -475,11 +507,13 @@ class VTKCanvasWidget(QWidget):
         # 设置标题 - 完全匹配Matplotlib的格式
         titles = {
             'stress': 'Von Mises 应力云图 (Pa)',
+            'stress_nodal': 'Von Mises 应力云图 (节点光滑) (Pa)',
             'disp_x': f'水平位移 (X) [放大{scale_factor:.0f}倍] (m)' if scale_factor > 1 else '水平位移 (X) (m)',
             'disp_y': f'竖直位移 (Y) [放大{scale_factor:.0f}倍] (m)' if scale_factor > 1 else '竖直位移 (Y) (m)',
             'disp_x_original': '水平位移 (X) [原始尺寸] (m)',
             'disp_y_original': '竖直位移 (Y) [原始尺寸] (m)'
         }
+        titles.update({name: f'{f.label} ({f.unit})' for name, f in DERIVED_FIELDS.items()})
         colorbar.SetTitle(titles.get(plot_type, '数值'))
         
         # 设置颜色条的数值格式 - 与Matplotlib一致
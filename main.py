@@ -1,4 +1,5 @@
 import sys
+import multiprocessing
 from PyQt6.QtWidgets import QApplication
 
 # 导入主窗口和控制器
@@ -32,4 +33,6 @@ def main():
 
 if __name__ == '__main__':
     # 确保此脚本作为主程序运行时才执行main函数
+    # 强度折减分析使用进程池, 打包后的可执行文件需要 freeze_support
+    multiprocessing.freeze_support()
     main()
@@ -0,0 +1,37 @@
+import json
+import os
+import sys
+import pytest
+
+# 添加项目根目录到Python路径
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from core.fem_model import ProblemDefinition, Material
+
+EXAMPLE_FILE = os.path.join(project_root, 'examples', 'slope_problem.json')
+
+
+def load_example_problem(include_self_weight=False):
+    """按项目文件的读取方式 (线段ID转为整数) 由 examples/slope_problem.json 生成问题定义。"""
+    with open(EXAMPLE_FILE, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    problem = ProblemDefinition()
+    problem.vertices = [tuple(v) for v in data['vertices']]
+    problem.segments = [tuple(s) for s in data['segments']]
+    problem.regions = [tuple(r) for r in data['regions']]
+    problem.constraints = {int(seg_id): c for seg_id, c in data['constraints'].items()}
+    problem.loads = {int(seg_id): float(value) for seg_id, value in data['loads'].items()}
+    problem.target_points = {name: tuple(p) for name, p in data['target_points'].items()}
+    problem.materials = {
+        name: Material(id=m['id'], name=name, elastic_modulus=m['elastic_modulus'],
+                       poisson_ratio=m['poisson_ratio'], unit_weight=m.get('unit_weight', 18000.0))
+        for name, m in data['materials'].items()
+    }
+    problem.include_self_weight = include_self_weight
+    return problem
+
+
+@pytest.fixture
+def example_problem():
+    return load_example_problem()
@@ -0,0 +1,35 @@
+import numpy as np
+from core.assembly import SparsityPattern, assemble_sparse
+from core.geometry import element_geometry
+from core.preprocessor import create_mesh
+
+
+def test_pattern_assembly_and_submatrices(example_problem):
+    mesh = create_mesh(example_problem, 'pq30a4A')
+    geometry = element_geometry(mesh)
+    dof_indices = geometry.element_dof_indices
+    total_dof = 2 * len(mesh['vertices'])
+    rng = np.random.default_rng(0)
+    ke = rng.standard_normal((len(dof_indices), dof_indices.shape[1], dof_indices.shape[1]))
+
+    pattern = SparsityPattern(dof_indices, total_dof)
+    K = pattern.assemble(ke)
+    assert abs(K - assemble_sparse(ke, dof_indices, total_dof)).max() < 1e-12
+
+    keep_a = np.arange(0, total_dof, 2)
+    keep_b = np.arange(1, total_dof, 2)
+    assert pattern.submatrix_key(keep_a) != pattern.submatrix_key(keep_b)
+    assert pattern.submatrix_key(keep_a) == pattern.submatrix_key(list(keep_a))
+    for keep in (keep_a, keep_b, keep_a):
+        assert abs(pattern.submatrix(K, keep) - K[keep][:, keep]).max() == 0.0
+
+
+def test_geometry_cache_is_rebuilt_when_region_attributes_change(example_problem):
+    mesh = create_mesh(example_problem, 'pq30a4A')
+    geometry = element_geometry(mesh)
+    assert element_geometry(mesh) is geometry
+
+    mesh['element_attributes'] = np.zeros_like(mesh['element_attributes'])
+    rebuilt = element_geometry(mesh)
+    assert rebuilt is not geometry
+    assert list(rebuilt.unique_region_ids) == [0]
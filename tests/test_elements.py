@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+from core.fem_model import ProblemDefinition, Material, LineLoad
+from core.preprocessor import create_mesh
+from core.solver import FemSolver
+
+
+@pytest.fixture
+def cantilever():
+    """10 m × 1 m 悬臂梁, 左端固定, 上表面竖直均布荷载 1000 N/m。"""
+    return ProblemDefinition(
+        vertices=[(0.0, 0.0), (10.0, 0.0), (10.0, 1.0), (0.0, 1.0)],
+        segments=[(0, 1), (1, 2), (2, 3), (3, 0)],
+        materials={'梁': Material(id=1, name='梁', elastic_modulus=1.0e7, poisson_ratio=0.3)},
+        constraints={3: '固定约束 (Fixed)'},
+        loads={2: 1000.0},
+    )
+
+
+def solve(problem, mesh_opts, quadratic):
+    mesh = create_mesh(problem, mesh_opts, quadratic=quadratic)
+    solver = FemSolver(problem, mesh)
+    u = solver.solve().reshape(-1, 2)
+    return mesh, solver, u
+
+
+def tip_deflection(problem, mesh_opts, quadratic):
+    mesh, _, u = solve(problem, mesh_opts, quadratic)
+    tip = np.isclose(np.asarray(mesh['vertices'])[:, 0], 10.0)
+    return u[tip, 1].mean()
+
+
+def test_coarse_t6_matches_fine_cst(cantilever):
+    t6_coarse = tip_deflection(cantilever, 'pq30a0.5', quadratic=True)
+    cst_fine = tip_deflection(cantilever, 'pq30a0.002', quadratic=False)
+    cst_coarse = tip_deflection(cantilever, 'pq30a0.05', quadratic=False)
+
+    # 35个T6单元与约8000个CST单元的结果相差不到2%, 自由度相近的CST网格则明显偏刚
+    assert abs(t6_coarse - cst_fine) < 0.02 * abs(cst_fine)
+    assert abs(t6_coarse - cst_fine) < abs(cst_coarse - cst_fine)
+
+
+@pytest.mark.parametrize('load', [1000.0, LineLoad(1000.0, 3000.0, 'normal')])
+def test_cst_and_t6_apply_the_same_line_load(cantilever, load):
+    cantilever.loads = {2: load}
+    resultants = []
+    for quadratic in (False, True):
+        mesh, solver, _ = solve(cantilever, 'pq30a0.5', quadratic)
+        x = np.asarray(mesh['vertices'])[:, 0]
+        F = solver.F[:, 0].reshape(-1, 2)
+        # 合力及其对 x = 0 的力矩
+        resultants.append((F[:, 0].sum(), F[:, 1].sum(), (F[:, 1] * x).sum()))
+
+    cst, t6 = np.array(resultants)
+    # 线段2从 (10, 1) 指向 (0, 1), 荷载集度由1000线性变化到3000
+    if isinstance(load, LineLoad):
+        expected = (0.0, -20000.0, -(1000.0 * 10.0 * 5.0 + 2000.0 * 10.0 / 2 * 10.0 / 3))
+    else:
+        expected = (0.0, -10000.0, -50000.0)
+    np.testing.assert_allclose(cst, expected, atol=1e-8 * 20000.0 * 10.0)
+    np.testing.assert_allclose(t6, expected, atol=1e-8 * 20000.0 * 10.0)
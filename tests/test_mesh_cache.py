@@ -0,0 +1,58 @@
+import numpy as np
+from core.fem_model import Material
+from core.mesh_cache import MeshCache, mesh_key
+from core.solver import FemSolver
+
+
+def test_memory_hit_returns_same_mesh(example_problem):
+    cache = MeshCache()
+    mesh = cache.get_mesh(example_problem, 'pq30a4A')
+
+    # 只修改荷载和材料参数时网格不变
+    example_problem.loads = {0: 50000.0}
+    example_problem.materials['回填土'].elastic_modulus = 3.0e7
+    assert cache.get_mesh(example_problem, 'pq30a4A') is mesh
+
+
+def test_disk_cache_reload(example_problem, tmp_path):
+    mesh = MeshCache(cache_dir=str(tmp_path)).get_mesh(example_problem, 'pq30a4A')
+    assert len(list(tmp_path.glob('*.npz'))) == 1
+
+    # 新的缓存对象 (例如重新打开项目) 从磁盘读取
+    reloaded = MeshCache(cache_dir=str(tmp_path)).get_mesh(example_problem, 'pq30a4A')
+    assert reloaded is not mesh
+    public_keys = {key for key in mesh if not key.startswith('_')}
+    assert set(reloaded) == public_keys
+    for key in public_keys:
+        np.testing.assert_array_equal(np.asarray(reloaded[key]), np.asarray(mesh[key]))
+
+    u = FemSolver(example_problem, mesh).solve()
+    np.testing.assert_array_equal(FemSolver(example_problem, reloaded).solve(), u)
+
+
+def test_key_changes_with_geometry_and_options(example_problem):
+    key = mesh_key(example_problem, 'pq30a4A')
+    assert mesh_key(example_problem, 'pq30a4A') == key
+    assert mesh_key(example_problem, 'pq30a2A') != key
+    assert mesh_key(example_problem, 'pq30a4A', quadratic=True) != key
+    assert mesh_key(example_problem, 'pq30a4A', renumber=False) != key
+
+    x, y = example_problem.vertices[0]
+    example_problem.vertices[0] = (x + 0.01, y)
+    assert mesh_key(example_problem, 'pq30a4A') != key
+    example_problem.vertices[0] = (x, y)
+
+    example_problem.segments[0] = example_problem.segments[0][::-1]
+    assert mesh_key(example_problem, 'pq30a4A') != key
+    example_problem.segments[0] = example_problem.segments[0][::-1]
+
+    # 区域的材料ID是单元属性的一部分
+    example_problem.materials['回填土'] = Material(id=9, name='回填土')
+    assert mesh_key(example_problem, 'pq30a4A') != key
+
+
+def test_lru_eviction(example_problem):
+    cache = MeshCache(max_entries=1)
+    first = cache.get_mesh(example_problem, 'pq30a4A')
+    cache.get_mesh(example_problem, 'pq30a2A')
+    assert cache.get_mesh(example_problem, 'pq30a4A') is not first
@@ -0,0 +1,38 @@
+import pytest
+from core.preprocessor import create_mesh
+from core.nonlinear_solver import ElastoPlasticSolver
+
+
+@pytest.mark.parametrize('mesh_opts', ['pq30a4A', 'pq30a2A'])
+@pytest.mark.parametrize('method', ['newton', 'modified'])
+def test_example_slope_converges_at_full_load(example_problem, mesh_opts, method):
+    """示例边坡 (含自重, FoS≈1.8) 是稳定的, 弹塑性分析应加载到荷载系数1。"""
+    problem = example_problem
+    problem.include_self_weight = True
+    mesh = create_mesh(problem, mesh_opts)
+    solver = ElastoPlasticSolver(problem, mesh, method=method)
+
+    assert solver.solve()
+    assert solver.load_factor == 1.0
+    assert not solver.solver_info['diverged']
+
+
+def test_default_solver_converges_on_example_slope(example_problem):
+    """GUI使用默认参数构造求解器。"""
+    problem = example_problem
+    problem.include_self_weight = True
+    solver = ElastoPlasticSolver(problem, create_mesh(problem, 'pq30a4A'))
+
+    assert solver.method == 'newton'
+    assert solver.solve()
+    assert solver.load_factor == 1.0
+
+
+def test_iteration_cap_is_not_reported_as_divergence(example_problem):
+    problem = example_problem
+    problem.include_self_weight = True
+    solver = ElastoPlasticSolver(problem, create_mesh(problem, 'pq30a4A'), method='initial',
+                                 max_iterations=2, min_load_step=0.05)
+
+    assert not solver.solve()
+    assert not solver.solver_info['diverged']
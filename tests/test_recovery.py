@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+from core.geometry import element_geometry
+from core.preprocessor import create_mesh
+from core.recovery import recover_nodal_values, _boundary_nodes
+
+
+def linear_field(xy):
+    """三个分量的线性场, 系数的量级与应力相当。"""
+    x, y = xy[:, 0], xy[:, 1]
+    return np.column_stack([1.0e5 + 2.0e3 * x - 5.0e3 * y,
+                            -3.0e4 + 1.5e3 * y,
+                            4.0e2 * x + 7.0e2 * y])
+
+
+@pytest.mark.parametrize('quadratic', [False, True])
+def test_spr_reproduces_linear_field(example_problem, quadratic):
+    """SPR对线性场是精确的: 内部节点的恢复值等于精确值。"""
+    mesh = create_mesh(example_problem, 'pq30a4A', quadratic=quadratic)
+    geometry = element_geometry(mesh)
+    nodes = np.asarray(mesh['vertices'], dtype=float)
+    exact = linear_field(nodes)
+
+    recovered = recover_nodal_values(mesh, linear_field(geometry.point_coordinates), 'spr')
+
+    interior = ~_boundary_nodes(mesh['triangles'], len(nodes))
+    used = np.zeros(len(nodes), dtype=bool)
+    used[np.asarray(mesh['triangles']).ravel()] = True
+    scale = np.max(np.abs(exact))
+    np.testing.assert_allclose(recovered[interior & used], exact[interior & used], rtol=0, atol=1e-9 * scale)
+
+
+def test_average_is_not_exact_for_linear_field(example_problem):
+    mesh = create_mesh(example_problem, 'pq30a4A')
+    geometry = element_geometry(mesh)
+    nodes = np.asarray(mesh['vertices'], dtype=float)
+
+    recovered = recover_nodal_values(mesh, linear_field(geometry.point_coordinates), 'average')
+
+    assert np.max(np.abs(recovered - linear_field(nodes))) > 1e-3 * np.max(np.abs(linear_field(nodes)))
@@ -0,0 +1,79 @@
+import inspect
+import numpy as np
+import pytest
+from core.preprocessor import create_mesh
+from core.solver import FemSolver
+
+
+def relative_difference(u, u_ref):
+    return np.max(np.abs(u - u_ref)) / np.max(np.abs(u_ref))
+
+
+@pytest.fixture
+def example_mesh(example_problem):
+    return create_mesh(example_problem, 'pq30a4A')
+
+
+@pytest.fixture
+def dense_displacements(example_problem, example_mesh):
+    return FemSolver(example_problem, example_mesh, linear_solver='dense').solve()
+
+
+@pytest.mark.parametrize('options', [
+    {'linear_solver': 'direct'},
+    {'linear_solver': 'direct', 'ordering': 'COLAMD'},
+    {'linear_solver': 'cg', 'preconditioner': 'jacobi'},
+    {'linear_solver': 'cg', 'preconditioner': 'ilu'},
+    {'linear_solver': 'cg', 'preconditioner': 'ic'},
+    {'linear_solver': 'direct', 'bc_method': 'penalty'},
+    {'linear_solver': 'dense', 'bc_method': 'penalty'},
+])
+def test_solver_modes_match_dense_solve(example_problem, example_mesh, dense_displacements, options):
+    u = FemSolver(example_problem, example_mesh, **options).solve()
+
+    assert u is not None
+    assert relative_difference(u, dense_displacements) < 1e-7
+
+
+def test_reactions_balance_applied_loads(example_problem, example_mesh):
+    solver = FemSolver(example_problem, example_mesh)
+    solver.solve()
+
+    # 支座反力与外荷载 (竖直向下的线荷载) 平衡
+    np.testing.assert_allclose(solver.reactions[:, 0].reshape(-1, 2).sum(axis=0),
+                               -solver.F[:, 0].reshape(-1, 2).sum(axis=0), atol=1e-6 * np.abs(solver.F).sum())
+
+
+@pytest.fixture
+def fine_mesh(example_problem):
+    return create_mesh(example_problem, 'pq30a0.5A')
+
+
+@pytest.mark.parametrize('preconditioner', ['jacobi', 'ic', 'ilu'])
+def test_iterative_solver_with_inexact_preconditioner(example_problem, fine_mesh, preconditioner):
+    """约3000个节点的网格上不完全分解远非精确分解, 迭代法仍收敛到直接法的解。"""
+    u_direct = FemSolver(example_problem, fine_mesh).solve()
+    solver = FemSolver(example_problem, fine_mesh, linear_solver='cg', preconditioner=preconditioner)
+    u = solver.solve()
+
+    assert u is not None
+    assert solver.solver_info['iterations'] > 20
+    assert solver.solver_info['krylov_method'] == ('bicgstab' if preconditioner == 'ilu' else 'cg')
+    assert solver.solver_info['preconditioner_nnz'] <= 3 * solver.solver_info['nnz_K']
+    assert relative_difference(u, u_direct) < 1e-7
+
+
+def test_ic_preconditioner_is_symmetric(example_problem, fine_mesh):
+    solver = FemSolver(example_problem, fine_mesh, linear_solver='cg', preconditioner='ic')
+    solver.assemble_system()
+    K_sys, _ = solver._build_linear_system()
+    apply_preconditioner, _ = solver._build_preconditioner(K_sys.tocsr())
+
+    rng = np.random.default_rng(0)
+    x, y = rng.standard_normal((2, K_sys.shape[0]))
+    assert abs(x @ apply_preconditioner(y) - y @ apply_preconditioner(x)) < 1e-12 * abs(x @ apply_preconditioner(x))
+    assert x @ apply_preconditioner(x) > 0
+
+
+def test_default_preconditioner_is_symmetric():
+    assert inspect.signature(FemSolver).parameters['preconditioner'].default == 'jacobi'
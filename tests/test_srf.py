@@ -0,0 +1,43 @@
+import pytest
+from core.preprocessor import create_mesh
+from core.srf import StrengthReductionSolver
+
+
+@pytest.fixture
+def slope(example_problem):
+    example_problem.include_self_weight = True
+    return example_problem, create_mesh(example_problem, 'pq30a10A')
+
+
+def test_factor_of_safety_is_independent_of_worker_count(slope):
+    problem, mesh = slope
+    results = []
+    for max_workers in (1, 2):
+        solver = StrengthReductionSolver(problem, mesh, tol=0.01, max_workers=max_workers)
+        results.append(solver.solve())
+
+    assert 1.8 < results[0] < 2.1
+    assert abs(results[0] - results[1]) <= 0.01
+
+
+def test_failure_is_bracketed_within_tol(slope):
+    problem, mesh = slope
+    solver = StrengthReductionSolver(problem, mesh, tol=0.01, max_workers=1)
+    factor_of_safety = solver.solve()
+
+    # 失稳的试算点给出最后收敛的折减系数, 安全系数与其相差不超过 tol
+    failed = [trial for trial in solver.trials if not trial['converged']]
+    assert failed
+    reached = max(trial['reached_srf'] for trial in solver.trials)
+    assert 0 <= factor_of_safety - reached <= 0.01
+    # 临近失稳时位移明显增大
+    assert solver.trials[-1]['max_displacement'] > 2 * solver.trials[0]['max_displacement']
+    assert solver.plastic_mask.any()
+
+
+def test_unstable_at_srf_min(slope):
+    problem, mesh = slope
+    solver = StrengthReductionSolver(problem, mesh, srf_min=2.5, srf_max=5.0, max_workers=1)
+
+    assert solver.solve() is None
+    assert not solver.trials[0]['converged']
@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+from core.preprocessor import create_mesh
+from core.solver import FemSolver
+from core.staged import StagedConstructionSolver
+
+
+@pytest.mark.parametrize('include_self_weight', [False, True])
+def test_single_stage_matches_linear_solve(example_problem, include_self_weight):
+    """只有一个施工步且不激活/移除单元时, 结果与一次线弹性计算 (含基本荷载) 相同。"""
+    problem = example_problem
+    problem.include_self_weight = include_self_weight
+    problem.construction_stages = [{'name': '初始状态', 'activate': [], 'deactivate': [], 'loads': {}}]
+    mesh = create_mesh(problem, 'pq30a4A')
+
+    u_linear = FemSolver(problem, mesh).solve()
+    u_staged = StagedConstructionSolver(problem, mesh).solve()
+
+    np.testing.assert_allclose(u_staged, u_linear, rtol=0, atol=1e-12 * np.max(np.abs(u_linear)))
+
+
+def test_stage_loads_add_to_base_loads(example_problem):
+    problem = example_problem
+    seg_id = next(iter(problem.loads))
+    problem.construction_stages = [
+        {'name': '施工步1', 'activate': [], 'deactivate': [], 'loads': {}},
+        {'name': '施工步2', 'activate': [], 'deactivate': [], 'loads': {seg_id: problem.loads[seg_id]}},
+    ]
+    mesh = create_mesh(problem, 'pq30a4A')
+    solver = StagedConstructionSolver(problem, mesh)
+    solver.solve()
+
+    # 第二步在基本荷载之外再施加一次该线段荷载, 位移增量与该荷载单独作用的解相同
+    problem.loads = {seg_id: problem.loads[seg_id]}
+    u_extra = FemSolver(problem, mesh).solve()
+    du = solver.stage_displacements['施工步2'] - solver.stage_displacements['施工步1']
+    np.testing.assert_allclose(du, u_extra, rtol=0, atol=1e-10 * np.max(np.abs(u_extra)))
+
+
+def test_duplicate_stage_names_are_rejected(example_problem):
+    problem = example_problem
+    problem.construction_stages = [
+        {'name': '施工步1', 'activate': [], 'deactivate': [], 'loads': {}},
+        {'name': '施工步1', 'activate': [], 'deactivate': [], 'loads': {}},
+    ]
+    solver = StagedConstructionSolver(problem, create_mesh(problem, 'pq30a4A'))
+
+    with pytest.raises(ValueError, match='重复'):
+        solver.solve()
+
+
+def test_unnamed_stages_get_default_names(example_problem):
+    problem = example_problem
+    problem.construction_stages = [{'activate': []}, {'name': '加载', 'loads': {}}]
+    solver = StagedConstructionSolver(problem, create_mesh(problem, 'pq30a4A'))
+
+    assert solver.solve() is not None
+    assert solver.stage_names == ['施工步1', '加载']
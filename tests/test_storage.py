@@ -0,0 +1,59 @@
+import copy
+import json
+import numpy as np
+from core.fem_model import FemResult, LineLoad
+from core.postprocessor import PostProcessor
+from core.preprocessor import create_mesh
+from core.solver import FemSolver
+from core.storage import save_result_archive, load_result_archive
+
+
+def solved_result(problem):
+    mesh = create_mesh(problem, 'pq30a4A')
+    solver = FemSolver(problem, mesh)
+    u = solver.solve()
+    post_proc = PostProcessor(problem, mesh, u)
+    result = FemResult(mesh=mesh, problem=copy.deepcopy(problem))
+    result.displacements = u.reshape(-1, 2)
+    result.reactions = solver.reactions[:, 0].reshape(-1, 2)
+    result.stresses, result.target_displacements = post_proc.calculate_results()
+    result.solver_info = solver.solver_info
+    return result
+
+
+def test_compact_archive_round_trip(example_problem, tmp_path):
+    example_problem.loads[0] = LineLoad(50000.0, 82000.0, 'normal')
+    result = solved_result(example_problem)
+    result.get_field('sigma_1')
+    result.compact(float32=True)
+
+    path = str(tmp_path / 'result.sfres')
+    save_result_archive(result, path)
+    loaded = load_result_archive(path, mmap=True)
+
+    assert isinstance(loaded.displacements, np.memmap)
+    assert loaded.displacements.dtype == result.displacements.dtype
+    np.testing.assert_array_equal(loaded.displacements, result.displacements)
+    np.testing.assert_array_equal(loaded.stresses, result.stresses)
+    np.testing.assert_array_equal(loaded.mesh['triangles'], result.mesh['triangles'])
+    assert loaded.target_displacements == result.target_displacements
+    assert loaded.solver_info.keys() == result.solver_info.keys()
+    # 已缓存的派生字段原样读出, 其余派生字段由存档中的问题定义重新计算
+    np.testing.assert_array_equal(loaded.get_field('sigma_1'), result.get_field('sigma_1'))
+    np.testing.assert_allclose(loaded.get_field('sigma_x'), result.get_field('sigma_x'), rtol=1e-12)
+    assert loaded.problem.loads[0] == LineLoad(50000.0, 82000.0, 'normal')
+    assert loaded.problem.loads[15] == example_problem.loads[15]
+    assert loaded.problem.materials == example_problem.materials
+
+
+def test_archive_overwrite_removes_old_blocks(example_problem, tmp_path):
+    result = solved_result(example_problem)
+    path = str(tmp_path / 'result.sfres')
+    save_result_archive(result, path)
+    save_result_archive(result.compact(), path)
+
+    loaded = load_result_archive(path, mmap=False)
+    np.testing.assert_array_equal(loaded.displacements, result.displacements)
+    with open(tmp_path / 'result.sfres' / 'header.json', encoding='utf-8') as f:
+        blocks = {block['file'] for block in json.load(f)['blocks']}
+    assert {p.name for p in (tmp_path / 'result.sfres').glob('*.npy')} == blocks